@@ -10,10 +10,12 @@ bl_info = {
 
 import bpy # type: ignore
 from importlib import reload
-from . import props, operators, ui, core  # import modules (not classes!) to avoid dupes on reload
+from . import (props, operators, ui, presets, kernels, spatial, profiler, engine, cache,  # import modules (not classes!) to avoid dupes on reload
+               checkpoint, bake, farm, export, sweep, core)
 
-# Dev-friendly hot reload (safe if modules weren't loaded yet)
-for _m in (props, operators, ui, core):
+# Dev-friendly hot reload (safe if modules weren't loaded yet); dependencies first
+for _m in (props, presets, kernels, spatial, profiler, engine, cache, checkpoint, bake, farm, export,
+           sweep, core, operators, ui):
     try:
         reload(_m)
     except Exception:
@@ -47,6 +49,16 @@ def _gather_classes():
         "PARTICLEWAVES_OT_SetPreset",
         "PARTICLEWAVES_OT_RandomiseParams",
         "PARTICLEWAVES_OT_NewVariation",
+        "PARTICLEWAVES_OT_Sweep",
+        "PARTICLEWAVES_OT_ApplySweepVariant",
+        "PARTICLEWAVES_OT_Bake",
+        "PARTICLEWAVES_OT_CancelBake",
+        "PARTICLEWAVES_OT_FarmBake",
+        "PARTICLEWAVES_OT_FreeBake",
+        "PARTICLEWAVES_OT_Export",
+        "PARTICLEWAVES_OT_ResetTimings",
+        "PARTICLEWAVES_OT_SaveCheckpoint",
+        "PARTICLEWAVES_OT_LoadCheckpoint",
         "PARTICLEWAVES_OT_ApplyPresetAndRebuild",  # optional, if you added it
         "PARTICLEWAVES_OT_ApplyLook",              # optional, if you added it
         "PARTICLEWAVES_OT_RepairSettings",         # optional, if you added it
@@ -63,7 +75,10 @@ def _gather_classes():
         "PARTICLEWAVES_PT_Particle",
         "PARTICLEWAVES_PT_Wave",
         "PARTICLEWAVES_PT_System",
+        "PARTICLEWAVES_PT_Sweep",
+        "PARTICLEWAVES_PT_Cache",
         "PARTICLEWAVES_PT_Advanced",
+        "PARTICLEWAVES_PT_Timing",
         "PARTICLEWAVES_PT_PresetsHint",# optional
         "PARTICLEWAVES_PT_PhaseAdvance",# optional 
     ):
@@ -109,26 +124,56 @@ def register():
     for cls in _CLASSES:
         _safe_register(cls)
 
-    # Add Scene pointer once
+    # Add Scene pointer (template for new systems) and Object pointer (per system) once
     if not hasattr(bpy.types.Scene, "particlewaves_settings"):
         bpy.types.Scene.particlewaves_settings = bpy.props.PointerProperty(
             type=getattr(props, "ParticleWavesSettings")
         )
+    if not hasattr(bpy.types.Object, "particlewaves_settings"):
+        bpy.types.Object.particlewaves_settings = bpy.props.PointerProperty(
+            type=getattr(props, "ParticleWavesSettings")
+        )
+
+    # Checkpoint on save / restore on load
+    core.register_persistence_handlers()
 
 
 def unregister():
+    # Stop background work whose timers would call into the unloaded module
+    try:
+        core.stop_bake_job()
+    except Exception:
+        pass
+    try:
+        core.stop_farm()
+    except Exception:
+        pass
+    try:
+        core.stop_sweep()
+    except Exception:
+        pass
+    try:
+        core.cancel_live_update()
+    except Exception:
+        pass
+
     # Remove frame-change handler if active
     try:
         core.unregister_wave_animation_handler()
     except Exception:
         pass
+    try:
+        core.unregister_persistence_handlers()
+    except Exception:
+        pass
 
-    # Remove Scene pointer if present
-    if hasattr(bpy.types.Scene, "particlewaves_settings"):
-        try:
-            del bpy.types.Scene.particlewaves_settings
-        except Exception:
-            pass
+    # Remove Scene / Object pointers if present
+    for owner in (bpy.types.Scene, bpy.types.Object):
+        if hasattr(owner, "particlewaves_settings"):
+            try:
+                del owner.particlewaves_settings
+            except Exception:
+                pass
 
     # Unregister in reverse order
     for cls in reversed(_CLASSES):
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import numpy as np  # type: ignore
+
+try:
+    from .cache import BakeCache, CompactBake, params_key
+    from .engine import WaveEngine
+except ImportError:  # imported as a plain module (headless tools)
+    from cache import BakeCache, CompactBake, params_key
+    from engine import WaveEngine
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bake job (pure NumPy / stdlib — no bpy here)
+#
+# Simulates a frame range into a BakeCache, inline (run) or on a worker thread
+# (start). Finished frames are published every `publish_every` seconds, so a
+# cancelled or crashed bake keeps everything up to its last published frame
+# and the main thread can preview the newest one while the rest is running.
+# ──────────────────────────────────────────────────────────────────────────────
+
+class BakeJob:
+    """One bake of [frame_start, frame_end] for `params` at `fps` (raw or compact)."""
+
+    def __init__(self, params: dict, fps: int, frame_start: int, frame_end: int, directory: str,
+                 publish_every: float = 0.5, compact: bool = False):
+        self.params = params
+        self.fps = max(1, int(fps))
+        self.frame_start, self.frame_end = int(frame_start), int(frame_end)
+        self.directory = directory
+        self.key = params_key(params, self.fps)
+        self.publish_every = float(publish_every)
+        self.compact = bool(compact)
+        self.bake = None
+        self.frames_done = 0      # leading frames written (the first is the initial state)
+        self.error = None
+        self.cancelled = False
+        self._cancel = threading.Event()
+        self._thread = None
+        self._t0 = None
+        self._t1 = None
+
+    @property
+    def total(self) -> int:
+        return self.frame_end - self.frame_start + 1
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def done(self) -> bool:
+        return self._t1 is not None and not self.running
+
+    @property
+    def rate(self) -> float:
+        """Frames per second so far (0 before the first frame)."""
+        if self._t0 is None or self.frames_done < 2:
+            return 0.0
+        elapsed = (self._t1 or time.perf_counter()) - self._t0
+        return (self.frames_done - 1) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float:
+        """Seconds left at the current rate (inf until there is one)."""
+        rate = self.rate
+        return (self.total - self.frames_done) / rate if rate > 0 else float("inf")
+
+    def latest(self):
+        """(frame, positions) of the newest finished frame, or None."""
+        n = self.frames_done
+        if self.bake is None or n == 0:
+            return None
+        frame = self.frame_start + n - 1
+        return frame, self.bake.frame(frame)
+
+    def start(self):
+        """Run on a worker thread; poll `done` / `latest()` from the caller."""
+        self._thread = threading.Thread(target=self._run_safe, name="pw-bake", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self, wait: bool = True):
+        """Stop after the current frame; frames already written stay in the bake."""
+        self._cancel.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def run(self) -> BakeCache:
+        """Bake inline; returns the committed cache."""
+        self._t0 = time.perf_counter()
+        try:
+            fps = self.fps
+            dt = np.float32(1.0 / fps)
+            eng = WaveEngine.from_params(self.params)
+            if self.compact:
+                bake = CompactBake.create(self.directory, self.key, self.frame_start, self.frame_end,
+                                          eng.n_points, self.params["RADIUS"])
+            else:
+                bake = BakeCache.create(self.directory, self.key, self.frame_start, self.frame_end,
+                                        eng.n_points)
+            self.bake = bake
+            bake.write(self.frame_start, eng.positions(out=bake.target(self.frame_start)))
+            self.frames_done = 1
+            published = time.perf_counter()
+            try:
+                for frame in range(self.frame_start + 1, self.frame_end + 1):
+                    if self._cancel.is_set():
+                        self.cancelled = True
+                        break
+                    eng.step(np.float32(frame / fps), dt)
+                    bake.write(frame, eng.positions(out=bake.target(frame)))
+                    self.frames_done += 1
+                    if time.perf_counter() - published >= self.publish_every:
+                        bake.commit(self.frames_done)
+                        published = time.perf_counter()
+            finally:
+                eng.close()
+                bake.commit(self.frames_done)
+                bake.finish()   # playback keeps the bake, read-only
+        finally:
+            self._t1 = time.perf_counter()
+        return bake
+
+    def _run_safe(self):
+        try:
+            self.run()
+        except Exception as e:  # reported by the caller on the main thread
+            self.error = e
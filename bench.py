@@ -0,0 +1,173 @@
+"""
+Headless benchmark for the particle-wave engine (no Blender needed).
+
+Run from the add-on folder:
+
+    python bench.py                                  # default grid
+    python bench.py --counts 5000 100000 --modes 1 8 32 --presets DEFAULT CHAOS
+    python bench.py --counts 1000000 --threads 1 2 4 8 16 32   # thread scaling
+    python bench.py --backend JIT                    # fused numba kernel
+    python bench.py --json results.jsonl             # save rows (one JSON per line)
+    python bench.py --baseline results.jsonl         # flag regressions vs a saved run
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+try:
+    from .engine import WaveEngine, default_params
+    from .presets import PRESETS
+except ImportError:  # run as a script from the add-on folder
+    from engine import WaveEngine, default_params
+    from presets import PRESETS
+
+
+DEFAULT_COUNTS = (5_000, 50_000, 100_000, 1_000_000)
+DEFAULT_MODES = (1, 4, 8, 16, 32)
+FPS = 24
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Measurements
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _auto_steps(n_points: int) -> int:
+    """Enough steps for a stable timing without spending minutes on 1M points."""
+    return max(3, min(200, 2_000_000 // max(1, n_points)))
+
+
+def _state_bytes(eng: WaveEngine) -> int:
+    return sum(a.nbytes for a in (eng.P, eng.V_prev, eng.K, eng.W, eng.PHI, eng.OMG))
+
+
+def bench_engine(params: dict, steps: int, warmup: int = 2) -> dict:
+    """
+    Time `steps` engine steps. Peak memory (transient allocations inside one
+    step, excluding state and workspace) is measured on a separate step.
+    """
+    eng = WaveEngine.from_params(params)
+    try:
+        return _bench(eng, steps, warmup)
+    finally:
+        eng.close()
+
+
+def _bench(eng: WaveEngine, steps: int, warmup: int) -> dict:
+    dt = 1.0 / FPS
+    frame = 0
+    for _ in range(warmup):
+        frame += 1
+        eng.step(frame * dt, dt)
+
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        frame += 1
+        eng.step(frame * dt, dt)
+    elapsed = time.perf_counter() - t0
+
+    tracemalloc.start()
+    frame += 1
+    eng.step(frame * dt, dt)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(
+        steps=steps,
+        steps_per_sec=steps / elapsed if elapsed > 0 else float("inf"),
+        ms_per_step=1000.0 * elapsed / steps,
+        peak_step_mb=peak / 2**20,
+        state_mb=_state_bytes(eng) / 2**20,
+        work_mb=eng.work_bytes / 2**20,
+        backend=eng.backend,
+    )
+
+
+def run_suite(counts, modes, presets, steps=None, threads=(1,), backend='NUMPY'):
+    """Yield one result row per (preset, count, modes, threads) combination."""
+    for name in presets:
+        for m in modes:
+            for n in counts:
+                for th in threads:
+                    values = dict(PRESETS[name], NUM_MODES=int(m))
+                    params = default_params(N_POINTS=int(n), THREADS=int(th),
+                                            BACKEND=backend, **values)
+                    row = dict(preset=name, n_points=int(n), num_modes=int(m), threads=int(th),
+                               backend=backend)
+                    row.update(bench_engine(params, steps or _auto_steps(int(n))))
+                    yield row
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Regression check
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _row_key(row: dict):
+    return (row["preset"], int(row["n_points"]), int(row["num_modes"]),
+            int(row.get("threads", 1)), row.get("backend", 'NUMPY'))
+
+
+def load_rows(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return {_row_key(r): r for r in map(json.loads, filter(str.strip, f))}
+
+
+def regressions(rows, baseline: dict, tolerance: float):
+    """Rows whose steps/sec dropped more than `tolerance` below the baseline."""
+    out = []
+    for row in rows:
+        ref = baseline.get(_row_key(row))
+        if ref and row["steps_per_sec"] < ref["steps_per_sec"] * (1.0 - tolerance):
+            out.append((row, ref))
+    return out
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────────
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the particle-wave engine headless.")
+    ap.add_argument("--counts", type=int, nargs="+", default=list(DEFAULT_COUNTS))
+    ap.add_argument("--modes", type=int, nargs="+", default=list(DEFAULT_MODES))
+    ap.add_argument("--presets", nargs="+", default=list(PRESETS), choices=list(PRESETS))
+    ap.add_argument("--threads", type=int, nargs="+", default=[1],
+                    help="worker threads per case (0 = one per CPU)")
+    ap.add_argument("--backend", default='NUMPY', choices=('NUMPY', 'JIT'),
+                    help="step backend (JIT needs numba; falls back to NUMPY)")
+    ap.add_argument("--steps", type=int, default=None, help="steps per case (default: auto)")
+    ap.add_argument("--json", help="append result rows to this JSON-lines file")
+    ap.add_argument("--baseline", help="JSON-lines file from a previous run to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.15,
+                    help="allowed steps/sec drop vs baseline before failing (fraction)")
+    args = ap.parse_args(argv)
+
+    print(f"{'preset':<8} {'N':>9} {'M':>3} {'thr':>3} {'steps/s':>9} {'ms/step':>9} "
+          f"{'peak MB':>8} {'state MB':>8} {'work MB':>8}")
+    rows = []
+    for row in run_suite(args.counts, args.modes, args.presets, args.steps, args.threads,
+                         args.backend):
+        rows.append(row)
+        print(f"{row['preset']:<8} {row['n_points']:>9} {row['num_modes']:>3} {row['threads']:>3} "
+              f"{row['steps_per_sec']:>9.1f} {row['ms_per_step']:>9.2f} "
+              f"{row['peak_step_mb']:>8.1f} {row['state_mb']:>8.1f} {row['work_mb']:>8.1f}",
+              flush=True)
+
+    if args.json:
+        with open(args.json, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+    if args.baseline:
+        bad = regressions(rows, load_rows(args.baseline), args.tolerance)
+        for row, ref in bad:
+            print(f"REGRESSION {_row_key(row)}: {row['steps_per_sec']:.1f} steps/s "
+                  f"(baseline {ref['steps_per_sec']:.1f})")
+        if bad:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
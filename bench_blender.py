@@ -0,0 +1,130 @@
+"""
+Output-mode benchmark inside Blender (VERTS vs Geometry Nodes instances vs point cloud).
+
+Run with Blender from the add-on folder:
+
+    blender -b --factory-startup -P bench_blender.py -- --counts 50000 100000 1000000
+    blender --factory-startup -P bench_blender.py -- --json out.jsonl   # with UI: real viewport FPS
+
+Per (mode, count) it reports:
+  build_s     create_particle_wave (mesh + instancer setup)
+  frame_ms    one frame change: engine step, mesh push and depsgraph evaluation
+  draw_fps    viewport redraws per second (UI sessions only; needs a 3D view)
+  sync_s      Cycles render of a tiny 1-sample image, i.e. mostly scene sync
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import bpy  # type: ignore
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODES = ('VERTS', 'NODES', 'POINTS')
+
+
+def _load_addon():
+    """Import and register the add-on from this folder (whatever it's named on disk)."""
+    spec = importlib.util.spec_from_file_location(
+        "particlewaves_bench", os.path.join(HERE, "__init__.py"),
+        submodule_search_locations=[HERE],
+    )
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    mod.register()
+    return mod
+
+
+def _view3d_context():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                return dict(window=window, area=area)
+    return None
+
+
+def _draw_fps(iterations: int) -> float:
+    ctx = _view3d_context()
+    if bpy.app.background or ctx is None:
+        return float("nan")
+    with bpy.context.temp_override(**ctx):
+        t0 = time.perf_counter()
+        bpy.ops.wm.redraw_timer(type='DRAW', iterations=iterations)
+    return iterations / (time.perf_counter() - t0)
+
+
+def _render_sync_seconds(scene) -> float:
+    r = scene.render
+    r.engine = 'CYCLES'
+    r.resolution_x, r.resolution_y, r.resolution_percentage = 64, 64, 100
+    scene.cycles.samples = 1
+    scene.cycles.device = 'CPU'
+    t0 = time.perf_counter()
+    bpy.ops.render.render(write_still=False)
+    return time.perf_counter() - t0
+
+
+def bench_mode(addon, mode: str, count: int, frames: int, redraws: int) -> dict:
+    scene = bpy.context.scene
+    s = scene.particlewaves_settings
+    s.PARTICLE_COUNT = int(count)
+    s.OUTPUT_MODE = mode
+    scene.frame_set(scene.frame_start)
+
+    t0 = time.perf_counter()
+    addon.core.create_particle_wave(s)
+    bpy.context.evaluated_depsgraph_get().update()
+    build = time.perf_counter() - t0
+
+    addon.core.register_wave_animation_handler()
+    start = scene.frame_current
+    t0 = time.perf_counter()
+    for f in range(start + 1, start + frames + 1):
+        scene.frame_set(f)
+        bpy.context.evaluated_depsgraph_get().update()
+    frame_ms = 1000.0 * (time.perf_counter() - t0) / frames
+    addon.core.unregister_wave_animation_handler()
+
+    return dict(
+        mode=mode, n_points=int(count),
+        build_s=build, frame_ms=frame_ms,
+        draw_fps=_draw_fps(redraws),
+        sync_s=_render_sync_seconds(scene),
+    )
+
+
+def main(argv) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark particle output modes inside Blender.")
+    ap.add_argument("--counts", type=int, nargs="+", default=[50_000, 100_000, 1_000_000])
+    ap.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    ap.add_argument("--frames", type=int, default=24, help="frame changes timed per case")
+    ap.add_argument("--redraws", type=int, default=30, help="viewport redraws timed per case")
+    ap.add_argument("--json", help="append result rows to this JSON-lines file")
+    args = ap.parse_args(argv)
+
+    addon = _load_addon()
+    print(f"{'mode':<7} {'N':>9} {'build s':>8} {'frame ms':>9} {'draw fps':>9} {'sync s':>7}")
+    rows = []
+    for count in args.counts:
+        for mode in args.modes:
+            row = bench_mode(addon, mode, count, args.frames, args.redraws)
+            rows.append(row)
+            print(f"{row['mode']:<7} {row['n_points']:>9} {row['build_s']:>8.2f} "
+                  f"{row['frame_ms']:>9.1f} {row['draw_fps']:>9.1f} {row['sync_s']:>7.2f}",
+                  flush=True)
+
+    if args.json:
+        with open(args.json, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    code = main(argv)
+    if bpy.app.background:
+        sys.exit(code)
@@ -0,0 +1,509 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np  # type: ignore
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bake cache (pure NumPy / stdlib — no bpy here)
+#
+# One bake = two files in the cache directory:
+#   <key>.npy   (F, N, 3) float32 world-space positions, memory-mapped
+#   <key>.json  frame range + number of frames actually written
+# or, for a compact bake (see CompactBake below), <key>.pwc + <key>.json.
+# The key is a hash of every parameter that changes particle positions, so a
+# bake is picked up again automatically for the same settings (and ignored as
+# soon as anything relevant changes).
+# ──────────────────────────────────────────────────────────────────────────────
+
+CACHE_VERSION = 2
+
+# Parameters that don't change where particles end up (drawing, execution).
+_NOT_IN_KEY = ("DOT_RADIUS", "DOT_SUBDIVS", "OBJ_NAME", "DOT_NAME", "THREADS")
+
+# Params added later, left out of the key at these values so older bakes still match
+_KEY_DEFAULTS = dict(INIT_LAYOUT='JITTERED', SEPARATION=0.0, SEPARATION_RADIUS=1.0)
+
+
+def params_key(params: dict, fps: int) -> str:
+    """Stable hash of the simulation-relevant params (+ fps, which sets dt and t)."""
+    relevant = {k: v for k, v in params.items()
+                if k not in _NOT_IN_KEY and not (k in _KEY_DEFAULTS and v == _KEY_DEFAULTS[k])}
+    relevant["FPS"] = int(fps)
+    relevant["CACHE_VERSION"] = CACHE_VERSION
+    blob = json.dumps(relevant, sort_keys=True, default=list).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+class BakeCache:
+    """Frame-indexed positions on disk; frames are read as memmap slices."""
+
+    def __init__(self, directory: str, key: str, data: np.ndarray, meta: dict):
+        self.directory = directory
+        self.key = key
+        self.data = data      # (F, N, 3) memmap
+        self.meta = meta
+
+    # Paths ------------------------------------------------------------------
+
+    @staticmethod
+    def data_path(directory: str, key: str) -> str:
+        return os.path.join(directory, key + ".npy")
+
+    @staticmethod
+    def meta_path(directory: str, key: str) -> str:
+        return os.path.join(directory, key + ".json")
+
+    @staticmethod
+    def blob_path(directory: str, key: str) -> str:
+        return os.path.join(directory, key + ".pwc")
+
+    # Open / create ----------------------------------------------------------
+
+    @classmethod
+    def create(cls, directory: str, key: str, frame_start: int, frame_end: int, n_points: int):
+        """Allocate a new (writable) bake for frames [frame_start, frame_end]."""
+        os.makedirs(directory, exist_ok=True)
+        n_frames = int(frame_end) - int(frame_start) + 1
+        data = np.lib.format.open_memmap(
+            cls.data_path(directory, key), mode="w+",
+            dtype=np.float32, shape=(n_frames, int(n_points), 3),
+        )
+        meta = dict(
+            version=CACHE_VERSION,
+            frame_start=int(frame_start),
+            frame_count=n_frames,
+            frames_done=0,
+            n_points=int(n_points),
+        )
+        bake = cls(directory, key, data, meta)
+        bake._write_meta()
+        return bake
+
+    @classmethod
+    def open(cls, directory: str, key: str):
+        """Open an existing bake read-only; None if missing or unreadable."""
+        try:
+            with open(cls.meta_path(directory, key), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if int(meta.get("version", -1)) != CACHE_VERSION:
+                return None
+            if meta.get("format") == 'COMPACT':
+                return CompactBake.load(directory, key, meta)
+            data = np.load(cls.data_path(directory, key), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return cls(directory, key, data, meta)
+
+    @classmethod
+    def remove(cls, directory: str, key: str):
+        """Delete a bake's files (missing files are fine)."""
+        for path in (cls.meta_path(directory, key), cls.data_path(directory, key),
+                     cls.blob_path(directory, key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # Access -----------------------------------------------------------------
+
+    @property
+    def frame_start(self) -> int:
+        return int(self.meta["frame_start"])
+
+    @property
+    def frames_done(self) -> int:
+        return int(self.meta["frames_done"])
+
+    @property
+    def n_points(self) -> int:
+        return int(self.meta["n_points"])
+
+    def has_frame(self, frame: int) -> bool:
+        i = int(frame) - self.frame_start
+        return 0 <= i < self.frames_done
+
+    @property
+    def disk_bytes(self) -> int:
+        try:
+            return os.path.getsize(self.data_path(self.directory, self.key))
+        except OSError:
+            return 0
+
+    @property
+    def raw_bytes(self) -> int:
+        """Size of the written frames as plain float32 positions."""
+        return self.frames_done * self.n_points * 12
+
+    def frame(self, frame: int, out: np.ndarray = None) -> np.ndarray:
+        """(N, 3) float32 view of one baked frame (no copy unless `out` is given)."""
+        data = self.data[int(frame) - self.frame_start]
+        if out is None:
+            return data
+        np.copyto(out, data)
+        return out
+
+    def target(self, frame: int) -> np.ndarray:
+        """Buffer to fill with a frame's positions before write(frame, ...)."""
+        return self.data[int(frame) - self.frame_start]
+
+    def write(self, frame: int, positions: np.ndarray):
+        """Store world-space positions for one frame (does not publish it yet)."""
+        slot = self.data[int(frame) - self.frame_start]
+        if not np.may_share_memory(slot, positions):   # filled in place via target()
+            slot[...] = positions
+
+    def commit(self, frames_done: int):
+        """Flush data, then publish how many leading frames are valid."""
+        self.data.flush()
+        self.meta["frames_done"] = int(frames_done)
+        self._write_meta()
+
+    def finish(self):
+        """Done writing: release the write side (frames stay readable)."""
+
+    def close(self):
+        """Release the file handles; the bake is not used afterwards."""
+        self.data = None   # views handed out keep the memmap alive until they go
+
+    def _write_meta(self):
+        path = self.meta_path(self.directory, self.key)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, path)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Compact bakes
+#
+# Every point lies on the sphere of RADIUS, so only its direction is stored:
+# octahedral-mapped to two uint16. Particles are sorted along a Hilbert curve
+# over that map (taken from the first frame), so neighbours in the file are
+# neighbours on the sphere. Every `keyframe_every` frames a key frame holds
+# differences along the curve; the next frame holds the change since the key
+# frame and the rest the residual against linear extrapolation of the two
+# frames before. Residuals are zigzagged, split into byte planes and zlib'd
+# one frame per blob. All integer maths wraps mod 2^16, so decoding gives the
+# quantised values back exactly (max direction error ~1e-4 rad).
+# ──────────────────────────────────────────────────────────────────────────────
+
+KEYFRAME_EVERY = 16
+_Q = np.float32(65535.0)
+
+
+def oct_encode(P: np.ndarray) -> np.ndarray:
+    """(N, 3) directions (any length) -> (N, 2) uint16 octahedral coordinates."""
+    P = np.asarray(P, np.float32)
+    l1 = np.abs(P).sum(axis=1)
+    l1[l1 == 0] = 1.0
+    x, y, z = (P[:, i] / l1 for i in range(3))
+    lower = z < 0
+    ox = np.where(lower, (1.0 - np.abs(y)) * np.copysign(np.float32(1.0), x), x)
+    oy = np.where(lower, (1.0 - np.abs(x)) * np.copysign(np.float32(1.0), y), y)
+    q = np.empty((P.shape[0], 2), np.uint16)
+    for i, o in enumerate((ox, oy)):
+        o += 1.0
+        o *= _Q * np.float32(0.5)
+        np.rint(o, out=o)
+        np.clip(o, 0, 65535, out=o)
+        q[:, i] = o
+    return q
+
+
+def oct_decode(q: np.ndarray, radius: float, out: np.ndarray) -> np.ndarray:
+    """(N, 2) uint16 octahedral coordinates -> points on the sphere, into `out`."""
+    uv = q.astype(np.float32)
+    uv *= np.float32(2.0) / _Q
+    uv -= 1.0
+    x, y = uv[:, 0], uv[:, 1]
+    z = 1.0 - np.abs(x) - np.abs(y)
+    t = np.maximum(-z, 0.0)
+    x -= np.copysign(t, x)
+    y -= np.copysign(t, y)
+    scale = x * x
+    scale += y * y
+    scale += z * z
+    np.sqrt(scale, out=scale)
+    np.divide(np.float32(radius), scale, out=scale)
+    np.multiply(x, scale, out=out[:, 0])
+    np.multiply(y, scale, out=out[:, 1])
+    np.multiply(z, scale, out=out[:, 2])
+    return out
+
+
+def hilbert_order(q: np.ndarray, bits: int = 16) -> np.ndarray:
+    """Permutation sorting (N, 2) integer coordinates along a Hilbert curve."""
+    x = q[:, 0].astype(np.int64)
+    y = q[:, 1].astype(np.int64)
+    top = (1 << bits) - 1
+    d = np.zeros(x.shape[0], np.int64)
+    s = 1 << (bits - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += (s * s) * ((3 * rx) ^ ry)
+        flip = ~ry & rx
+        x = np.where(flip, top - x, x)
+        y = np.where(flip, top - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return np.argsort(d, kind="stable").astype(np.int32)
+
+
+def _pack(r: np.ndarray, level: int) -> bytes:
+    """Residuals (N, 2) uint16 -> zigzag -> byte planes -> zlib."""
+    s = r.view(np.int16).reshape(-1)
+    zz = ((s << 1) ^ (s >> 15)).view(np.uint16)
+    planes = np.concatenate(((zz & 0xFF).astype(np.uint8), (zz >> 8).astype(np.uint8)))
+    return zlib.compress(planes.tobytes(), level)
+
+
+def _unpack(blob: bytes, n: int) -> np.ndarray:
+    planes = np.frombuffer(zlib.decompress(blob), np.uint8).reshape(2, -1)
+    zz = planes[1].astype(np.uint16)
+    zz <<= 8
+    zz |= planes[0]
+    r = zz >> 1
+    r ^= np.negative(zz & 1)
+    return r.reshape(n, 2)
+
+
+class CompactBake(BakeCache):
+    """
+    Quantised, delta-coded bake (<key>.pwc). Frames are written in order;
+    frame() decodes into a reused buffer (or `out`), stepping forward from the
+    last decoded frame when it can and from the chunk's key frame otherwise.
+    """
+
+    def __init__(self, directory: str, key: str, meta: dict, order: np.ndarray = None):
+        super().__init__(directory, key, None, meta)
+        self.order = order        # curve position -> particle index
+        self._inv = None          # particle index -> curve position
+        self.level = 1            # zlib level: fast, and residuals are most of the win
+        self.decode_seconds = 0.0 # mean frame() time
+        self._decodes = 0
+        self._lock = threading.Lock()
+        self._out = None          # frame() result
+        self._in = None           # target() buffer (the writer may run on another thread)
+        self._q = None            # scratch in particle order
+        self._writer = None
+        self._reader = None
+        self._enc = None          # (index, q, q_before) in curve order, for write()
+        self._dec = None          # same, for frame()
+
+    @classmethod
+    def create(cls, directory: str, key: str, frame_start: int, frame_end: int, n_points: int,
+               radius: float = 1.0, keyframe_every: int = KEYFRAME_EVERY):
+        """Start a new compact bake for frames [frame_start, frame_end]."""
+        os.makedirs(directory, exist_ok=True)
+        try:
+            os.remove(cls.data_path(directory, key))   # a raw bake of the same settings
+        except OSError:
+            pass
+        meta = dict(
+            version=CACHE_VERSION,
+            format='COMPACT',
+            frame_start=int(frame_start),
+            frame_count=int(frame_end) - int(frame_start) + 1,
+            frames_done=0,
+            n_points=int(n_points),
+            radius=float(radius),
+            keyframe_every=max(1, int(keyframe_every)),
+            order=None,           # [offset, size] of the particle order blob
+            frames=[],            # [offset, size] per frame
+        )
+        bake = cls(directory, key, meta)
+        bake._writer = open(cls.blob_path(directory, key), "wb")
+        bake._write_meta()
+        return bake
+
+    @classmethod
+    def load(cls, directory: str, key: str, meta: dict):
+        bake = cls(directory, key, meta)
+        if meta.get("order") is not None:
+            raw = zlib.decompress(bake._read(*meta["order"]))
+            bake.order = np.frombuffer(raw, np.int32)
+        return bake
+
+    @classmethod
+    def from_bake(cls, raw: BakeCache, radius: float = None, keyframe_every: int = KEYFRAME_EVERY):
+        """Replace a raw bake by its compact form (same directory and key; `raw` is closed)."""
+        if radius is None:
+            radius = float(np.linalg.norm(raw.frame(raw.frame_start), axis=1).mean())
+        bake = cls.create(raw.directory, raw.key, raw.frame_start,
+                          raw.frame_start + int(raw.meta["frame_count"]) - 1,
+                          raw.n_points, radius, keyframe_every)
+        for frame in range(raw.frame_start, raw.frame_start + raw.frames_done):
+            bake.write(frame, raw.frame(frame))
+        bake.commit(raw.frames_done)
+        bake.finish()
+        raw.close()
+        try:
+            os.remove(cls.data_path(raw.directory, raw.key))   # if create() couldn't yet
+        except OSError:
+            pass
+        return bake
+
+    # Access -----------------------------------------------------------------
+
+    @property
+    def disk_bytes(self) -> int:
+        try:
+            return os.path.getsize(self.blob_path(self.directory, self.key))
+        except OSError:
+            return 0
+
+    def target(self, frame: int) -> np.ndarray:
+        if self._in is None:
+            self._in = np.empty((self.n_points, 3), np.float32)
+        return self._in
+
+    def write(self, frame: int, positions: np.ndarray):
+        """Encode the next frame (frames go in order, starting at frame_start)."""
+        frames = self.meta["frames"]
+        i = int(frame) - self.frame_start
+        if i != len(frames):
+            raise ValueError(f"Compact bakes are written in frame order (expected frame "
+                             f"{self.frame_start + len(frames)}, got {frame}).")
+        q = oct_encode(positions)
+        with self._lock:
+            if self.order is None:
+                self.order = hilbert_order(q)
+                self.meta["order"] = self._append(zlib.compress(self.order.tobytes(), self.level))
+            q = q[self.order]
+            r = self._residual(i, q, self._enc)
+            frames.append(self._append(_pack(r, self.level)))
+            self._writer.flush()
+            self._enc = (i, q, self._enc[1] if self._enc is not None else None)
+
+    def frame(self, frame: int, out: np.ndarray = None) -> np.ndarray:
+        """Decode one frame into `out` (or the bake's reused (N, 3) buffer)."""
+        t0 = time.perf_counter()
+        out = self._buffer() if out is None else out
+        with self._lock:
+            q = self._decode(int(frame) - self.frame_start)
+            if self._q is None:
+                self._q = np.empty_like(q)
+                self._inv = np.argsort(self.order).astype(np.int32)
+            # Back to particle order: one 4-byte gather per particle
+            np.take(q.view(np.uint32).reshape(-1), self._inv, out=self._q.view(np.uint32).reshape(-1))
+            oct_decode(self._q, self.meta["radius"], out)
+        self._decodes += 1
+        self.decode_seconds += (time.perf_counter() - t0 - self.decode_seconds) / min(self._decodes, 32)
+        return out
+
+    def commit(self, frames_done: int):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+                os.fsync(self._writer.fileno())
+            self.meta["frames_done"] = int(frames_done)
+            self._write_meta()
+
+    def finish(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def close(self):
+        with self._lock:
+            for f in (self._writer, self._reader):
+                if f is not None:
+                    f.close()
+            self._writer = self._reader = None
+
+    # Coding -----------------------------------------------------------------
+
+    def _residual(self, i: int, q: np.ndarray, prev) -> np.ndarray:
+        j = i % self.meta["keyframe_every"]
+        if j == 0 or prev is None:
+            r = q.copy()
+            r[1:] -= q[:-1]                     # along the curve
+        elif j == 1 or prev[2] is None:
+            r = q - prev[1]
+        else:
+            r = q - (2 * prev[1] - prev[2])     # against linear extrapolation
+        return r
+
+    def _decode(self, i: int) -> np.ndarray:
+        """Quantised frame i in curve order (caller holds the lock)."""
+        state = self._dec
+        key = i - i % self.meta["keyframe_every"]
+        if state is None or not (key <= state[0] <= i):
+            r = _unpack(self._read(*self.meta["frames"][key]), self.n_points)
+            state = (key, np.cumsum(r, axis=0, dtype=np.uint16), None)
+        while state[0] < i:
+            k = state[0] + 1
+            r = _unpack(self._read(*self.meta["frames"][k]), self.n_points)
+            pred = state[1] if k == key + 1 else 2 * state[1] - state[2]
+            state = (k, pred + r, state[1])
+        self._dec = state
+        return state[1]
+
+    def _append(self, blob: bytes) -> list:
+        offset = self._writer.tell()
+        self._writer.write(blob)
+        return [offset, len(blob)]
+
+    def _read(self, offset: int, size: int) -> bytes:
+        if self._reader is None:
+            self._reader = open(self.blob_path(self.directory, self.key), "rb")
+        self._reader.seek(offset)
+        return self._reader.read(size)
+
+    def _buffer(self) -> np.ndarray:
+        if self._out is None:
+            self._out = np.empty((self.n_points, 3), np.float32)
+        return self._out
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CLI: size / decode report, transcoding
+#
+#   python cache.py --cache-dir ./cache --key 0123abcd...            # report
+#   python cache.py --cache-dir ./cache --key 0123abcd... --compact  # raw -> compact
+# ──────────────────────────────────────────────────────────────────────────────
+
+def report(bake: BakeCache) -> dict:
+    """Disk size vs raw float32 and mean time to read one frame into a buffer."""
+    out = np.empty((bake.n_points, 3), np.float32)
+    frames = range(bake.frame_start, bake.frame_start + bake.frames_done)
+    t0 = time.perf_counter()
+    for frame in frames:
+        bake.frame(frame, out)
+    read = (time.perf_counter() - t0) / max(1, len(frames))
+    return dict(format=bake.meta.get("format", 'RAW'), frames=bake.frames_done,
+                n_points=bake.n_points, disk_bytes=bake.disk_bytes, raw_bytes=bake.raw_bytes,
+                ratio=bake.raw_bytes / max(1, bake.disk_bytes), read_ms=read * 1000.0)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Report on (or transcode) a particle-wave bake.")
+    ap.add_argument("--cache-dir", required=True, help="bake cache directory")
+    ap.add_argument("--key", required=True, help="bake key (file name without extension)")
+    ap.add_argument("--compact", action="store_true", help="replace a raw bake by its compact form")
+    args = ap.parse_args(argv)
+
+    bake = BakeCache.open(args.cache_dir, args.key)
+    if bake is None:
+        print(f"[PARTICLE WAVES] no bake {args.key} in {args.cache_dir}", flush=True)
+        return 1
+    if args.compact and not isinstance(bake, CompactBake):
+        before = report(bake)
+        print(f"[PARTICLE WAVES] raw: {json.dumps(before)}", flush=True)
+        bake = CompactBake.from_bake(bake)
+    print(f"[PARTICLE WAVES] {json.dumps(report(bake))}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import io
+import json
+import os
+
+import numpy as np  # type: ignore
+
+try:
+    from .cache import params_key
+    from .engine import WaveEngine
+except ImportError:  # imported as a plain module (headless tools)
+    from cache import params_key
+    from engine import WaveEngine
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Simulation checkpoints (pure NumPy / stdlib — no bpy here)
+#
+# One checkpoint = a compressed .npz blob holding the engine arrays plus a JSON
+# header: params, params hash, fps, frame and the RNG bit-generator state, so a
+# restored engine continues exactly where the saved one stopped.
+# ──────────────────────────────────────────────────────────────────────────────
+
+CHECKPOINT_VERSION = 1
+
+_ARRAYS = ("P", "V_prev", "K", "W", "PHI", "OMG")
+
+
+def dumps(eng: WaveEngine, frame: int, fps: int) -> bytes:
+    """Serialise engine state at `frame` to a compact binary blob."""
+    meta = dict(
+        version=CHECKPOINT_VERSION,
+        frame=int(frame),
+        fps=int(fps),
+        params=eng.params,
+        key=params_key(eng.params, fps),
+        rng=eng.rng.bit_generator.state,
+    )
+    header = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+    buf = io.BytesIO()
+    np.savez_compressed(buf, meta=header, **{k: getattr(eng, k) for k in _ARRAYS})
+    return buf.getvalue()
+
+
+def loads(blob: bytes):
+    """Rebuild (engine, meta) from a blob; raises ValueError if it doesn't check out."""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as z:
+        meta = json.loads(z["meta"].tobytes().decode("utf-8"))
+        arrays = {k: np.ascontiguousarray(z[k], dtype=np.float32) for k in _ARRAYS}
+
+    if int(meta.get("version", -1)) != CHECKPOINT_VERSION:
+        raise ValueError("Unsupported checkpoint version.")
+    params = meta["params"]
+    params["AXIS_BIAS"] = tuple(params["AXIS_BIAS"])
+    if params_key(params, meta["fps"]) != meta["key"]:
+        raise ValueError("Checkpoint params don't match their hash.")
+
+    state = meta["rng"]
+    bit_gen = getattr(np.random, state["bit_generator"])()
+    bit_gen.state = state
+    rng = np.random.Generator(bit_gen)
+
+    eng = WaveEngine(arrays["P"], arrays["V_prev"], arrays["K"], arrays["W"],
+                     arrays["PHI"], arrays["OMG"], rng, params)
+    return eng, meta
+
+
+def save(path: str, eng: WaveEngine, frame: int, fps: int):
+    """Write a checkpoint file atomically."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(dumps(eng, frame, fps))
+    os.replace(tmp, path)
+
+
+def load(path: str):
+    """(engine, meta) from a checkpoint file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
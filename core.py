@@ -1,14 +1,28 @@
+import base64
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
 import bpy  # type: ignore
 import numpy as np  # type: ignore
 from bpy.app.handlers import persistent  # type: ignore
 
+from . import checkpoint, export, sweep
+from .bake import BakeJob
+from .cache import BakeCache, params_key
+from .engine import ATTR_AGE, ATTRIBUTES, EngineGroup, SnapshotStore, WaveEngine, lod_indices
+from .profiler import Profiler
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Parameter plumbing
 # ──────────────────────────────────────────────────────────────────────────────
 
 def get_params(settings):
-    """Read all runtime params from the Scene settings with safe fallbacks."""
+    """Read all runtime params from a system's settings with safe fallbacks."""
     axis_bias = getattr(settings, "AXIS_BIAS", (0.0, 0.0, 0.0))
     return dict(
         N_POINTS=int(settings.PARTICLE_COUNT),
@@ -16,6 +30,7 @@ def get_params(settings):
         DOT_RADIUS=float(settings.PARTICLE_RADIUS),
         DOT_SUBDIVS=1,  # keep it fast; can expose later
         SEED=int(settings.SEED),
+        INIT_LAYOUT=str(getattr(settings, "INIT_LAYOUT", 'JITTERED')),
 
         NUM_MODES=int(settings.NUM_MODES),
         FREQ_BASE=float(settings.FREQ_BASE),
@@ -25,14 +40,19 @@ def get_params(settings):
         ATTRACT_GAIN=float(settings.ATTRACT_GAIN),
         ALONG_GAIN=float(settings.ALONG_GAIN),
         DIFFUSION=float(settings.DIFFUSION),
+        SEPARATION=float(getattr(settings, "SEPARATION", 0.0)),
+        SEPARATION_RADIUS=float(getattr(settings, "SEPARATION_RADIUS", 1.0)),
 
         AXIS_BIAS=tuple(map(float, axis_bias)),
         VEL_SMOOTH=float(settings.VEL_SMOOTH),
         STEP_CLAMP=float(settings.STEP_CLAMP),
         SOFTNESS=float(settings.SOFTNESS),
 
-        OBJ_NAME="PARTICLEWAVE",
-        DOT_NAME="PARTICLEDOT",
+        THREADS=int(getattr(settings, "THREADS", 0)),
+        BACKEND=str(getattr(settings, "BACKEND", 'NUMPY')),
+
+        OBJ_NAME=f"{system_name(settings)}WAVE",
+        DOT_NAME=f"{system_name(settings)}DOT",
     )
 
 
@@ -69,62 +89,32 @@ def ensure_dot_emission_material(name: str = "PW_Emit_White", strength: float =
     return mat
 
 
-def fibonacci_sphere(n: int) -> np.ndarray:
-    """Even-ish points on a unit sphere via golden-angle spiral (float32)."""
-    i = np.arange(n, dtype=np.float32)
-    ga = np.float32(np.pi * (3.0 - np.sqrt(5.0)))
-    z = np.float32(1.0) - (2.0 * i + np.float32(1.0)) / np.float32(n)
-    r = np.sqrt(np.maximum(np.float32(0.0), np.float32(1.0) - z * z))
-    th = ga * i
-    x, y = np.cos(th) * r, np.sin(th) * r
-    P = np.stack([x, y, z], axis=1).astype(np.float32)
-    P /= (np.linalg.norm(P, axis=1, keepdims=True).astype(np.float32) + 1e-9)
-    return P
-
-
-def jitter_blue_noise(dirs: np.ndarray, strength: float, rng: np.random.Generator) -> np.ndarray:
-    """
-    Tangential jitter to reduce visible structure; keeps points on the sphere.
-    'strength' is in units of approximate neighbor spacing.
-    """
-    n = dirs.shape[0]
-    spacing = np.float32(2.0) / np.sqrt(np.float32(n))
-
-    # Build a local tangent basis for each direction
-    a = np.tile(np.array([0.0, 0.0, 1.0], dtype=np.float32), (n, 1))
-    a[np.abs(dirs[:, 2]) > 0.9] = np.array([1.0, 0.0, 0.0], dtype=np.float32)
-    t = np.cross(dirs, a)
-    t /= (np.linalg.norm(t, axis=1, keepdims=True).astype(np.float32) + 1e-9)
-    b = np.cross(dirs, t)
-
-    phi = rng.uniform(0.0, 2.0 * np.pi, n).astype(np.float32)
-    rad = (spacing * np.float32(strength)) * np.sqrt(rng.uniform(0.0, 1.0, n)).astype(np.float32)
-    uvec = (t * np.cos(phi)[:, None] + b * np.sin(phi)[:, None]).astype(np.float32)
-    d2 = dirs + uvec * rad[:, None]
-    d2 /= (np.linalg.norm(d2, axis=1, keepdims=True).astype(np.float32) + 1e-9)
-    return d2.astype(np.float32)
-
-
 def make_points_object(name: str, verts: np.ndarray):
     """Create a mesh object where each vertex is an instance point."""
     me = bpy.data.meshes.new(name + "Mesh")
-    me.from_pydata([tuple(map(float, v)) for v in verts], [], [])
+    me.vertices.add(verts.shape[0])
+    me.vertices.foreach_set("co", np.ascontiguousarray(verts, dtype=np.float32).reshape(-1))
     me.update()
     ob = bpy.data.objects.new(name, me)
     bpy.context.collection.objects.link(ob)
     return ob
 
 
-def ensure_dot_instance(name: str, radius: float, subdivs: int):
-    """Create an icosphere to instance on points and assign emission material."""
+def fill_icosphere(me, radius: float, subdivs: int):
+    """(Re)write `me` as a smooth-shaded icosphere (keeps the datablock and its materials)."""
     import bmesh  # type: ignore
-    me = bpy.data.meshes.new(name + "Mesh")
     bm = bmesh.new()
     bmesh.ops.create_icosphere(bm, subdivisions=int(subdivs), radius=float(radius))
     bm.to_mesh(me)
     bm.free()
-    for p in me.polygons:
-        p.use_smooth = True
+    me.polygons.foreach_set("use_smooth", np.ones(len(me.polygons), dtype=bool))
+    me.update()
+
+
+def ensure_dot_instance(name: str, radius: float, subdivs: int):
+    """Create an icosphere to instance on points and assign emission material."""
+    me = bpy.data.meshes.new(name + "Mesh")
+    fill_icosphere(me, radius, subdivs)
     ob = bpy.data.objects.new(name, me)
     bpy.context.collection.objects.link(ob)
 
@@ -135,24 +125,320 @@ def ensure_dot_instance(name: str, radius: float, subdivs: int):
     return ob
 
 
-def unit(v: np.ndarray) -> np.ndarray:
-    n = float(np.linalg.norm(v))
-    return (v / n) if n != 0.0 else v
+# Geometry Nodes output (OUTPUT_MODE 'NODES' / 'POINTS'): the points mesh
+# stays the position carrier, a modifier turns its vertices into instances or
+# a point cloud so Blender's instancer / Cycles point primitives do the work.
+_GN_MODIFIER = "PW_Instancer"
+_SCALE_ATTR = "pw_scale"   # per-point radius multiplier (point attribute)
+_RADIUS_NODE = "PW_Radius" # Math node holding DOT_RADIUS in the point-cloud group
+
+
+def point_scales(seed: int, n: int, variation: float) -> np.ndarray:
+    """Seeded per-point radius multipliers in [1 - variation, 1] (float32)."""
+    if variation <= 0.0:
+        return np.ones(n, np.float32)
+    rng = np.random.default_rng([int(seed), 1])
+    return np.float32(1.0) - np.float32(variation) * rng.random(n, dtype=np.float32)
+
+
+def ensure_points_node_group(name: str, mode: str, dot_obj, radius: float):
+    """(Re)build the node group: instances of dot_obj ('NODES') or a point cloud ('POINTS')."""
+    old = bpy.data.node_groups.get(name)
+    if old is not None:
+        bpy.data.node_groups.remove(old)
+    ng = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    ng.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    ng.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    nodes, links = ng.nodes, ng.links
+
+    g_in = nodes.new("NodeGroupInput")
+    g_out = nodes.new("NodeGroupOutput")
+    scale = nodes.new("GeometryNodeInputNamedAttribute")
+    scale.data_type = 'FLOAT'
+    scale.inputs["Name"].default_value = _SCALE_ATTR
+
+    if mode == 'POINTS':
+        pts = nodes.new("GeometryNodeMeshToPoints")
+        pts.mode = 'VERTICES'
+        rad = nodes.new("ShaderNodeMath")
+        rad.name = _RADIUS_NODE
+        rad.operation = 'MULTIPLY'
+        rad.inputs[1].default_value = float(radius)
+        mat = nodes.new("GeometryNodeSetMaterial")
+        mat.inputs["Material"].default_value = ensure_dot_emission_material()
+        links.new(g_in.outputs["Geometry"], pts.inputs["Mesh"])
+        links.new(scale.outputs["Attribute"], rad.inputs[0])
+        links.new(rad.outputs["Value"], pts.inputs["Radius"])
+        links.new(pts.outputs["Points"], mat.inputs["Geometry"])
+        links.new(mat.outputs["Geometry"], g_out.inputs["Geometry"])
+    else:
+        info = nodes.new("GeometryNodeObjectInfo")
+        info.inputs["Object"].default_value = dot_obj
+        info.inputs["As Instance"].default_value = True
+        inst = nodes.new("GeometryNodeInstanceOnPoints")
+        links.new(g_in.outputs["Geometry"], inst.inputs["Points"])
+        links.new(info.outputs["Geometry"], inst.inputs["Instance"])
+        links.new(scale.outputs["Attribute"], inst.inputs["Scale"])
+        links.new(inst.outputs["Instances"], g_out.inputs["Geometry"])
+    return ng
+
+
+def write_point_scales(me, scales: np.ndarray):
+    attr = me.attributes.get(_SCALE_ATTR) or me.attributes.new(_SCALE_ATTR, 'FLOAT', 'POINT')
+    attr.data.foreach_set("value", scales)
+
+
+def attach_points_output(points_obj, mode: str, dot_obj, radius: float, scales: np.ndarray):
+    """Give the points mesh its per-point scale attribute and the instancer modifier."""
+    me = points_obj.data
+    write_point_scales(me, scales)
+    mod = points_obj.modifiers.get(_GN_MODIFIER) or points_obj.modifiers.new(_GN_MODIFIER, 'NODES')
+    mod.node_group = ensure_points_node_group(points_obj.name + "_Instancer", mode, dot_obj, radius)
+    me.update()
+
+
+def _directory(raw: str, default: str) -> str:
+    """Absolute folder for a '//'-relative setting (temp dir while the .blend is unsaved)."""
+    raw = raw or f"//{default}"
+    if raw.startswith("//") and not bpy.data.filepath:
+        return os.path.join(tempfile.gettempdir(), default)
+    return bpy.path.abspath(raw)
+
+
+def bake_directory(settings) -> str:
+    """Absolute bake cache directory."""
+    return _directory(getattr(settings, "CACHE_DIR", ""), "particlewaves_cache")
+
+
+def export_directory(settings) -> str:
+    """Absolute point export directory."""
+    return _directory(getattr(settings, "EXPORT_DIR", ""), "particlewaves_export")
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Global sim state (held in-memory while Blender session lives)
+# Particle systems (held in-memory while Blender session lives)
+#
+# Each SYSTEM NAME is one system with its own engine, objects, bake lookup and
+# snapshots; its settings live on its points object. One frame handler steps
+# all of them, stacking small NumPy systems that share a mode count.
 # ──────────────────────────────────────────────────────────────────────────────
 
-P = None          # (N, 3) positions on unit sphere (float32)
-V_prev = None     # (N, 3) smoothed velocity (float32)
-K = None          # (M, 3) mode directions/frequencies (float32)
-W = None          # (M,)   mode weights (float32)
-PHI = None        # (M,)   mode static phases (float32)
-OMG = None        # (M,)   mode angular speeds (float32)
-rng = None        # np.random.Generator
-params = None     # dict of runtime parameters
-_OBJ_CACHE = None # cache the points object for faster foreach_set
+SYSTEM_PROP = "pw_system"   # custom prop marking a points object (value = system name)
+BATCH_MAX_POINTS = 100_000  # bigger systems step on their own (one call is cheap there)
+
+# Settings pushed into the running engine without a rebuild (update=_live_update)
+_LIVE_SETTINGS = ("WAVE_SPEED", "MOVE_SPEED", "ATTRACT_GAIN", "ALONG_GAIN", "DIFFUSION",
+                  "VEL_SMOOTH", "STEP_CLAMP", "SOFTNESS", "THREADS", "BACKEND",
+                  "VIEWPORT_FRACTION", "SEPARATION", "SEPARATION_RADIUS")
+
+
+class WaveSystem:
+    """Live state of one particle system."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.eng = None       # WaveEngine: state arrays, modes, rng and params
+        self.obj = None       # cache the points object for faster foreach_set
+        self.frame = None     # frame the live state corresponds to
+        self.bake = None      # BakeCache matching the current params (or None)
+        self.bake_key = None  # params key bake was looked up for
+        self.built = None     # (params, OUTPUT_MODE, RADIUS_VARIATION) the objects were built with
+        self.snapshots = SnapshotStore()  # periodic copies of the live state for seeking
+        self.lod = None       # LodView shown in the viewport when VIEWPORT_FRACTION < 1
+        self.shown = None     # what the mesh holds: (track, frame, source, detail); None = unknown
+
+    def points_object(self):
+        """Cached lookup of the points object."""
+        obj = self.obj
+        if obj is None or obj.name not in bpy.data.objects:
+            obj = bpy.data.objects.get(f"{self.name}WAVE")
+            self.obj = obj
+        return obj
+
+    def settings(self):
+        """The settings on the system's points object (Scene settings as a fallback)."""
+        obj = self.points_object()
+        s = getattr(obj, "particlewaves_settings", None) if obj is not None else None
+        return s if s is not None else getattr(bpy.context.scene, "particlewaves_settings", None)
+
+    def close(self):
+        if self.eng is not None:
+            self.eng.close()
+        self.eng = None
+        self.lod = None
+        self.drop_bake()
+
+    def drop_bake(self):
+        """Forget the bake, closing its file handles first (so it can be deleted)."""
+        if self.bake is not None:
+            self.bake.close()
+        self.bake, self.bake_key = None, None
+
+
+class LodView:
+    """
+    Viewport subset of a system: an engine for a stable sample of its
+    particles, with its own frame and snapshots (seek() works on it). The
+    kept particles move exactly as they do in the full system.
+    """
+
+    def __init__(self, system, fraction: float, frame: int):
+        full = system.eng
+        self.fraction = fraction
+        self.indices = lod_indices(full.params["SEED"], full.n_points, fraction)
+
+        # Same base as the full system (so it can seek back that far), but start
+        # from the full state closest before `frame` (current state or a snapshot)
+        base_frame, base = system.snapshots.base
+        self.eng = full.subset(self.indices, base)
+        self.snapshots = SnapshotStore()
+        self.snapshots.reset(base_frame, self.eng)
+        frame = max(int(frame), base_frame)
+        snap_frame, snap = system.snapshots.nearest(frame)
+        if snap_frame <= system.frame <= frame:
+            snap_frame, snap = system.frame, None
+        if snap_frame != base_frame:
+            self.eng.restore(full.subset(self.indices, snap).snapshot())
+        self.frame = snap_frame
+
+
+SYSTEMS = {}   # system name -> WaveSystem
+_GROUPS = {}   # member names -> EngineGroup stacking them
+_FARM = None   # running farm bake process (subprocess.Popen) or None
+_SWEEP = None  # (subprocess.Popen, output directory) of the running sweep, or None
+_SWEEP_INDEX = (None, None, None)  # (sweep.json path, mtime, contents) last read
+_JOB = None    # (system name, BakeJob) of the background bake, or None
+_RENDERING = False  # between render_init and render_complete / render_cancel: full counts
+PROFILER = None     # Profiler while TIMINGS is on (Scene settings), else None
+
+
+def system_name(settings) -> str:
+    """
+    The system the settings belong to: the pw_system stored on a system's
+    points object (editing SYSTEM_NAME there doesn't re-target it), else
+    SYSTEM_NAME (Scene settings, the template for new systems).
+    """
+    owner = getattr(settings, "id_data", None)
+    stored = owner.get(SYSTEM_PROP) if owner is not None and hasattr(owner, "get") else None
+    if stored:
+        return str(stored)
+    return (getattr(settings, "SYSTEM_NAME", "") or "PARTICLE").strip() or "PARTICLE"
+
+
+def _system(settings) -> WaveSystem:
+    """Registry entry for the system the settings describe (created on first use)."""
+    name = system_name(settings)
+    system = SYSTEMS.get(name)
+    if system is None:
+        system = SYSTEMS[name] = WaveSystem(name)
+    return system
+
+
+def context_settings(context):
+    """Settings of the active system object, else the Scene settings (template for new systems)."""
+    obj = getattr(context, "active_object", None)
+    if obj is not None and obj.get(SYSTEM_PROP):
+        s = getattr(obj, "particlewaves_settings", None)
+        if s is not None:
+            return s
+    return getattr(context.scene, "particlewaves_settings", None)
+
+
+def settings_values(settings) -> dict:
+    """Plain copy of every setting (survives the owning object being deleted)."""
+    out = {}
+    for prop in settings.bl_rna.properties:
+        if prop.identifier == "rna_type" or prop.is_readonly:
+            continue
+        value = getattr(settings, prop.identifier)
+        out[prop.identifier] = value if isinstance(value, (str, bool, int, float)) else tuple(value)
+    return out
+
+
+def apply_settings(settings, values: dict):
+    """Write the values that differ (unchanged ones don't fire update callbacks)."""
+    for key, value in values.items():
+        current = getattr(settings, key)
+        if not isinstance(current, (str, bool, int, float)):
+            current = tuple(current)
+        if current != value:
+            setattr(settings, key, value)
+
+
+def _drop_groups(name: str):
+    """Forget every batch that contains (a track of) the system `name`."""
+    for key in [k for k in _GROUPS if any(n == name for n, _ in k)]:
+        _GROUPS.pop(key).close()
+
+
+def _group(members) -> EngineGroup:
+    """
+    Cached stacked group for these (system, track) pairs; rebuilt when a
+    member changed its arrays.
+    """
+    key = tuple((system.name, track is not system) for system, track in members)
+    group = _GROUPS.get(key)
+    if (group is None or not group.valid()
+            or any(e is not track.eng for e, (_, track) in zip(group.engines, members))):
+        for name, _ in key:
+            _drop_groups(name)
+        group = _GROUPS[key] = EngineGroup([track.eng for _, track in members])
+    return group
+
+
+def _viewport_fraction(settings) -> float:
+    """
+    Share of particles simulated in the viewport: VIEWPORT_FRACTION, or all
+    of them with separation on (a subset has different neighbours).
+    """
+    if float(getattr(settings, "SEPARATION", 0.0)) > 0.0:
+        return 1.0
+    return min(1.0, float(getattr(settings, "VIEWPORT_FRACTION", 1.0)))
+
+
+def _track(system, settings):
+    """
+    What the system shows right now: its LodView (made on demand) during
+    interactive use with a viewport fraction < 1, else the full system.
+    """
+    fraction = _viewport_fraction(settings)
+    if fraction >= 1.0 or system.eng is None:
+        system.lod = None
+        return system
+    if _RENDERING:
+        return system
+    if system.lod is None or system.lod.fraction != fraction:
+        _drop_groups(system.name)
+        system.lod = LodView(system, fraction, bpy.context.scene.frame_current)
+    return system.lod
+
+
+def _profiler(scene):
+    """The session Profiler while TIMINGS is on (its log follows the setting), else None."""
+    global PROFILER
+    s = getattr(scene, "particlewaves_settings", None)
+    if s is None or not getattr(s, "PROFILE", False):
+        if PROFILER is not None:
+            PROFILER.close()
+            PROFILER = None
+        return None
+    log = bpy.path.abspath(s.PROFILE_LOG) if getattr(s, "PROFILE_LOG", "") else None
+    if PROFILER is None:
+        PROFILER = Profiler(log_path=log)
+    elif PROFILER.log_path != log:
+        PROFILER.close()
+        PROFILER.log_path = log
+    return PROFILER
+
+
+def memory_bytes() -> int:
+    """Arrays held by all systems: engines (full and LOD), snapshots and batch scratch."""
+    total = sum(group.nbytes for group in _GROUPS.values())
+    for system in SYSTEMS.values():
+        for track in (system, system.lod):
+            if track is not None and track.eng is not None:
+                total += track.eng.nbytes + track.snapshots.nbytes
+    return total
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -160,141 +446,859 @@ _OBJ_CACHE = None # cache the points object for faster foreach_set
 # ──────────────────────────────────────────────────────────────────────────────
 
 def create_particle_wave(settings):
-    """(Re)build the points + instance objects and initialize the field."""
-    global P, V_prev, K, W, PHI, OMG, rng, params, _OBJ_CACHE
+    """
+    (Re)build the system's points + instance objects and initialize the field.
+    When the objects from the last build are still there with the same output
+    mode, they are reused and only what the changed params need is recomputed.
+    """
+    prof = _profiler(bpy.context.scene)
+    if prof is None:
+        return _create_particle_wave(settings)
+    prof.begin("build")
+    try:
+        return _create_particle_wave(settings)
+    finally:
+        prof.end("build", memory_bytes(), n_points=int(settings.PARTICLE_COUNT))
+
 
+def _create_particle_wave(settings):
+    prof = PROFILER
+    system = _system(settings)
+    values = settings_values(settings)  # the settings may live on an object removed below
+    values["SYSTEM_NAME"] = system.name
     params = get_params(settings)
+    mode = getattr(settings, "OUTPUT_MODE", 'VERTS')
+    variation = float(getattr(settings, "RADIUS_VARIATION", 0.0))
+
+    # Same output and objects still there: only redo what the params changed
+    points_obj = bpy.data.objects.get(params["OBJ_NAME"])
+    dot_obj = bpy.data.objects.get(params["DOT_NAME"]) if mode != 'POINTS' else None
+    if (system.eng is not None and system.built is not None and system.built[1] == mode
+            and points_obj is not None and points_obj.type == 'MESH'
+            and (mode == 'POINTS' or dot_obj is not None)):
+        _update_particle_wave(system, params, points_obj, dot_obj, mode, variation, prof)
+        _finish_build(system, values, params, points_obj)
+        system.built = (params, mode, variation)
+        return points_obj, dot_obj
 
     # Clean previous objects
     remove_obj_and_mesh(params["OBJ_NAME"])
     remove_obj_and_mesh(params["DOT_NAME"])
 
-    rng = np.random.default_rng(int(params["SEED"]))
-
-    # Initial positions
-    dirs0 = jitter_blue_noise(
-        fibonacci_sphere(int(params["N_POINTS"])), strength=0.85, rng=rng
-    )
-    P = dirs0.astype(np.float32).copy()
-    V_prev = np.zeros_like(P, dtype=np.float32)
+    system.close()
+    _drop_groups(system.name)
+    t0 = time.perf_counter() if prof else 0.0
+    system.eng = sim = WaveEngine.from_params(params)
+    if prof:
+        t0 = prof.lap("init", t0)
 
     # Scene objects
-    points_obj = make_points_object(params["OBJ_NAME"], (P * np.float32(params["RADIUS"])))
-    dot_obj = ensure_dot_instance(params["DOT_NAME"], params["DOT_RADIUS"], params["DOT_SUBDIVS"])
-
-    # Instance along vertices
-    dot_obj.parent = points_obj
-    points_obj.instance_type = 'VERTS'
-    points_obj.show_instancer_for_viewport = False
-    points_obj.show_instancer_for_render = False
-
-    # Field modes
-    M = int(params["NUM_MODES"])
-    FREQ_BASE = np.float32(params["FREQ_BASE"])
-    AXIS_BIAS = np.array(params["AXIS_BIAS"], dtype=np.float32)
-
-    K = rng.normal(size=(M, 3)).astype(np.float32)
-    K /= (np.linalg.norm(K, axis=1, keepdims=True).astype(np.float32) + 1e-9)
-    K *= (FREQ_BASE * rng.uniform(0.7, 1.3, (M, 1)).astype(np.float32))
-
-    W = rng.uniform(0.6, 1.0, M).astype(np.float32)
-    PHI = rng.uniform(0.0, 2.0 * np.pi, M).astype(np.float32)
-    OMG = (rng.uniform(0.6, 1.4, M).astype(np.float32)
-           * np.float32(params["FIELD_SPEED"]) * np.float32(2.0 * np.pi))
-
-    # Optional bias toward a preferred axis
-    if float(np.linalg.norm(AXIS_BIAS)) > 0.0:
-        AXIS_BIAS = unit(AXIS_BIAS.astype(np.float32))
-        K = (np.float32(0.85) * K + np.float32(0.15) * AXIS_BIAS).astype(np.float32)
-        K /= (np.linalg.norm(K, axis=1, keepdims=True).astype(np.float32) + 1e-9)
-
-    # Meta
-    points_obj["particle_count"] = int(params["N_POINTS"])
-    _OBJ_CACHE = points_obj
+    points_obj = make_points_object(params["OBJ_NAME"], sim.positions())
+    dot_obj = None
+    if mode != 'POINTS':
+        dot_obj = ensure_dot_instance(params["DOT_NAME"], params["DOT_RADIUS"], params["DOT_SUBDIVS"])
 
+    if mode == 'VERTS':
+        # Instance along vertices
+        dot_obj.parent = points_obj
+        points_obj.instance_type = 'VERTS'
+        points_obj.show_instancer_for_viewport = False
+        points_obj.show_instancer_for_render = False
+    else:
+        # Geometry Nodes instancer; the icosphere (if any) is only a source
+        if dot_obj is not None:
+            dot_obj.hide_viewport = True
+            dot_obj.hide_render = True
+        scales = point_scales(params["SEED"], sim.n_points, variation)
+        attach_points_output(points_obj, mode, dot_obj, params["DOT_RADIUS"], scales)
+    if prof:
+        prof.lap("mesh", t0)
+
+    _finish_build(system, values, params, points_obj)
+    system.built = (params, mode, variation)
     return points_obj, dot_obj
 
 
-@persistent
-def advect_points(scene):
-    """Frame-change handler (or manual call) to advance the particle field."""
-    global P, V_prev, K, W, PHI, OMG, rng, params, _OBJ_CACHE
+def _update_particle_wave(system, params, points_obj, dot_obj, mode, variation, prof=None):
+    """Incremental rebuild: reset the engine and touch only the scene data that changed."""
+    sim, prev = system.eng, system.built[0]
+    t0 = time.perf_counter() if prof else 0.0
+    sim.rebuild(params)
+    if prof:
+        t0 = prof.lap("init", t0)
+
+    # Vertex buffer: resize in place (same mesh, object and modifiers) or just rewrite
+    me = points_obj.data
+    resized = len(me.vertices) != sim.n_points
+    if resized:
+        me.clear_geometry()
+        me.vertices.add(sim.n_points)
+    me.vertices.foreach_set("co", sim.positions().reshape(-1))
+
+    if mode != 'VERTS' and (resized or variation != system.built[2] or params["SEED"] != prev["SEED"]):
+        write_point_scales(me, point_scales(params["SEED"], sim.n_points, variation))
+    me.update()
+
+    # Dot size: refill the icosphere, or retune the point-cloud radius
+    if params["DOT_RADIUS"] != prev["DOT_RADIUS"]:
+        if dot_obj is not None:
+            fill_icosphere(dot_obj.data, params["DOT_RADIUS"], params["DOT_SUBDIVS"])
+        else:
+            mod = points_obj.modifiers.get(_GN_MODIFIER)
+            node = mod.node_group.nodes.get(_RADIUS_NODE) if mod and mod.node_group else None
+            if node is not None:
+                node.inputs[1].default_value = float(params["DOT_RADIUS"])
+    if prof:
+        prof.lap("mesh", t0)
 
-    # Safety: nothing to do until built
-    if P is None or V_prev is None or K is None or params is None:
+
+def _finish_build(system, values, params, points_obj):
+    """Common tail of a (re)build: object settings and meta, cached lookups, seek base."""
+    points_obj[SYSTEM_PROP] = system.name
+    points_obj["particle_count"] = int(params["N_POINTS"])
+    apply_settings(points_obj.particlewaves_settings, values)
+    system.obj = points_obj
+
+    # The fresh state belongs to the current frame; it is the seek base
+    system.frame = int(bpy.context.scene.frame_current)
+    _configure_snapshots(system, points_obj.particlewaves_settings)
+    system.snapshots.reset(system.frame, system.eng)
+    system.lod = None
+    _show(system, bpy.context.scene)
+
+
+def remove_system(settings) -> int:
+    """Delete a system's objects and live state; returns how many systems remain."""
+    params = get_params(settings)   # read before the objects (and maybe the settings) go
+    system = SYSTEMS.pop(system_name(settings), None)
+    if system is not None:
+        system.close()
+        _drop_groups(system.name)
+    remove_obj_and_mesh(params["OBJ_NAME"])
+    remove_obj_and_mesh(params["DOT_NAME"])
+    return len(SYSTEMS)
+
+
+def _push_positions(obj, co: np.ndarray):
+    """Bulk-write (N, 3) world-space positions into the points mesh."""
+    if obj and obj.data and len(obj.data.vertices) == co.shape[0]:
+        prof = PROFILER
+        t0 = time.perf_counter() if prof else 0.0
+        obj.data.vertices.foreach_set("co", co.reshape(-1))
+        if prof:
+            t0 = prof.lap("push", t0)
+        obj.data.update()
+        if prof:
+            prof.lap("update", t0)
+
+
+def _push_attributes(track, obj, fps: int):
+    """Bulk-write the engine's per-particle attributes, one foreach_set each."""
+    eng = track.eng
+    if eng.attrs is None or not obj or not obj.data or len(obj.data.vertices) != eng.n_points:
         return
+    base = track.snapshots.base[0] if track.snapshots.base is not None else track.frame
+    eng.attrs[ATTR_AGE].fill((track.frame - base) / fps)
+    me = obj.data
+    prof = PROFILER
+    t0 = time.perf_counter() if prof else 0.0
+    for name, values in zip(ATTRIBUTES, eng.attrs):
+        attr = me.attributes.get(name) or me.attributes.new(name, 'FLOAT', 'POINT')
+        attr.data.foreach_set("value", values)
+    if prof:
+        prof.lap("push", t0)
+
+
+def _fit_mesh(system, n: int, indices=None):
+    """
+    Resize the points mesh to n vertices (the LOD subset `indices`, or all
+    particles) when it shows a different count; per-point scales follow.
+    """
+    obj = system.points_object()
+    if obj is None or obj.data is None or len(obj.data.vertices) == n:
+        return obj
+    me = obj.data
+    me.clear_geometry()
+    me.vertices.add(n)
+    if obj.modifiers.get(_GN_MODIFIER) is not None:
+        s = system.settings()
+        scales = point_scales(int(s.SEED), int(obj.get("particle_count", n)),
+                              float(getattr(s, "RADIUS_VARIATION", 0.0)))
+        write_point_scales(me, scales if indices is None else scales[indices])
+    return obj
+
 
+def _push_track(system, track, fps: int):
+    """Push a track's state: the LOD subset or the full system."""
+    indices = track.indices if track is not system else None
+    obj = _fit_mesh(system, track.eng.n_points, indices)
+    _push_attributes(track, obj, fps)
+    _push_positions(obj, track.eng.positions())
+    system.shown = (track, track.frame, 'LIVE', track.eng.attrs is not None)
+
+
+def _show(system, scene):
+    """Bring what the system should show (subset or full) to the scene frame and push it."""
+    if system.eng is None or system.frame is None:
+        return
     fps = max(1, int(scene.render.fps))
+    track = _track(system, system.settings())
+    seek(track, scene.frame_current, fps)
+    _push_track(system, track, fps)
+
+
+def _configure_snapshots(system, settings):
+    system.snapshots.configure(getattr(settings, "SNAPSHOT_INTERVAL", 50),
+                               getattr(settings, "SNAPSHOT_LIMIT", 32))
+
+
+def _step_to(track, frame: int, fps: int):
+    """Step the track's engine one frame at a time up to `frame`, snapshotting on the grid."""
+    sim = track.eng
     dt = np.float32(1.0 / fps)
-    t = np.float32(scene.frame_current / fps)
-
-    # Evaluate multi-mode cosine field
-    D = P @ K.T                     # (N,M)
-    phase = D + PHI + (OMG * t)     # (N,M)
-    C = (W * np.cos(phase)).astype(np.float32)  # (N,M)
-    grad3 = (C @ K).astype(np.float32)          # (N,3)
-
-    # Tangential gradient & iso-direction (stay on sphere)
-    dot_gn = np.sum(grad3 * P, axis=1, keepdims=True).astype(np.float32)
-    g_tan = grad3 - dot_gn * P
-    g_norm = np.linalg.norm(g_tan, axis=1, keepdims=True).astype(np.float32)
-    g_hat = g_tan / (g_norm + 1e-9)
-
-    iso_dir = np.cross(P, g_hat).astype(np.float32)
-    iso_dir /= (np.linalg.norm(iso_dir, axis=1, keepdims=True).astype(np.float32) + 1e-9)
-
-    # Optional diffusion (blue noise on the tangent plane)
-    if params["DIFFUSION"] > 0.0:
-        R = rng.normal(size=P.shape).astype(np.float32)
-        R -= (np.sum(R * P, axis=1, keepdims=True).astype(np.float32)) * P
-        R /= (np.linalg.norm(R, axis=1, keepdims=True).astype(np.float32) + 1e-9)
-    else:
-        R = np.zeros_like(P, dtype=np.float32)
-
-    # Soft attraction near ridges (prevents harsh snapping)
-    soft = g_norm / (g_norm + np.float32(params["SOFTNESS"]))
-
-    # Target velocity (tangent only), then exponential smoothing
-    V_target = (
-        np.float32(params["MOVE_SPEED"])
-        * (np.float32(params["ATTRACT_GAIN"]) * soft * g_hat
-           + np.float32(params["ALONG_GAIN"]) * iso_dir)
-        + np.float32(params["DIFFUSION"]) * R
-    ).astype(np.float32)
-
-    V_prev[:] = (
-        np.float32(params["VEL_SMOOTH"]) * V_prev
-        + (np.float32(1.0) - np.float32(params["VEL_SMOOTH"])) * V_target
+    for f in range(track.frame + 1, int(frame) + 1):
+        sim.step(np.float32(f / fps), dt)
+        track.snapshots.maybe_store(f, sim)
+    track.frame = int(frame)
+
+
+def seek(track, frame: int, fps: int) -> bool:
+    """
+    Bring a system's (or LodView's) live state to `frame`: continue from the
+    current state when it is the closest earlier one, else restore the
+    nearest earlier snapshot and simulate only the remainder (at most one
+    snapshot interval).
+    """
+    snapshots = track.snapshots
+    if track.eng is None or track.frame is None or snapshots.base is None:
+        return False
+    frame = max(int(frame), snapshots.base[0])
+    snap_frame, snap = snapshots.nearest(frame)
+    if not (snap_frame <= track.frame <= frame):
+        track.eng.restore(snap)
+        track.frame = snap_frame
+    _step_to(track, frame, fps)
+    return True
+
+
+def _active_bake(system, scene, settings):
+    """Bake matching the system's running params (or its settings), if enabled."""
+    if settings is None or not getattr(settings, "USE_BAKE", False):
+        return None
+    p = system.eng.params if system.eng is not None else get_params(settings)
+    key = params_key(p, max(1, int(scene.render.fps)))
+    if key != system.bake_key:
+        system.drop_bake()
+        system.bake = BakeCache.open(bake_directory(settings), key)
+        system.bake_key = key
+    return system.bake
+
+
+def bake_info(settings):
+    """(bytes on disk, bytes as raw float32, mean decode seconds or None) of the system's bake."""
+    system = SYSTEMS.get(system_name(settings))
+    bake = system.bake if system is not None else None
+    if bake is None:
+        return None
+    return bake.disk_bytes, bake.raw_bytes, getattr(bake, "decode_seconds", None)
+
+
+@persistent
+def advect_points(scene):
+    """Frame-change handler (or manual call) to advance every particle system."""
+    frame = int(scene.frame_current)
+    fps = max(1, int(scene.render.fps))
+    live = []
+    batches = {}   # mode count -> (system, track) pairs that advance exactly one frame
+    prof = _profiler(scene)
+    if prof is not None:
+        prof.begin("frame")
+    pushed = 0     # systems whose mesh was rewritten
+
+    for system in list(SYSTEMS.values()):
+        settings = system.settings()
+        track = _track(system, settings)
+
+        # Baked frames replay straight from the memmap, no simulation
+        bake = _active_bake(system, scene, settings)
+        if bake is not None and bake.has_frame(frame):
+            shown = (track, frame, 'BAKE', bake.key)
+            if system.shown != shown:
+                t0 = time.perf_counter() if prof else 0.0
+                co = bake.frame(frame)
+                if track is not system:
+                    co = co[track.indices]
+                if prof:
+                    prof.lap("bake_read", t0)
+                _push_positions(_fit_mesh(system, co.shape[0], getattr(track, "indices", None)), co)
+                system.shown = shown
+                pushed += 1
+            continue
+
+        # Safety: nothing to do until built
+        sim = track.eng
+        if sim is None or track.frame is None:
+            continue
+
+        # Same frame as what the mesh already shows (re-evaluation, frame_set to
+        # the current frame, render_pre after frame_change): no step, no push
+        attrs = bool(getattr(settings, "WRITE_ATTRIBUTES", False))
+        if track.frame == frame and system.shown == (track, frame, 'LIVE', attrs):
+            continue
+        _configure_snapshots(track, settings)
+        sim.enable_attributes(attrs)
+        sim.profiler = prof
+        live.append((system, track))
+        if (track.frame + 1 == frame and sim.backend == 'NUMPY' and sim.n_points <= BATCH_MAX_POINTS
+                and not sim.params.get("SEPARATION", 0.0) > 0.0):
+            batches.setdefault(sim.K.shape[0], []).append((system, track))
+
+    # Playback of small systems: one stacked step per mode count
+    for members in batches.values():
+        if len(members) < 2:
+            continue
+        group = _group(members)
+        group.profiler = prof
+        group.step(np.float32(frame / fps), np.float32(1.0 / fps))
+        for _, track in members:
+            track.frame = frame
+            track.snapshots.maybe_store(frame, track.eng)
+
+    # The rest steps on its own; anything but +1 (scrub back, jump) seeks
+    for system, track in live:
+        seek(track, frame, fps)
+        _push_track(system, track, fps)
+
+    if prof is not None:
+        if pushed or live:
+            prof.end("frame", memory_bytes(), frame=frame, systems=pushed + len(live),
+                     n_points=sum(track.eng.n_points for _, track in live))
+        else:
+            prof.discard("frame")
+
+
+def bake_particle_wave(scene, settings):
+    """Simulate the scene frame range from a fresh state into the system's bake cache."""
+    job = _new_bake_job(scene, settings)
+    bake = job.run()
+    system = _system(settings)
+    system.drop_bake()
+    system.bake, system.bake_key = bake, job.key
+    return bake
+
+
+def _new_bake_job(scene, settings) -> BakeJob:
+    # Drop our own read handles before the file is rewritten (systems may share it)
+    for system in SYSTEMS.values():
+        system.drop_bake()
+    return BakeJob(get_params(settings), max(1, int(scene.render.fps)),
+                   int(scene.frame_start), int(scene.frame_end), bake_directory(settings),
+                   compact=getattr(settings, "BAKE_FORMAT", 'RAW') == 'COMPACT')
+
+
+def start_bake_job(scene, settings) -> BakeJob:
+    """Bake on a worker thread; the caller polls with poll_bake_job() from a timer."""
+    global _JOB
+    job = _new_bake_job(scene, settings).start()
+    _JOB = (system_name(settings), job)
+    return job
+
+
+def bake_job():
+    """The background bake (running, or finished but not yet polled), or None."""
+    return _JOB[1] if _JOB is not None else None
+
+
+def poll_bake_job() -> bool:
+    """
+    Main thread: show the newest baked frame on the system's mesh. Returns
+    True while the job runs; once it is done, playback re-opens the bake.
+    """
+    global _JOB
+    if _JOB is None:
+        return False
+    name, job = _JOB
+    latest = job.latest()
+    system = SYSTEMS.get(name)
+    if latest is not None and system is not None:
+        _push_positions(_fit_mesh(system, latest[1].shape[0]), latest[1])
+        system.shown = None
+    if not job.done:
+        return True
+    _JOB = None
+    for system in SYSTEMS.values():
+        system.drop_bake()
+    return False
+
+
+def cancel_bake_job():
+    """Ask the background bake to stop; the frames it finished are kept."""
+    if _JOB is not None:
+        _JOB[1].cancel(wait=False)
+
+
+def stop_bake_job():
+    """Cancel the background bake and wait for its worker (new file, or unregister)."""
+    global _JOB
+    if _JOB is not None:
+        _JOB[1].cancel()
+        _JOB = None
+
+
+def export_particle_wave(scene, settings) -> int:
+    """
+    Simulate the scene frame range from a fresh state and stream every frame
+    to EXPORT_DIR in EXPORT_FORMAT; a writer thread does the disk work.
+    Returns the number of frames written.
+    """
+    p = get_params(settings)
+    return export.export_range(
+        p, max(1, int(scene.render.fps)), int(scene.frame_start), int(scene.frame_end),
+        export_directory(settings), getattr(settings, "EXPORT_FORMAT", 'PLY'),
+        bool(getattr(settings, "EXPORT_VELOCITY", False)), stem=p["OBJ_NAME"],
     )
 
-    # Step with per-frame clamp for stability
-    step = (dt * V_prev).astype(np.float32)
-    step_len = (np.linalg.norm(step, axis=1, keepdims=True).astype(np.float32) + 1e-9)
-    clamp = np.minimum(step_len, np.float32(params["STEP_CLAMP"])) / step_len
-    step *= clamp
 
-    # Move and renormalize back to the unit sphere
-    P[:] = (P + step).astype(np.float32)
-    P[:] /= (np.linalg.norm(P, axis=1, keepdims=True).astype(np.float32) + 1e-9)
+def fast_forward(scene, frames: int) -> bool:
+    """
+    Integrate `frames` steps straight through every live system (same t
+    sequence as playback) and push each mesh once; systems whose bake covers
+    the target frame skip the simulation and replay it. Then land on the
+    final frame. Returns False if nothing is built yet.
+    """
+    live = [system for system in SYSTEMS.values() if system.eng is not None]
+    if not live:
+        return False
+
+    fps = max(1, int(scene.render.fps))
+    end = int(scene.frame_current) + int(frames)
 
-    # Push updated positions to the mesh (cached lookup)
-    obj = _OBJ_CACHE
-    if obj is None or obj.name not in bpy.data.objects:
-        obj = bpy.data.objects.get(params["OBJ_NAME"])
-        _OBJ_CACHE = obj
+    for system in live:
+        settings = system.settings()
+        bake = _active_bake(system, scene, settings)
+        if bake is not None and bake.has_frame(end):
+            continue
+        track = _track(system, settings)
+        seek(track, end, fps)
+        _push_track(system, track, fps)
 
-    if obj and obj.data and len(obj.data.vertices) == P.shape[0]:
-        obj.data.vertices.foreach_set("co", (P * np.float32(params["RADIUS"])).reshape(-1))
-        obj.data.update()
+    # The handler shows baked frames and finds the live state already at `end`
+    scene.frame_set(end)
+    if advect_points not in bpy.app.handlers.frame_change_pre:
+        advect_points(scene)
+    return True
+
+
+def free_bake(scene, settings):
+    """Delete the bake matching the current settings."""
+    key = params_key(get_params(settings), max(1, int(scene.render.fps)))
+    for system in SYSTEMS.values():
+        system.drop_bake()
+    BakeCache.remove(bake_directory(settings), key)
+
+
+def farm_running() -> bool:
+    return _FARM is not None and _FARM.poll() is None
+
+
+def farm_bake(scene, settings, workers: int = 0):
+    """
+    Start farm.py in a separate Python process that bakes the scene frame
+    range across `workers` processes (0 = one per CPU). Blender stays
+    responsive; the bake is picked up for playback once the process exits.
+    """
+    global _FARM
+
+    p = get_params(settings)
+    fps = max(1, int(scene.render.fps))
+    directory = bake_directory(settings)
+
+    # Drop our own read handles before the file is rewritten
+    for system in SYSTEMS.values():
+        system.drop_bake()
+
+    cmd = [
+        sys.executable, os.path.join(os.path.dirname(__file__), "farm.py"),
+        "--params", "-", "--fps", str(fps),
+        "--start", str(int(scene.frame_start)), "--end", str(int(scene.frame_end)),
+        "--cache-dir", directory, "--workers", str(int(workers)),
+    ]
+    if getattr(settings, "BAKE_FORMAT", 'RAW') == 'COMPACT':
+        cmd.append("--compact")
+    timing = scene.particlewaves_settings
+    if timing.PROFILE and timing.PROFILE_LOG:
+        cmd += ["--profile", bpy.path.abspath(timing.PROFILE_LOG)]
+    _FARM = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    _FARM.stdin.write(json.dumps(p).encode("utf-8"))
+    _FARM.stdin.close()
+    bpy.app.timers.register(_poll_farm, first_interval=1.0)
+    return params_key(p, fps)
+
+
+def stop_farm():
+    """Stop polling and end a running farm bake (the add-on is being unregistered)."""
+    global _FARM
+    if bpy.app.timers.is_registered(_poll_farm):
+        bpy.app.timers.unregister(_poll_farm)
+    if _FARM is not None and _FARM.poll() is None:
+        _FARM.terminate()
+        try:
+            _FARM.wait(timeout=5.0)
+        except subprocess.TimeoutExpired:
+            _FARM.kill()
+    _FARM = None
+
+
+def _poll_farm():
+    """Timer: wait for the farm process, then let playback re-open the bake."""
+    global _FARM
+    if _FARM is None:
+        return None
+    code = _FARM.poll()
+    if code is None:
+        return 1.0
+    if code != 0:
+        print(f"[PARTICLE WAVES] Farm bake failed (exit code {code}).")
+    _FARM = None
+    for system in SYSTEMS.values():
+        system.drop_bake()
+    return None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Parameter sweep (sweep.py in a background process -> contact sheet image)
+# ──────────────────────────────────────────────────────────────────────────────
+
+SWEEP_IMAGE = "PW_SWEEP"   # the contact sheet in bpy.data.images
+
+
+def sweep_directory(settings) -> str:
+    return os.path.join(bake_directory(settings), "sweep")
+
+
+def sweep_running() -> bool:
+    return _SWEEP is not None and _SWEEP[0].poll() is None
+
+
+def start_sweep(scene, settings, seed: int, workers: int = 0):
+    """
+    Start sweep.py on the current settings: SWEEP_COUNT variants (random
+    or a grid) at SWEEP_POINTS particles, rendered across `workers`
+    processes. The sheet is loaded as the SWEEP_IMAGE image when it exits.
+    """
+    global _SWEEP
+    out = sweep_directory(settings)
+    cmd = [
+        sys.executable, os.path.join(os.path.dirname(__file__), "sweep.py"),
+        "--params", "-", "--fps", str(max(1, int(scene.render.fps))), "--out", out,
+        "--count", str(int(settings.SWEEP_COUNT)), "--mode", settings.SWEEP_MODE,
+        "--seed", str(int(seed)), "--x", settings.SWEEP_X, "--y", settings.SWEEP_Y,
+        "--points", str(int(settings.SWEEP_POINTS)), "--frames", str(int(settings.SWEEP_FRAMES)),
+        "--workers", str(int(workers)),
+    ]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    proc.stdin.write(json.dumps(get_params(settings)).encode("utf-8"))
+    proc.stdin.close()
+    _SWEEP = (proc, out)
+    bpy.app.timers.register(_poll_sweep, first_interval=0.5)
+
+
+def _poll_sweep():
+    """Timer: wait for the sweep process, then (re)load its contact sheet."""
+    global _SWEEP
+    if _SWEEP is None:
+        return None
+    proc, out = _SWEEP
+    code = proc.poll()
+    if code is None:
+        return 0.5
+    _SWEEP = None
+    if code != 0:
+        print(f"[PARTICLE WAVES] Sweep failed (exit code {code}).")
+        return None
+    path = os.path.join(out, sweep.SHEET_NAME)
+    img = bpy.data.images.get(SWEEP_IMAGE)
+    if img is None:
+        img = bpy.data.images.load(path, check_existing=False)
+        img.name = SWEEP_IMAGE
+    else:
+        img.filepath = path
+        img.reload()
+    return None
+
+
+def stop_sweep():
+    """Stop polling and end a running sweep (the add-on is being unregistered)."""
+    global _SWEEP
+    if bpy.app.timers.is_registered(_poll_sweep):
+        bpy.app.timers.unregister(_poll_sweep)
+    if _SWEEP is not None and _SWEEP[0].poll() is None:
+        proc = _SWEEP[0]
+        proc.terminate()
+        try:
+            proc.wait(timeout=5.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    _SWEEP = None
+
+
+def sweep_result(settings):
+    """The last sweep's sweep.json for these settings' cache folder (cached by mtime), or None."""
+    global _SWEEP_INDEX
+    path = os.path.join(sweep_directory(settings), sweep.INDEX_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    if _SWEEP_INDEX[:2] != (path, mtime):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                _SWEEP_INDEX = (path, mtime, json.load(f))
+        except (OSError, ValueError):
+            return None
+    return _SWEEP_INDEX[2]
+
+
+def apply_sweep_variant(settings, index: int) -> bool:
+    """Copy variant `index` of the last sweep into the settings; False if there is none."""
+    result = sweep_result(settings)
+    if result is None or not 0 <= index < len(result["variants"]):
+        return False
+    apply_settings(settings, result["variants"][index])
+    return True
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Live parameter updates (property callbacks -> one batched apply)
+# ──────────────────────────────────────────────────────────────────────────────
+
+_LIVE_DELAY = 0.1     # seconds; a slider drag collapses into a single apply
+_LIVE_MIRROR = set()  # systems whose Scene-settings edits go to their object settings
+
+
+def schedule_live_update(settings=None):
+    """Queue one apply of the dynamics settings into the running systems."""
+    if settings is not None and isinstance(settings.id_data, bpy.types.Scene):
+        _LIVE_MIRROR.add(system_name(settings))
+    if SYSTEMS and not bpy.app.timers.is_registered(_apply_live_update):
+        bpy.app.timers.register(_apply_live_update, first_interval=_LIVE_DELAY)
+
+
+def cancel_live_update():
+    """Drop a queued apply (the add-on is being unregistered)."""
+    if bpy.app.timers.is_registered(_apply_live_update):
+        bpy.app.timers.unregister(_apply_live_update)
+    _LIVE_MIRROR.clear()
+
+
+def active_profiler():
+    """The running Profiler (TIMINGS on), or None."""
+    return PROFILER
+
+
+def _apply_live_update():
+    """Timer: copy the current dynamics settings into each engine (no reset)."""
+    scene_s = getattr(bpy.context.scene, "particlewaves_settings", None)
+    if scene_s is not None:
+        values = {k: v for k, v in settings_values(scene_s).items() if k in _LIVE_SETTINGS}
+        for name in _LIVE_MIRROR:
+            obj = SYSTEMS[name].points_object() if name in SYSTEMS else None
+            if obj is not None and getattr(obj, "particlewaves_settings", None) is not None:
+                apply_settings(obj.particlewaves_settings, values)
+    _LIVE_MIRROR.clear()
+
+    scene = bpy.context.scene
+    for system in SYSTEMS.values():
+        s = system.settings()
+        if system.eng is None or s is None:
+            continue
+        params = get_params(s)
+        for track in (system, system.lod):
+            if track is not None and track.eng.update_params(params) and track.frame is not None:
+                # Later snapshots were simulated with the old values
+                track.snapshots.drop_after(track.frame)
+        lod = system.lod
+        if (lod.fraction if lod else 1.0) != _viewport_fraction(s):
+            _show(system, scene)   # display fraction changed: new subset (or back to all)
+    return None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Checkpoints (state survives save/reopen and travels to render nodes)
+# ──────────────────────────────────────────────────────────────────────────────
+
+_CHECKPOINT_PROP = "pw_checkpoint"  # base64 blob stored on the points object
+
+
+def checkpoint_path(settings) -> str:
+    """Sidecar checkpoint file, next to the bake cache."""
+    stem = bpy.path.display_name_from_filepath(bpy.data.filepath) or "untitled"
+    return os.path.join(bake_directory(settings), f"{stem}_{get_params(settings)['OBJ_NAME']}.pwstate")
+
+
+def save_checkpoint(scene, settings) -> bool:
+    """Store the system's live state on its points object or in the sidecar file."""
+    system = SYSTEMS.get(system_name(settings))
+    if system is None or system.eng is None:
+        return False
+    obj = system.points_object()
+    if obj is None:
+        return False
+
+    # The full state (its frame can trail the scene while a LOD subset is shown)
+    frame = int(system.frame if system.frame is not None else scene.frame_current)
+    fps = max(1, int(scene.render.fps))
+    if getattr(settings, "CHECKPOINT_MODE", 'SIDECAR') == 'SIDECAR':
+        checkpoint.save(checkpoint_path(settings), system.eng, frame, fps)
+        if _CHECKPOINT_PROP in obj:
+            del obj[_CHECKPOINT_PROP]
+    else:
+        blob = checkpoint.dumps(system.eng, frame, fps)
+        obj[_CHECKPOINT_PROP] = base64.b64encode(blob).decode("ascii")
+    return True
+
+
+def load_checkpoint(scene, settings) -> bool:
+    """Restore the system's live state from its points object (or the sidecar file)."""
+    obj = bpy.data.objects.get(get_params(settings)["OBJ_NAME"])
+    if obj is None:
+        return False
+    try:
+        raw = obj.get(_CHECKPOINT_PROP)
+        if raw:
+            eng, meta = checkpoint.loads(base64.b64decode(raw))
+        else:
+            path = checkpoint_path(settings)
+            if not os.path.exists(path):
+                return False
+            eng, meta = checkpoint.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[PARTICLE WAVES] Checkpoint not restored: {e}")
+        return False
+
+    if obj.data is None or int(obj.get("particle_count", len(obj.data.vertices))) != eng.n_points:
+        return False
+    fps = max(1, int(scene.render.fps))
+    if int(meta.get("fps", 0)) != fps:
+        # Frame numbers and the timestep both follow the fps it was saved at.
+        print(f"[PARTICLE WAVES] Checkpoint not restored: saved at {meta.get('fps')} fps, scene is {fps} fps")
+        return False
+    system = _system(settings)
+    system.close()
+    _drop_groups(system.name)
+    system.eng = eng
+    system.obj = obj
+    system.frame = int(meta["frame"])
+    system.built = None   # the restored engine has no build history to diff against
+    _configure_snapshots(system, settings)
+    system.snapshots.reset(system.frame, eng)
+    _show(system, scene)
+    return True
+
+
+@persistent
+def _on_save_pre(*_args):
+    """Auto-checkpoint every live system into the file being saved."""
+    scene = bpy.context.scene
+    for system in SYSTEMS.values():
+        s = system.settings()
+        if s is not None and getattr(s, "AUTO_CHECKPOINT", False):
+            save_checkpoint(scene, s)
+
+
+@persistent
+def _on_load_post(*_args):
+    """Drop the previous file's systems; find this file's and restore their checkpoints."""
+    stop_bake_job()
+    for system in SYSTEMS.values():
+        system.close()
+    SYSTEMS.clear()
+    for group in _GROUPS.values():
+        group.close()
+    _GROUPS.clear()
+    _LIVE_MIRROR.clear()
+
+    scene = bpy.context.scene
+    s = getattr(scene, "particlewaves_settings", None)
+    if s is None:
+        return
+
+    # Files from before per-object settings: the Scene settings drive one system
+    legacy = bpy.data.objects.get(get_params(s)["OBJ_NAME"])
+    if legacy is not None and not legacy.get(SYSTEM_PROP):
+        legacy[SYSTEM_PROP] = system_name(s)
+        apply_settings(legacy.particlewaves_settings, settings_values(s))
+
+    for obj in scene.objects:
+        if not obj.get(SYSTEM_PROP):
+            continue
+        s = obj.particlewaves_settings
+        _system(s).obj = obj
+        if getattr(s, "AUTO_CHECKPOINT", False):
+            load_checkpoint(scene, s)
+    # Baked playback works without live state too
+    if SYSTEMS:
+        register_wave_animation_handler()
+
+
+def register_persistence_handlers():
+    if _on_save_pre not in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.append(_on_save_pre)
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister_persistence_handlers():
+    if _on_save_pre in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(_on_save_pre)
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+
+
+@persistent
+def _on_render_init(*_args):
+    """Renders use every particle: tracks switch from the LOD subsets to the full systems."""
+    global _RENDERING
+    _RENDERING = True
+
+
+@persistent
+def _on_render_pre(scene, *_args):
+    """Bring the full systems to the frame about to render (stills don't change frame)."""
+    advect_points(scene)
+
+
+@persistent
+def _on_render_done(*_args):
+    """Back to the LOD subsets for interactive use."""
+    global _RENDERING
+    _RENDERING = False
+    advect_points(bpy.context.scene)
+
+
+_RENDER_HANDLERS = (
+    ("render_init", _on_render_init),
+    ("render_pre", _on_render_pre),
+    ("render_complete", _on_render_done),
+    ("render_cancel", _on_render_done),
+)
 
 
 def register_wave_animation_handler():
-    """Enable frame-change handler once."""
+    """Enable frame-change (and render LOD switch) handlers once."""
     if advect_points not in bpy.app.handlers.frame_change_pre:
         bpy.app.handlers.frame_change_pre.append(advect_points)
+    for name, fn in _RENDER_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if fn not in handlers:
+            handlers.append(fn)
 
 
 def unregister_wave_animation_handler():
-    """Disable frame-change handler if present."""
+    """Disable frame-change and render handlers if present."""
     if advect_points in bpy.app.handlers.frame_change_pre:
-        bpy.app.handlers.frame_change_pre.remove(advect_points)
\ No newline at end of file
+        bpy.app.handlers.frame_change_pre.remove(advect_points)
+    for name, fn in _RENDER_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if fn in handlers:
+            handlers.remove(fn)
@@ -0,0 +1,922 @@
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np  # type: ignore
+
+try:
+    from . import kernels, spatial
+except ImportError:  # imported as a plain module (bench.py / headless tools)
+    import kernels
+    import spatial
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Headless simulation engine (pure NumPy — importable without Blender)
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Mirrors the ParticleWavesSettings defaults; used when running without bpy.
+DEFAULT_PARAMS = dict(
+    N_POINTS=50000,
+    RADIUS=1.0,
+    DOT_RADIUS=0.0025,
+    DOT_SUBDIVS=1,
+    SEED=0,
+    INIT_LAYOUT='JITTERED',
+
+    NUM_MODES=4,
+    FREQ_BASE=1.2,
+    FIELD_SPEED=0.01,
+
+    MOVE_SPEED=0.05,
+    ATTRACT_GAIN=0.7,
+    ALONG_GAIN=0.7,
+    DIFFUSION=0.002,
+    SEPARATION=0.0,
+    SEPARATION_RADIUS=1.0,
+
+    AXIS_BIAS=(0.0, 0.0, 0.0),
+    VEL_SMOOTH=0.97,
+    STEP_CLAMP=0.002,
+    SOFTNESS=0.6,
+
+    THREADS=0,
+    BACKEND='NUMPY',
+
+    OBJ_NAME="PARTICLEWAVE",
+    DOT_NAME="PARTICLEDOT",
+)
+
+
+# Params a running engine can take without a rebuild (see WaveEngine.update_params)
+LIVE_PARAMS = ("MOVE_SPEED", "ATTRACT_GAIN", "ALONG_GAIN", "DIFFUSION", "VEL_SMOOTH",
+               "STEP_CLAMP", "SOFTNESS", "FIELD_SPEED", "THREADS", "BACKEND", "SEPARATION",
+               "SEPARATION_RADIUS")
+
+# Rows of WaveEngine.attrs (per-particle outputs of the last step)
+ATTRIBUTES = ("pw_speed", "pw_field", "pw_ridge", "pw_age")
+ATTR_SPEED, ATTR_FIELD, ATTR_RIDGE, ATTR_AGE = range(len(ATTRIBUTES))
+
+
+def default_params(**overrides) -> dict:
+    """DEFAULT_PARAMS with overrides applied (keys as returned by core.get_params)."""
+    p = dict(DEFAULT_PARAMS)
+    for k, v in overrides.items():
+        if k not in p:
+            raise KeyError(f"Unknown parameter: {k}")
+        p[k] = v
+    return p
+
+
+def fibonacci_sphere(n: int) -> np.ndarray:
+    """Even-ish points on a unit sphere via golden-angle spiral (float32)."""
+    i = np.arange(n, dtype=np.float32)
+    ga = np.float32(np.pi * (3.0 - np.sqrt(5.0)))
+    z = np.float32(1.0) - (2.0 * i + np.float32(1.0)) / np.float32(n)
+    r = np.sqrt(np.maximum(np.float32(0.0), np.float32(1.0) - z * z))
+    th = ga * i
+    x, y = np.cos(th) * r, np.sin(th) * r
+    P = np.stack([x, y, z], axis=1).astype(np.float32)
+    P /= (np.linalg.norm(P, axis=1, keepdims=True).astype(np.float32) + 1e-9)
+    return P
+
+
+def jitter_blue_noise(dirs: np.ndarray, strength: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Tangential jitter to reduce visible structure; keeps points on the sphere.
+    'strength' is in units of approximate neighbor spacing.
+    """
+    n = dirs.shape[0]
+    spacing = np.float32(2.0) / np.sqrt(np.float32(n))
+
+    # Build a local tangent basis for each direction
+    a = np.tile(np.array([0.0, 0.0, 1.0], dtype=np.float32), (n, 1))
+    a[np.abs(dirs[:, 2]) > 0.9] = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+    t = np.cross(dirs, a)
+    t /= (np.linalg.norm(t, axis=1, keepdims=True).astype(np.float32) + 1e-9)
+    b = np.cross(dirs, t)
+
+    phi = rng.uniform(0.0, 2.0 * np.pi, n).astype(np.float32)
+    rad = (spacing * np.float32(strength)) * np.sqrt(rng.uniform(0.0, 1.0, n)).astype(np.float32)
+    uvec = (t * np.cos(phi)[:, None] + b * np.sin(phi)[:, None]).astype(np.float32)
+    d2 = dirs + uvec * rad[:, None]
+    d2 /= (np.linalg.norm(d2, axis=1, keepdims=True).astype(np.float32) + 1e-9)
+    return d2.astype(np.float32)
+
+
+def noise_frame(t, dt) -> int:
+    """Frame number of time t for a step of dt (keys the per-frame noise)."""
+    return int(round(float(t) / float(dt)))
+
+
+# Philox4x64-10 constants (Salmon et al. 2011), as used by np.random.Philox
+_PHILOX_M = (np.uint64(0xD2E7470EE14C6C93), np.uint64(0xCA5A826395121157))
+_PHILOX_W = (0x9E3779B97F4A7C15, 0xBB67AE8584CAA73B)
+_LO32, _S32 = np.uint64(0xFFFFFFFF), np.uint64(32)
+
+
+def _mulhilo(a: np.ndarray, b: np.uint64):
+    """(hi, lo) 64-bit halves of the 128-bit products a * b."""
+    a0, a1 = a & _LO32, a >> _S32
+    b0, b1 = b & _LO32, b >> _S32
+    p00, p01, p10 = a0 * b0, a0 * b1, a1 * b0
+    mid = (p00 >> _S32) + (p01 & _LO32) + (p10 & _LO32)
+    return a1 * b1 + (p01 >> _S32) + (p10 >> _S32) + (mid >> _S32), a * b
+
+
+def _philox_uniforms(seed: int, frame: int, index: np.ndarray, u: np.ndarray):
+    """
+    The float32 pair np.random draws for each particle in `index` (any order,
+    gaps allowed): word `i` of Philox(key=(seed, frame)) evaluated directly,
+    same bits as the sequential generator in noise_directions.
+    """
+    key = [int(seed) % 2**64, int(frame) % 2**64]
+    index = np.asarray(index, np.uint64)
+    zero = np.zeros_like(index)
+    c = [index // np.uint64(4) + np.uint64(1), zero, zero, zero]   # counter is bumped before use
+    for r in range(10):
+        if r:
+            key = [(key[0] + _PHILOX_W[0]) % 2**64, (key[1] + _PHILOX_W[1]) % 2**64]
+        hi0, lo0 = _mulhilo(c[0], _PHILOX_M[0])
+        hi1, lo1 = _mulhilo(c[2], _PHILOX_M[1])
+        c = [hi1 ^ c[1] ^ np.uint64(key[0]), lo1, hi0 ^ c[3] ^ np.uint64(key[1]), lo0]
+    word = np.choose((index % np.uint64(4)).astype(np.intp), c)
+    # float32 draws: top 24 of each 32-bit half (low half first)
+    np.multiply((word & _LO32) >> np.uint64(8), np.float32(2.0 ** -24), out=u[:, 0], casting="unsafe")
+    np.multiply(word >> np.uint64(40), np.float32(2.0 ** -24), out=u[:, 1], casting="unsafe")
+    return u
+
+
+def noise_directions(seed: int, frame: int, start, out: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """
+    Isotropic unit vectors for particles [start, start + len(out)) at `frame`
+    (or for the particle indices in `start` when it is an array), written to
+    float32 `out` (n, 3) using the float32 scratch `u` (n, 2).
+    Counter-based: Philox keyed by (seed, frame), one 64-bit word per particle
+    at counter position `particle index`, so a particle's draw is the same no
+    matter how the rows are chunked, threaded, resumed or subsampled.
+    """
+    if isinstance(start, np.ndarray):
+        _philox_uniforms(seed, frame, start, u)
+    else:
+        key = (int(seed) % 2**64) | ((int(frame) % 2**64) << 64)
+        bit_gen = np.random.Philox(counter=start // 4, key=key)   # 4 words per counter
+        for _ in range(start % 4):
+            bit_gen.random_raw()
+        np.random.Generator(bit_gen).random(out=u, dtype=np.float32)
+
+    # Uniform on the sphere: z in [-1, 1), azimuth in [0, 2pi)
+    z, s, phi = out[:, 2], u[:, 0], u[:, 1]
+    np.multiply(s, np.float32(2.0), out=z)
+    np.subtract(z, np.float32(1.0), out=z)
+    np.multiply(z, z, out=s)
+    np.subtract(np.float32(1.0), s, out=s)
+    np.sqrt(s, out=s)
+    np.multiply(phi, np.float32(2.0 * np.pi), out=phi)
+    np.cos(phi, out=out[:, 0])
+    np.sin(phi, out=out[:, 1])
+    np.multiply(out[:, 0], s, out=out[:, 0])
+    np.multiply(out[:, 1], s, out=out[:, 1])
+    return out
+
+
+def lod_indices(seed: int, n: int, fraction: float) -> np.ndarray:
+    """
+    Sorted particle indices kept at display `fraction` (seeded, so stable;
+    nested, so a larger fraction only adds particles). All N for fraction >= 1.
+    """
+    if fraction >= 1.0:
+        return np.arange(n, dtype=np.int64)
+    rank = np.random.default_rng([int(seed), 2]).random(n)
+    idx = np.flatnonzero(rank < fraction)
+    return idx if idx.size else np.array([np.argmin(rank)])
+
+
+def initial_positions(params: dict, rng: np.random.Generator) -> np.ndarray:
+    """
+    Start layout for N_POINTS (float32): jittered Fibonacci sphere, or
+    Poisson-disk darts for INIT_LAYOUT 'POISSON' (their own seeded stream).
+    Consumes the same draws from rng either way, so the modes do not change.
+    """
+    n = int(params["N_POINTS"])
+    if params.get("INIT_LAYOUT", 'JITTERED') == 'POISSON':
+        rng.uniform(0.0, 2.0 * np.pi, n)   # the jitter's draws
+        rng.uniform(0.0, 1.0, n)
+        return spatial.poisson_disk_sphere(n, np.random.default_rng([int(params["SEED"]), 3]))
+    dirs0 = jitter_blue_noise(fibonacci_sphere(n), strength=0.85, rng=rng)
+    return dirs0.astype(np.float32).copy()
+
+
+def field_modes(params: dict, rng: np.random.Generator):
+    """(K, W, PHI, omg_base) for the wave modes; consumes rng after the positions."""
+    M = int(params["NUM_MODES"])
+    FREQ_BASE = np.float32(params["FREQ_BASE"])
+    AXIS_BIAS = np.array(params["AXIS_BIAS"], dtype=np.float32)
+
+    K = rng.normal(size=(M, 3)).astype(np.float32)
+    K /= (np.linalg.norm(K, axis=1, keepdims=True).astype(np.float32) + 1e-9)
+    K *= (FREQ_BASE * rng.uniform(0.7, 1.3, (M, 1)).astype(np.float32))
+
+    W = rng.uniform(0.6, 1.0, M).astype(np.float32)
+    PHI = rng.uniform(0.0, 2.0 * np.pi, M).astype(np.float32)
+    omg_base = rng.uniform(0.6, 1.4, M).astype(np.float32)
+
+    # Optional bias toward a preferred axis
+    if float(np.linalg.norm(AXIS_BIAS)) > 0.0:
+        AXIS_BIAS = unit(AXIS_BIAS.astype(np.float32))
+        K = (np.float32(0.85) * K + np.float32(0.15) * AXIS_BIAS).astype(np.float32)
+        K /= (np.linalg.norm(K, axis=1, keepdims=True).astype(np.float32) + 1e-9)
+
+    return K, W, PHI, omg_base
+
+
+def mode_speeds(omg_base: np.ndarray, params: dict) -> np.ndarray:
+    """Angular speeds OMG from the per-mode draws and FIELD_SPEED."""
+    return omg_base * np.float32(params["FIELD_SPEED"]) * np.float32(2.0 * np.pi)
+
+
+def unit(v: np.ndarray) -> np.ndarray:
+    n = float(np.linalg.norm(v))
+    return (v / n) if n != 0.0 else v
+
+
+# Working-set budget per tile; the whole (rows x M) field block plus the
+# (rows x 3) temporaries should stay cache resident.
+_DEFAULT_CACHE_BYTES = 1 << 20
+
+
+def _l2_cache_bytes() -> int:
+    """Per-core L2 size where the OS reports it (Linux sysfs), else 1 MiB."""
+    try:
+        with open("/sys/devices/system/cpu/cpu0/cache/index2/size", "r") as f:
+            raw = f.read().strip().upper()
+        scale = {"K": 1 << 10, "M": 1 << 20}.get(raw[-1:], 1)
+        return int(raw.rstrip("KM")) * scale
+    except (OSError, ValueError):
+        return _DEFAULT_CACHE_BYTES
+
+
+def _available_memory() -> int:
+    """Free physical memory in bytes, or 0 when it can't be queried."""
+    try:
+        return int(os.sysconf("SC_AVPHYS_PAGES")) * int(os.sysconf("SC_PAGE_SIZE"))
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+def resolve_threads(threads: int) -> int:
+    """THREADS setting -> worker count (0 = one per CPU)."""
+    threads = int(threads)
+    return max(1, threads if threads > 0 else (os.cpu_count() or 1))
+
+
+def tile_rows(n: int, m: int, cache_bytes: int = None) -> int:
+    """Rows per tile so one tile's workspace fits the L2 budget (multiple of 256)."""
+    budget = int(cache_bytes or _l2_cache_bytes())
+    avail = _available_memory()
+    if avail:
+        budget = min(budget, avail // 16)
+    rows = budget // Workspace.row_bytes(m)
+    rows = max(256, (rows // 256) * 256)
+    return int(min(max(1, n), rows))
+
+
+class Workspace:
+    """Preallocated float32 scratch for one tile of `n` rows (M modes)."""
+
+    def __init__(self, n: int, m: int):
+        f32 = np.float32
+        self.D = np.empty((n, m), f32)     # projections -> phases -> weighted cosines
+        self.G = np.empty((n, 3), f32)     # gradient -> tangential gradient
+        self.H = np.empty((n, 3), f32)     # unit gradient -> target velocity
+        self.I = np.empty((n, 3), f32)     # iso direction
+        self.R = np.empty((n, 3), f32)     # tangent-plane noise
+        self.U = np.empty((n, 2), f32)     # uniform draws behind the noise directions
+        self.T = np.empty((n, 3), f32)     # general (N, 3) scratch / step vector
+        self.a = np.empty((n, 1), f32)     # per-row scalars
+        self.b = np.empty((n, 1), f32)
+        self.c = np.empty(n, f32)          # cross-product component scratch
+
+    @staticmethod
+    def row_bytes(m: int) -> int:
+        """Bytes of scratch per particle row."""
+        return 4 * m + 5 * 12 + 8 + 2 * 4 + 4
+
+    def fits(self, n: int, m: int) -> bool:
+        return self.D.shape == (n, m)
+
+    def rows(self, n: int):
+        """Views of every buffer trimmed to the first n rows (for the last tile)."""
+        if n == self.D.shape[0]:
+            return self
+        return self.slice(0, n)
+
+    def slice(self, a: int, b: int):
+        """Views of every buffer restricted to rows [a, b)."""
+        view = Workspace.__new__(Workspace)
+        view.__dict__.update({k: v[a:b] for k, v in vars(self).items()})
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        return sum(v.nbytes for v in vars(self).values())
+
+
+def _row_norm(X: np.ndarray, out: np.ndarray, tmp: np.ndarray) -> np.ndarray:
+    """np.linalg.norm(X, axis=1, keepdims=True) into `out`, using `tmp` (X-shaped)."""
+    np.multiply(X, X, out=tmp)
+    np.sum(tmp, axis=1, keepdims=True, out=out)
+    return np.sqrt(out, out=out)
+
+
+def _cross(A: np.ndarray, B: np.ndarray, out: np.ndarray, tmp: np.ndarray) -> np.ndarray:
+    """np.cross(A, B) for (N, 3) rows into `out`, using the (N,) `tmp`."""
+    for i, j, k in ((0, 1, 2), (1, 2, 0), (2, 0, 1)):
+        np.multiply(A[:, j], B[:, k], out=out[:, i])
+        np.multiply(A[:, k], B[:, j], out=tmp)
+        np.subtract(out[:, i], tmp, out=out[:, i])
+    return out
+
+
+class WaveEngine:
+    """Particle state + field modes for one system, advanced with step(t, dt)."""
+
+    def __init__(self, P, V_prev, K, W, PHI, OMG, rng, params, tile: int = None,
+                 first_index: int = 0, indices: np.ndarray = None):
+        self.P = P            # (N, 3) positions on unit sphere (float32)
+        self.V_prev = V_prev  # (N, 3) smoothed velocity (float32)
+        self.K = K            # (M, 3) mode directions/frequencies (float32)
+        self.W = W            # (M,)   mode weights (float32)
+        self.PHI = PHI        # (M,)   mode static phases (float32)
+        self.OMG = OMG        # (M,)   mode angular speeds (float32)
+        self.rng = rng        # np.random.Generator (initial state; noise is counter-based)
+        self.params = params  # dict of runtime parameters
+        self.version = 0      # bumped whenever params are replaced (keys cached coefficients)
+        self.tile = int(tile) if tile else tile_rows(P.shape[0], K.shape[0])
+        self.wt = np.empty(K.shape[0], np.float32)     # OMG * t
+        self.co = np.empty_like(P)                     # world-space positions for the mesh push
+        self._ws = []         # one Workspace per worker thread
+        self.first_index = int(first_index)  # global index of row 0 (noise counter)
+        self.indices = indices               # global index per row (subsets), else None
+        self._noise = None    # (N, 3) noise directions for the JIT kernel
+        self._noise_u = None  # (N, 2) uniforms behind them
+        self._push = None     # (N, 3) separation velocity of the current step
+        self.attrs = None     # (len(ATTRIBUTES), N) float32 when enabled, else None
+        self._init = None     # initial P, rng states and base mode speeds (from_params)
+        self._pool = None     # ThreadPoolExecutor, created on first threaded step
+        self.profiler = None  # profiler.Profiler timing the step stages, or None
+
+    @classmethod
+    def from_params(cls, params: dict, tile: int = None):
+        """Fresh state for params (seeded, deterministic); tile=None auto-sizes."""
+        rng = np.random.default_rng(int(params["SEED"]))
+        P0 = initial_positions(params, rng)
+        init = dict(P=P0, rng_modes=rng.bit_generator.state)
+        K, W, PHI, init["omg_base"] = field_modes(params, rng)
+        init["rng_done"] = rng.bit_generator.state
+
+        eng = cls(P0.copy(), np.zeros_like(P0), K, W, PHI, mode_speeds(init["omg_base"], params),
+                  rng, params, tile=tile)
+        eng._init = init
+        return eng
+
+    def subset(self, indices: np.ndarray, state: dict = None):
+        """
+        Engine for the rows `indices` only, from the current state or a
+        snapshot() `state`. Same modes and params, and the noise is keyed by
+        the global index, so each kept particle moves exactly as in the full run.
+        """
+        src = state if state is not None else dict(P=self.P, V_prev=self.V_prev)
+        indices = np.asarray(indices, np.int64)
+        glob = self.indices[indices] if self.indices is not None else indices + self.first_index
+        return WaveEngine(src["P"][indices], src["V_prev"][indices], self.K.copy(), self.W.copy(),
+                          self.PHI.copy(), self.OMG.copy(), np.random.default_rng(int(self.params["SEED"])),
+                          dict(self.params), indices=glob)
+
+    def noise_index(self, lo: int, hi: int):
+        """Noise counter for rows [lo, hi): the first global index, or the index array."""
+        if self.indices is not None:
+            return self.indices[lo:hi]
+        return self.first_index + lo
+
+    def rebuild(self, params: dict) -> set:
+        """
+        Reset to the fresh state for `params` (same result as from_params),
+        redoing only what the changed keys need. Returns the parts redone:
+        'points' (SEED / N_POINTS / INIT_LAYOUT), 'modes' (NUM_MODES / FREQ_BASE / AXIS_BIAS),
+        'speed' (FIELD_SPEED).
+        """
+        old, init = self.params, self._init
+        redo = set()
+        if init is None or any(old.get(k) != params.get(k) for k in ("SEED", "N_POINTS", "INIT_LAYOUT")):
+            redo |= {"points", "modes", "speed"}
+        elif any(old[k] != params[k] for k in ("NUM_MODES", "FREQ_BASE", "AXIS_BIAS")):
+            redo |= {"modes", "speed"}
+        elif old["FIELD_SPEED"] != params["FIELD_SPEED"]:
+            redo.add("speed")
+
+        rng = self.rng
+        if "points" in redo:
+            rng = np.random.default_rng(int(params["SEED"]))
+            init = self._init = dict(P=initial_positions(params, rng), rng_modes=rng.bit_generator.state)
+        if "modes" in redo:
+            rng.bit_generator.state = init["rng_modes"]
+            self.K, self.W, self.PHI, init["omg_base"] = field_modes(params, rng)
+            init["rng_done"] = rng.bit_generator.state
+            self.wt = np.empty(self.K.shape[0], np.float32)
+        if "speed" in redo:
+            self.OMG = mode_speeds(init["omg_base"], params)
+        rng.bit_generator.state = init["rng_done"]
+        self.rng, self.params = rng, params
+        self.version += 1
+
+        # Back to the initial state, reusing the buffers when N is unchanged
+        P0 = init["P"]
+        if P0.shape == self.P.shape:
+            np.copyto(self.P, P0)
+            self.V_prev.fill(0.0)
+        else:
+            self.P, self.V_prev, self.co = P0.copy(), np.zeros_like(P0), np.empty_like(P0)
+            if self.attrs is not None:
+                self.attrs = np.zeros((len(ATTRIBUTES), P0.shape[0]), np.float32)
+        if redo & {"points", "modes"}:
+            self.tile = tile_rows(self.P.shape[0], self.K.shape[0])
+        return redo
+
+    def update_params(self, params: dict) -> set:
+        """
+        Take the LIVE_PARAMS values from `params` into the running state (no
+        reset); FIELD_SPEED rescales OMG in place. Returns the keys changed.
+        """
+        changed = {k for k in LIVE_PARAMS if k in params and params[k] != self.params[k]}
+        if "FIELD_SPEED" in changed:
+            if self._init is not None:
+                np.multiply(self._init["omg_base"], np.float32(params["FIELD_SPEED"]), out=self.OMG)
+                np.multiply(self.OMG, np.float32(2.0 * np.pi), out=self.OMG)
+            else:  # restored engine: no base draws kept, scale the current speeds
+                np.multiply(self.OMG, np.float32(params["FIELD_SPEED"] / self.params["FIELD_SPEED"]),
+                            out=self.OMG)
+        if changed:
+            self.params = dict(self.params, **{k: params[k] for k in changed})
+            self.version += 1
+        return changed
+
+    def enable_attributes(self, on: bool = True):
+        """
+        Keep per-particle speed (world units/s), field gradient magnitude and
+        ridge proximity from each step in `attrs` (the age row is the caller's).
+        Values are filled by the next step.
+        """
+        if not on:
+            self.attrs = None
+        elif self.attrs is None:
+            self.attrs = np.zeros((len(ATTRIBUTES), self.P.shape[0]), np.float32)
+
+    @property
+    def n_points(self) -> int:
+        return int(self.P.shape[0])
+
+    def positions(self, out: np.ndarray = None) -> np.ndarray:
+        """World-space (N, 3) positions (P scaled by RADIUS); reuses a buffer."""
+        if out is None:
+            out = self.co
+        return np.multiply(self.P, np.float32(self.params["RADIUS"]), out=out)
+
+    @property
+    def nbytes(self) -> int:
+        """Arrays held by the engine: state, modes, mesh buffer, attributes and scratch."""
+        arrays = (self.P, self.V_prev, self.K, self.W, self.PHI, self.OMG, self.co, self.attrs,
+                  self.indices)
+        return sum(a.nbytes for a in arrays if a is not None) + self.work_bytes
+
+    @property
+    def work_bytes(self) -> int:
+        """Scratch held by the engine (workspaces + shared noise and separation buffers)."""
+        noise = self._noise.nbytes + self._noise_u.nbytes if self._noise is not None else 0
+        push = self._push.nbytes if self._push is not None else 0
+        return sum(ws.nbytes for ws in self._ws) + noise + push
+
+    @property
+    def backend(self) -> str:
+        """Backend the next step will actually use ('JIT' needs numba)."""
+        if self.params.get("BACKEND", 'NUMPY') == 'JIT' and kernels.HAVE_JIT:
+            return 'JIT'
+        return 'NUMPY'
+
+    def snapshot(self) -> dict:
+        """Copy of the evolving state (positions, velocities, RNG)."""
+        return dict(P=self.P.copy(), V_prev=self.V_prev.copy(),
+                    rng=self.rng.bit_generator.state)
+
+    def restore(self, snap: dict):
+        """Return to a snapshot() in place (modes and params are unchanged)."""
+        np.copyto(self.P, snap["P"])
+        np.copyto(self.V_prev, snap["V_prev"])
+        self.rng.bit_generator.state = snap["rng"]
+
+    def close(self):
+        """Stop worker threads (the engine stays usable; a new pool starts on demand)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _workspace(self, i: int) -> Workspace:
+        m = self.K.shape[0]
+        while len(self._ws) <= i:
+            self._ws.append(Workspace(self.tile, m))
+        if not self._ws[i].fits(self.tile, m):
+            self._ws[i] = Workspace(self.tile, m)
+        return self._ws[i]
+
+    def _chunks(self, n: int):
+        """Contiguous row ranges, one per worker (never more than there are tiles)."""
+        k = min(resolve_threads(self.params.get("THREADS", 1)), -(-n // self.tile))
+        if k <= 1:
+            return [(0, n)]
+        return [(n * i // k, n * (i + 1) // k) for i in range(k)]
+
+    def _executor(self, workers: int) -> ThreadPoolExecutor:
+        if self._pool is None or self._pool._max_workers != workers:
+            self.close()
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pw-step")
+        return self._pool
+
+    def step(self, t, dt):
+        """Advance positions and smoothed velocity in place by one step at time t."""
+        n = self.P.shape[0]
+        np.multiply(self.OMG, t, out=self.wt)
+        frame = noise_frame(t, dt)
+        prof = self.profiler
+        t0 = time.perf_counter() if prof else 0.0
+
+        if self.backend == 'JIT':
+            kernels.set_threads(resolve_threads(self.params.get("THREADS", 1)))
+            push = self._separation()
+            if prof and push is not None:
+                t0 = prof.lap("separation", t0)
+            noise = self._draw_noise(frame)
+            if prof:
+                t0 = prof.lap("noise", t0)
+            kernels.fused_step(self.P, self.V_prev, self.K, self.W, self.PHI, self.wt,
+                               noise, self.params, dt, self.attrs, push)
+            if prof:
+                prof.lap("jit", t0)
+            return
+
+        # Separation needs every neighbour's position from before the step,
+        # so it is found for all rows up front
+        if self._separation() is not None and prof:
+            prof.lap("separation", t0)
+
+        coefs = step_coefs(self.params, dt)
+        chunks = self._chunks(n)
+        if len(chunks) == 1:
+            self._step_range(0, n, self._workspace(0), coefs, frame)
+            return
+
+        # Threaded: each worker draws the noise for its own rows (counter-based,
+        # so identical to the serial draw); NumPy releases the GIL inside the
+        # heavy kernels
+        pool = self._executor(len(chunks))
+        jobs = [pool.submit(self._step_range, a, b, self._workspace(i), coefs, frame)
+                for i, (a, b) in enumerate(chunks)]
+        for job in jobs:
+            job.result()
+
+    def _separation(self):
+        """
+        Tangent push-apart velocity for this step into _push (N, 3), None when
+        SEPARATION is off. The reach is SEPARATION_RADIUS mean spacings.
+        """
+        gain = float(self.params.get("SEPARATION", 0.0))
+        if not gain > 0.0:
+            self._push = None
+            return None
+        n = self.P.shape[0]
+        if self._push is None or self._push.shape[0] != n:
+            self._push = np.empty((n, 3), np.float32)
+        radius = float(self.params.get("SEPARATION_RADIUS", 1.0)) * spatial.mean_spacing(n)
+        if self.backend == 'JIT':
+            kernels.separation(spatial.SphereGrid(self.P, radius), self._push)
+        else:
+            spatial.separation(self.P, radius, self._push)
+        return np.multiply(self._push, np.float32(gain * self.params["MOVE_SPEED"]), out=self._push)
+
+    def _draw_noise(self, frame: int):
+        """All N rows of diffusion directions for `frame` (None when diffusion is off)."""
+        if not self.params["DIFFUSION"] > 0.0:
+            return None
+        n = self.P.shape[0]
+        if self._noise is None or self._noise.shape[0] != n:
+            self._noise = np.empty((n, 3), np.float32)
+            self._noise_u = np.empty((n, 2), np.float32)
+        return noise_directions(self.params["SEED"], frame, self.noise_index(0, n),
+                                self._noise, self._noise_u)
+
+    def _step_range(self, a: int, b: int, ws: Workspace, coefs: dict, frame: int):
+        """Step rows [a, b) tile by tile with one workspace."""
+        for lo in range(a, b, self.tile):
+            hi = min(lo + self.tile, b)
+            self._step_rows(lo, hi, ws.rows(hi - lo), coefs, frame)
+
+    def _step_rows(self, lo: int, hi: int, ws: Workspace, coefs: dict, frame: int):
+        """One step for rows [lo, hi), entirely in workspace buffers."""
+        prof = self.profiler
+        t0 = time.perf_counter() if prof else 0.0
+        P = self.P[lo:hi]
+        _field_rows(P, self.K, self.W, self.PHI, self.wt, ws)
+        if prof:
+            t0 = prof.lap("field", t0)
+        noise = None
+        if self.params["DIFFUSION"] > 0.0:
+            noise = noise_directions(self.params["SEED"], frame, self.noise_index(lo, hi), ws.R, ws.U)
+            if prof:
+                t0 = prof.lap("noise", t0)
+        attrs = self.attrs[:, lo:hi] if self.attrs is not None else None
+        push = self._push[lo:hi] if self._push is not None else None
+        _advance_rows(P, self.V_prev[lo:hi], ws, coefs, noise, attrs, prof, t0, push)
+
+
+def step_coefs(params: dict, dt) -> dict:
+    """Float32 step coefficients for _advance_rows (scalars; EngineGroup uses columns)."""
+    f32 = np.float32
+    smooth = f32(params["VEL_SMOOTH"])
+    return dict(
+        softness=f32(params["SOFTNESS"]),
+        attract=f32(params["ATTRACT_GAIN"]),
+        along=f32(params["ALONG_GAIN"]),
+        move=f32(params["MOVE_SPEED"]),
+        diffusion=f32(params["DIFFUSION"]),
+        smooth=smooth,
+        keep=f32(1.0) - smooth,
+        clamp=f32(params["STEP_CLAMP"]),
+        speed=f32(params["RADIUS"]) / f32(dt),
+        dt=f32(dt),
+    )
+
+
+def _field_rows(P, K, W, PHI, wt, ws):
+    """Gradient of the multi-mode cosine field at P into ws.G (uses ws.D)."""
+    # Evaluate multi-mode cosine field: C = W * cos(P.K + PHI + OMG t)
+    D = np.matmul(P, K.T, out=ws.D)              # (n,M)
+    np.add(D, PHI, out=D)
+    np.add(D, wt, out=D)
+    np.cos(D, out=D)
+    C = np.multiply(D, W, out=D)                 # (n,M)
+    return np.matmul(C, K, out=ws.G)             # (n,3)
+
+
+def _advance_rows(P, V_prev, ws, c: dict, noise=None, attrs=None, prof=None, t0=0.0, push=None):
+    """
+    Everything after the field gradient (in ws.G) for one block of rows.
+    `c` holds step_coefs() values as scalars or (n, 1) per-row columns;
+    `noise` is unit directions (n, 3) or None; `attrs` (>= 3, n) or None;
+    `push` is a separation velocity (n, 3) added to the target, or None.
+    With a profiler, laps 'tangent' and 'integrate' start from t0.
+    """
+    eps = np.float32(1e-9)
+    grad3 = ws.G
+
+    # Tangential gradient & iso-direction (stay on sphere)
+    dot_gn = np.sum(np.multiply(grad3, P, out=ws.T), axis=1, keepdims=True, out=ws.a)
+    g_tan = np.subtract(grad3, np.multiply(dot_gn, P, out=ws.T), out=ws.G)
+    g_norm = _row_norm(g_tan, ws.a, ws.T)
+    g_hat = np.divide(g_tan, np.add(g_norm, eps, out=ws.b), out=ws.H)
+
+    iso_dir = _cross(P, g_hat, ws.I, ws.c)
+    np.divide(iso_dir, np.add(_row_norm(iso_dir, ws.b, ws.T), eps, out=ws.b), out=iso_dir)
+
+    # Optional diffusion (random direction on the tangent plane)
+    if noise is not None:
+        R = noise
+        dot_rn = np.sum(np.multiply(R, P, out=ws.T), axis=1, keepdims=True, out=ws.b)
+        np.subtract(R, np.multiply(dot_rn, P, out=ws.T), out=R)
+        np.divide(R, np.add(_row_norm(R, ws.b, ws.T), eps, out=ws.b), out=R)
+
+    # Soft attraction near ridges (prevents harsh snapping)
+    soft = np.add(g_norm, c["softness"], out=ws.b)
+    np.divide(g_norm, soft, out=soft)
+    if attrs is not None:
+        np.copyto(attrs[ATTR_FIELD][:, None], g_norm)
+        np.copyto(attrs[ATTR_RIDGE][:, None], soft)
+    if prof:
+        t0 = prof.lap("tangent", t0)
+
+    # Target velocity (tangent only), then exponential smoothing
+    np.multiply(soft, c["attract"], out=soft)
+    V_target = np.multiply(g_hat, soft, out=ws.H)
+    np.add(V_target, np.multiply(iso_dir, c["along"], out=iso_dir), out=V_target)
+    np.multiply(V_target, c["move"], out=V_target)
+    if noise is not None:
+        np.add(V_target, np.multiply(R, c["diffusion"], out=R), out=V_target)
+    if push is not None:
+        np.add(V_target, push, out=V_target)
+
+    np.multiply(V_prev, c["smooth"], out=V_prev)
+    np.add(V_prev, np.multiply(V_target, c["keep"], out=V_target), out=V_prev)
+
+    # Step with per-frame clamp for stability
+    step = np.multiply(V_prev, c["dt"], out=ws.T)
+    step_len = np.add(_row_norm(step, ws.a, ws.G), eps, out=ws.a)
+    if attrs is not None:
+        np.multiply(step_len, c["speed"], out=attrs[ATTR_SPEED][:, None])
+    clamp = np.minimum(step_len, c["clamp"], out=ws.b)
+    np.divide(clamp, step_len, out=clamp)
+    np.multiply(step, clamp, out=step)
+
+    # Move and renormalize back to the unit sphere
+    np.add(P, step, out=P)
+    np.divide(P, np.add(_row_norm(P, ws.a, ws.T), eps, out=ws.a), out=P)
+    if prof:
+        prof.lap("integrate", t0)
+
+
+class EngineGroup:
+    """
+    Several NumPy-backend engines with the same mode count, stepped as one
+    stack: their P / V_prev become views into shared arrays, the field is
+    evaluated per system, and everything row-wise after it runs once over the
+    whole stack with per-row coefficient columns. Bit-identical to stepping
+    each engine on its own; it saves the per-call overhead of many small systems.
+    """
+
+    def __init__(self, engines):
+        self.engines = list(engines)
+        self.bounds = np.cumsum([0] + [e.n_points for e in self.engines])
+        self.m = self.engines[0].K.shape[0]
+        self.P = np.concatenate([e.P for e in self.engines])
+        self.V_prev = np.concatenate([e.V_prev for e in self.engines])
+        for e, a, b in zip(self.engines, self.bounds[:-1], self.bounds[1:]):
+            e.P, e.V_prev = self.P[a:b], self.V_prev[a:b]
+        self._views = [(e.P, e.V_prev) for e in self.engines]
+        self.tile = tile_rows(self.P.shape[0], self.m)
+        self._ws = []         # one Workspace per worker thread
+        self._pool = None
+        self._coefs = None    # (key, columns) for the members' current params and dt
+        self._attrs = None    # (3, N) stacked speed / field / ridge when any member wants them
+        self.profiler = None  # profiler.Profiler timing the step stages, or None
+
+    def valid(self) -> bool:
+        """
+        False once a member got new arrays, a different mode count or
+        separation turned on (rebuild the group, or step it on its own).
+        """
+        return all(e.P is p and e.V_prev is v and e.K.shape[0] == self.m and e.backend == 'NUMPY'
+                   and not e.params.get("SEPARATION", 0.0) > 0.0
+                   for e, (p, v) in zip(self.engines, self._views))
+
+    def step(self, t, dt):
+        """One step for every member at time t."""
+        engines, bounds = self.engines, self.bounds
+        for e in engines:
+            np.multiply(e.OMG, t, out=e.wt)
+        frame = noise_frame(t, dt)
+        coefs = self._columns(dt)
+        want_attrs = any(e.attrs is not None for e in engines)
+        if want_attrs and self._attrs is None:
+            self._attrs = np.zeros((3, self.P.shape[0]), np.float32)
+
+        # Tiles split into one contiguous run per worker (same rule as the engine)
+        n = self.P.shape[0]
+        tiles = [(lo, min(lo + self.tile, n)) for lo in range(0, n, self.tile)]
+        k = min(resolve_threads(max(e.params.get("THREADS", 1) for e in engines)), len(tiles))
+        runs = [tiles[len(tiles) * i // k:len(tiles) * (i + 1) // k] for i in range(k)]
+        while len(self._ws) < k:
+            self._ws.append(Workspace(self.tile, self.m))
+        if k == 1:
+            self._step_tiles(runs[0], self._ws[0], coefs, frame, want_attrs)
+        else:
+            if self._pool is None or self._pool._max_workers != k:
+                self.close()
+                self._pool = ThreadPoolExecutor(max_workers=k, thread_name_prefix="pw-group")
+            jobs = [self._pool.submit(self._step_tiles, run, ws, coefs, frame, want_attrs)
+                    for run, ws in zip(runs, self._ws)]
+            for job in jobs:
+                job.result()
+
+        if want_attrs:
+            for e, a, b in zip(engines, bounds[:-1], bounds[1:]):
+                if e.attrs is not None:
+                    np.copyto(e.attrs[:3], self._attrs[:, a:b])
+
+    @property
+    def nbytes(self) -> int:
+        """Scratch held by the group (the stacked P / V_prev count through the members' views)."""
+        attrs = self._attrs.nbytes if self._attrs is not None else 0
+        return attrs + sum(ws.nbytes for ws in self._ws)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _step_tiles(self, tiles, ws_full: Workspace, coefs: dict, frame: int, want_attrs: bool):
+        engines, bounds, prof = self.engines, self.bounds, self.profiler
+        noisy = [e.params["DIFFUSION"] > 0.0 for e in engines]
+        for lo, hi in tiles:
+            ws = ws_full.rows(hi - lo)
+            t0 = time.perf_counter() if prof else 0.0
+
+            # Field and noise per member segment inside the tile
+            for e, a, b, use_noise in zip(engines, bounds[:-1], bounds[1:], noisy):
+                s, u = max(a, lo), min(b, hi)
+                if s >= u:
+                    continue
+                seg = ws.slice(s - lo, u - lo)
+                _field_rows(self.P[s:u], e.K, e.W, e.PHI, e.wt, seg)
+                if prof:
+                    t0 = prof.lap("field", t0)
+                if use_noise:
+                    noise_directions(e.params["SEED"], frame, e.noise_index(s - a, u - a), seg.R, seg.U)
+                elif any(noisy):
+                    seg.R.fill(0.0)
+                if prof:
+                    t0 = prof.lap("noise", t0)
+
+            c = {k: (v[lo:hi] if isinstance(v, np.ndarray) and v.ndim == 2 else v)
+                 for k, v in coefs.items()}
+            _advance_rows(self.P[lo:hi], self.V_prev[lo:hi], ws, c,
+                          ws.R if any(noisy) else None,
+                          self._attrs[:, lo:hi] if want_attrs else None, prof, t0)
+
+    def _columns(self, dt) -> dict:
+        """Per-row coefficient columns (a plain scalar where all members agree)."""
+        key = (float(dt), tuple(e.version for e in self.engines))
+        if self._coefs is not None and self._coefs[0] == key:
+            return self._coefs[1]
+        per = [step_coefs(e.params, dt) for e in self.engines]
+        sizes = np.diff(self.bounds)
+        cols = {}
+        for k in per[0]:
+            vals = [p[k] for p in per]
+            if all(v == vals[0] for v in vals):
+                cols[k] = vals[0]
+            else:
+                cols[k] = np.repeat(np.array(vals, np.float32), sizes)[:, None]
+        self._coefs = (key, cols)
+        return cols
+
+
+class SnapshotStore:
+    """
+    Engine snapshots every `interval` frames, for random-access seeking.
+    The build frame is pinned; the rest are bounded by `limit` and the least
+    recently used one is evicted first.
+    """
+
+    def __init__(self, interval: int = 50, limit: int = 32):
+        self.interval = max(1, int(interval))
+        self.limit = max(1, int(limit))
+        self.base = None              # (frame, snapshot) at build time
+        self._snaps = OrderedDict()   # frame -> snapshot, LRU order
+
+    def configure(self, interval: int, limit: int):
+        """Apply new settings; a different interval invalidates stored frames."""
+        interval, limit = max(1, int(interval)), max(1, int(limit))
+        if interval != self.interval:
+            self._snaps.clear()
+        self.interval, self.limit = interval, limit
+        self._evict()
+
+    def reset(self, frame: int, eng: WaveEngine):
+        """Forget everything and pin the current state as the base at `frame`."""
+        self._snaps.clear()
+        self.base = (int(frame), eng.snapshot())
+
+    def clear(self):
+        """Drop every snapshot, including the base."""
+        self._snaps.clear()
+        self.base = None
+
+    def drop_after(self, frame: int):
+        """Forget snapshots later than `frame` (they no longer follow from the current state)."""
+        for f in [f for f in self._snaps if f > frame]:
+            del self._snaps[f]
+
+    def maybe_store(self, frame: int, eng: WaveEngine):
+        """Snapshot `eng` if `frame` is on the interval grid (counted from the base)."""
+        if self.base is None or frame <= self.base[0]:
+            return
+        if (frame - self.base[0]) % self.interval == 0 and frame not in self._snaps:
+            self._snaps[int(frame)] = eng.snapshot()
+            self._evict()
+
+    def nearest(self, frame: int):
+        """(frame, snapshot) closest at or before `frame`, or None if before the base."""
+        if self.base is None or frame < self.base[0]:
+            return None
+        best = max((f for f in self._snaps if f <= frame), default=None)
+        if best is None:
+            return self.base
+        self._snaps.move_to_end(best)
+        return best, self._snaps[best]
+
+    @property
+    def nbytes(self) -> int:
+        snaps = list(self._snaps.values()) + ([self.base[1]] if self.base else [])
+        return sum(s["P"].nbytes + s["V_prev"].nbytes for s in snaps)
+
+    def _evict(self):
+        while len(self._snaps) > self.limit:
+            self._snaps.popitem(last=False)
@@ -0,0 +1,272 @@
+"""
+Streaming point-cache export: per-frame PLY, one NPZ container or Alembic points.
+
+The simulation hands each frame to an ExportStream, which copies it into one
+of a few preallocated buffers and returns; a writer thread drains the buffers
+to disk. When the writer falls behind, push() waits for a free buffer, so
+memory stays bounded at `depth` frames.
+
+Run from the add-on folder (the EXPORT button does the same in Blender):
+
+    python export.py --params params.json --fps 24 --start 1 --end 250 --format PLY --out ./export
+    python export.py --params - --format NPZ --velocity ...      # params JSON on stdin
+
+Positions are world space; velocities (optional) are world units per second.
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import zipfile
+
+import numpy as np  # type: ignore
+
+try:
+    import alembic  # type: ignore
+    import imath  # type: ignore
+    import imathnumpy  # type: ignore
+except ImportError:  # optional: only the ABC format needs PyAlembic
+    alembic = None
+
+try:
+    from .engine import WaveEngine
+except ImportError:  # run as a script from the add-on folder
+    from engine import WaveEngine
+
+
+FORMATS = ('PLY', 'NPZ', 'ABC')
+DEFAULT_DEPTH = 8  # frames buffered between the simulation and the writer
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Writers (called on the writer thread only)
+# ──────────────────────────────────────────────────────────────────────────────
+
+class PLYWriter:
+    """One binary little-endian PLY per frame: <out>/<stem>_<frame>.ply."""
+
+    def __init__(self, out: str, stem: str, fps: int, velocity: bool):
+        os.makedirs(out, exist_ok=True)
+        self.out, self.stem = out, stem
+        self.props = ("x", "y", "z") + (("vx", "vy", "vz") if velocity else ())
+
+    def write(self, frame: int, data: np.ndarray):
+        header = "".join(
+            ["ply\nformat binary_little_endian 1.0\n", f"element vertex {data.shape[0]}\n"]
+            + [f"property float {p}\n" for p in self.props] + ["end_header\n"]
+        ).encode("ascii")
+        path = os.path.join(self.out, f"{self.stem}_{int(frame):04d}.ply")
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(data.astype("<f4", copy=False).tobytes())
+
+    def close(self):
+        pass
+
+
+class NPZWriter:
+    """
+    One uncompressed .npz, appended frame by frame (P_<frame>, V_<frame>);
+    np.load reads it like any savez file.
+    """
+
+    def __init__(self, out: str, stem: str, fps: int, velocity: bool):
+        os.makedirs(out, exist_ok=True)
+        self.path = os.path.join(out, f"{stem}.npz")
+        self.velocity = velocity
+        self.zf = zipfile.ZipFile(self.path + ".tmp", "w", zipfile.ZIP_STORED, allowZip64=True)
+        self._entry("fps", np.array(int(fps)))
+        self.frames = []
+
+    def _entry(self, name: str, arr: np.ndarray):
+        with self.zf.open(name + ".npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, np.ascontiguousarray(arr), allow_pickle=False)
+
+    def write(self, frame: int, data: np.ndarray):
+        self._entry(f"P_{int(frame):04d}", data[:, :3])
+        if self.velocity:
+            self._entry(f"V_{int(frame):04d}", data[:, 3:])
+        self.frames.append(int(frame))
+
+    def close(self):
+        self._entry("frames", np.array(self.frames, dtype=np.int64))
+        self.zf.close()
+        os.replace(self.path + ".tmp", self.path)
+
+
+class ABCWriter:
+    """Alembic OPoints, one sample per frame (needs the PyAlembic bindings)."""
+
+    def __init__(self, out: str, stem: str, fps: int, velocity: bool, frame_start: int = 1):
+        if alembic is None:
+            raise ValueError("Alembic export needs the PyAlembic module (alembic, imath, imathnumpy).")
+        from alembic import Abc, AbcCoreAbstract, AbcGeom  # type: ignore
+        os.makedirs(out, exist_ok=True)
+        self.path = os.path.join(out, f"{stem}.abc")
+        self.archive = Abc.OArchive(self.path)
+        ts = AbcCoreAbstract.TimeSampling(1.0 / fps, frame_start / fps)
+        points = AbcGeom.OPoints(self.archive.getTop(), stem, self.archive.addTimeSampling(ts))
+        self.schema = points.getSchema()
+        self.sample_type = AbcGeom.OPointsSchemaSample
+        self.velocity = velocity
+        self.ids = None
+
+    @staticmethod
+    def _v3f(arr: np.ndarray):
+        out = imath.V3fArray(arr.shape[0])
+        imathnumpy.arrayToNumpy(out)[:] = arr
+        return out
+
+    def write(self, frame: int, data: np.ndarray):
+        n = data.shape[0]
+        if self.ids is None:
+            self.ids = imath.UInt64Array(n)
+            imathnumpy.arrayToNumpy(self.ids)[:] = np.arange(n, dtype=np.uint64)
+        sample = self.sample_type(self._v3f(data[:, :3]), self.ids)
+        if self.velocity:
+            sample.setVelocities(self._v3f(data[:, 3:]))
+        self.schema.set(sample)
+
+    def close(self):
+        self.schema = None
+        self.archive = None   # the archive is finalised when released
+
+
+def open_writer(fmt: str, out: str, stem: str, fps: int, velocity: bool, frame_start: int = 1):
+    if fmt == 'PLY':
+        return PLYWriter(out, stem, fps, velocity)
+    if fmt == 'NPZ':
+        return NPZWriter(out, stem, fps, velocity)
+    if fmt == 'ABC':
+        return ABCWriter(out, stem, fps, velocity, frame_start)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bounded hand-off to the writer thread
+# ──────────────────────────────────────────────────────────────────────────────
+
+class ExportStream:
+    """
+    Frames go in through push() (copied into a free buffer), a background
+    thread writes them in order. depth=0 writes inline (no thread).
+    """
+
+    def __init__(self, writer, n_points: int, velocity: bool, depth: int = DEFAULT_DEPTH):
+        self.writer = writer
+        self.velocity = velocity
+        self.error = None
+        width = 6 if velocity else 3
+        self._free = queue.Queue()
+        self._full = queue.Queue()
+        for _ in range(max(1, int(depth))):
+            self._free.put(np.empty((n_points, width), np.float32))
+        self._thread = None
+        if depth > 0:
+            self._thread = threading.Thread(target=self._drain, name="pw-export", daemon=True)
+            self._thread.start()
+
+    def push(self, frame: int, eng: WaveEngine):
+        """Queue the engine's current positions (and velocities) for `frame`."""
+        if self.error is not None:
+            raise self.error
+        buf = self._free.get()   # waits while every buffer is still being written
+        eng.positions(out=buf[:, :3])
+        if self.velocity:
+            np.multiply(eng.V_prev, np.float32(eng.params["RADIUS"]), out=buf[:, 3:])
+        if self._thread is None:
+            self.writer.write(frame, buf)
+            self._free.put(buf)
+        else:
+            self._full.put((frame, buf))
+
+    def close(self):
+        """Flush the queue, finish the file(s); re-raises a writer error."""
+        if self._thread is not None:
+            self._full.put(None)
+            self._thread.join()
+            self._thread = None
+        if self.error is None:
+            self.writer.close()
+        if self.error is not None:
+            raise self.error
+
+    def _drain(self):
+        while True:
+            item = self._full.get()
+            if item is None:
+                return
+            frame, buf = item
+            try:
+                if self.error is None:
+                    self.writer.write(frame, buf)
+            except Exception as e:  # surfaced on the next push() / close()
+                self.error = e
+            self._free.put(buf)
+
+
+def export_range(params: dict, fps: int, frame_start: int, frame_end: int, out: str,
+                 fmt: str = 'PLY', velocity: bool = False, depth: int = DEFAULT_DEPTH,
+                 stem: str = None, progress=None) -> int:
+    """
+    Simulate [frame_start, frame_end] from a fresh state and stream every
+    frame to `out`. `progress(done, total)` is called per frame. Returns the
+    number of frames written.
+    """
+    fps = max(1, int(fps))
+    dt = np.float32(1.0 / fps)
+    start, end = int(frame_start), int(frame_end)
+    eng = WaveEngine.from_params(params)
+    writer = open_writer(fmt, out, stem or params.get("OBJ_NAME", "PARTICLEWAVE"), fps, velocity, start)
+    stream = ExportStream(writer, eng.n_points, velocity, depth)
+    total = end - start + 1
+    try:
+        stream.push(start, eng)
+        for frame in range(start + 1, end + 1):
+            eng.step(np.float32(frame / fps), dt)
+            stream.push(frame, eng)
+            if progress is not None:
+                progress(frame - start + 1, total)
+    finally:
+        eng.close()
+        stream.close()
+    return total
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────────
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Simulate and export particle-wave points per frame.")
+    ap.add_argument("--params", required=True, help="params JSON file ('-' = stdin)")
+    ap.add_argument("--fps", type=int, required=True)
+    ap.add_argument("--start", type=int, required=True, help="first frame")
+    ap.add_argument("--end", type=int, required=True, help="last frame")
+    ap.add_argument("--out", required=True, help="output directory")
+    ap.add_argument("--format", default='PLY', choices=FORMATS)
+    ap.add_argument("--velocity", action="store_true", help="also write per-point velocity")
+    ap.add_argument("--depth", type=int, default=DEFAULT_DEPTH,
+                    help="frames buffered for the writer thread (0 = write inline)")
+    args = ap.parse_args(argv)
+
+    if args.params == "-":
+        params = json.load(sys.stdin)
+    else:
+        with open(args.params, "r", encoding="utf-8") as f:
+            params = json.load(f)
+    params["AXIS_BIAS"] = tuple(params["AXIS_BIAS"])
+
+    t0 = time.perf_counter()
+    frames = export_range(params, args.fps, args.start, args.end, args.out,
+                          args.format, args.velocity, max(0, args.depth))
+    print(f"[PARTICLE WAVES] exported {frames} frames ({args.format}) to {args.out} "
+          f"in {time.perf_counter() - t0:.1f}s", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Process-pool bake: split the particles (not the frames) across worker processes.
+
+Particles never interact, so each worker gets a block of the initial
+distribution plus the shared modes, simulates that block for the whole frame
+range and writes it straight into the bake's memory-mapped .npy. The blocks
+tile the file, so there is nothing to merge afterwards.
+
+Run from the add-on folder (the FARM BAKE button starts it the same way):
+
+    python farm.py --params params.json --fps 24 --start 1 --end 250 --cache-dir ./cache
+    python farm.py --params - --workers 16 ...      # params JSON on stdin
+
+The diffusion noise is counter-based (keyed by seed, frame and particle
+index), so the result is identical to a serial bake for any worker count.
+With SEPARATION on the particles do interact, and the whole system runs as
+one block.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np  # type: ignore
+
+try:
+    from .cache import BakeCache, CompactBake, params_key
+    from .engine import WaveEngine, resolve_threads
+    from .profiler import Profiler
+except ImportError:  # run as a script from the add-on folder
+    from cache import BakeCache, CompactBake, params_key
+    from engine import WaveEngine, resolve_threads
+    from profiler import Profiler
+
+
+DEFAULT_BLOCK = 16_384  # particles per task
+
+
+def _simulate_block(path, a, b, P0, modes, params, fps, frame_start, n_frames, profile_log=None):
+    """
+    Worker: run particles [a, b) for the whole range, writing into the shared
+    memmap. With `profile_log`, every frame's stage timings are appended there.
+    """
+    data = np.load(path, mmap_mode="r+")
+    K, W, PHI, OMG = modes
+    params = dict(params, THREADS=1)   # the processes are the parallelism
+    eng = WaveEngine(P0, np.zeros_like(P0), K, W, PHI, OMG,
+                     np.random.default_rng(int(params["SEED"])), params, first_index=a)
+    prof = None
+    if profile_log:
+        eng.profiler = prof = Profiler(log_path=profile_log, tags={"block": a, "n_points": b - a})
+    dt = np.float32(1.0 / fps)
+    for i in range(1, n_frames):
+        if prof is not None:
+            prof.begin("frame")
+        eng.step(np.float32((frame_start + i) / fps), dt)
+        eng.positions(out=data[i, a:b])
+        if prof is not None:
+            prof.end("frame", eng.nbytes, frame=frame_start + i)
+    eng.close()
+    if prof is not None:
+        prof.close()
+    data.flush()
+    del data
+    return b - a
+
+
+def farm_bake(params: dict, fps: int, frame_start: int, frame_end: int, directory: str,
+              workers: int = 0, block: int = DEFAULT_BLOCK, progress=None,
+              profile_log: str = None, compact: bool = False) -> BakeCache:
+    """
+    Bake [frame_start, frame_end] with `workers` processes (0 = one per CPU).
+    `progress(done, total)` is called as particle blocks finish; with
+    `profile_log`, workers append per-frame stage timings (JSON lines) there.
+    With `compact`, the finished bake is transcoded to the compact format
+    (workers write particle blocks across all frames, and compact bakes are
+    coded frame by frame). Separation needs every neighbour, so with it on
+    there is a single block.
+    """
+    fps = max(1, int(fps))
+    key = params_key(params, fps)
+    eng = WaveEngine.from_params(params)
+    n = eng.n_points
+    n_frames = int(frame_end) - int(frame_start) + 1
+    if params.get("SEPARATION", 0.0) > 0.0:
+        block = n
+
+    bake = BakeCache.create(directory, key, frame_start, frame_end, n)
+    eng.positions(out=bake.frame(frame_start))
+    bake.data.flush()
+
+    path = BakeCache.data_path(directory, key)
+    modes = (eng.K, eng.W, eng.PHI, eng.OMG)
+    done = 0
+    with ProcessPoolExecutor(max_workers=resolve_threads(workers)) as pool:
+        futures = [
+            pool.submit(_simulate_block, path, a, min(a + block, n),
+                        eng.P[a:a + block].copy(), modes, params, fps, int(frame_start), n_frames,
+                        profile_log)
+            for a in range(0, n, block)
+        ]
+        for fut in as_completed(futures):
+            done += fut.result()
+            if progress is not None:
+                progress(done, n)
+
+    bake.commit(n_frames)
+    if compact:
+        raw = bake
+        bake = CompactBake.from_bake(raw, params["RADIUS"])   # finished, read-only
+        raw.close()
+    return bake
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _read_params(src: str) -> dict:
+    if src == "-":
+        params = json.load(sys.stdin)
+    else:
+        with open(src, "r", encoding="utf-8") as f:
+            params = json.load(f)
+    params["AXIS_BIAS"] = tuple(params["AXIS_BIAS"])
+    return params
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Bake the particle-wave engine across processes.")
+    ap.add_argument("--params", required=True, help="params JSON file ('-' = stdin)")
+    ap.add_argument("--fps", type=int, required=True)
+    ap.add_argument("--start", type=int, required=True, help="first frame")
+    ap.add_argument("--end", type=int, required=True, help="last frame")
+    ap.add_argument("--cache-dir", required=True, help="bake cache directory")
+    ap.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per CPU)")
+    ap.add_argument("--block", type=int, default=DEFAULT_BLOCK, help="particles per task")
+    ap.add_argument("--profile", default=None, metavar="PATH",
+                    help="append per-frame stage timings (JSON lines) to PATH")
+    ap.add_argument("--compact", action="store_true",
+                    help="store the bake quantised and compressed (see cache.CompactBake)")
+    args = ap.parse_args(argv)
+
+    params = _read_params(args.params)
+    t0 = time.perf_counter()
+
+    def progress(done, total):
+        print(f"[PARTICLE WAVES] farm bake: {done}/{total} particles", flush=True)
+
+    bake = farm_bake(params, args.fps, args.start, args.end, args.cache_dir,
+                     args.workers, max(1, args.block), progress, args.profile, args.compact)
+    print(f"[PARTICLE WAVES] farm bake {bake.key}: {bake.frames_done} frames x "
+          f"{bake.n_points} particles in {time.perf_counter() - t0:.1f}s", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+import numpy as np  # type: ignore
+
+try:
+    import numba  # type: ignore
+except ImportError:  # optional: the engine falls back to its NumPy step
+    numba = None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Optional JIT backend: the whole per-particle update fused into one loop
+#
+# Same math as WaveEngine._step_rows, but each particle is read once, kept in
+# registers through mode sum -> tangent projection -> iso direction -> noise
+# -> smoothing -> clamp -> renormalise, and written once. Float32 throughout;
+# results match the NumPy path to rounding (summation order differs, and the
+# cosine is a polynomial that LLVM can vectorise, |error| < 5e-7).
+# ──────────────────────────────────────────────────────────────────────────────
+
+HAVE_JIT = numba is not None
+
+# Stand-ins for the optional arrays (keeps one compiled signature)
+_NO_NOISE = np.zeros((1, 3), np.float32)
+_NO_PUSH = np.zeros((1, 3), np.float32)
+_NO_ATTRS = np.zeros((4, 1), np.float32)
+
+
+def set_threads(threads: int):
+    """Cap the JIT worker threads (no-op without numba)."""
+    if numba is not None:
+        numba.set_num_threads(max(1, min(int(threads), numba.config.NUMBA_NUM_THREADS)))
+
+
+if numba is not None:
+
+    _TWO_PI_HI = np.float32(6.28125)                 # exact in float32
+    _TWO_PI_LO = np.float32(2.0 * np.pi - 6.28125)
+    _INV_TWO_PI = np.float32(1.0 / (2.0 * np.pi))
+    # cos(r) = sum_k (-1)^k r^2k / (2k)!, k = 0..8; |error| < 2e-7 on [-pi, pi]
+    _C = tuple(np.float32((-1.0) ** k / float(np.prod(np.arange(1, 2 * k + 1)))) for k in range(9))
+
+    @numba.njit(inline='always', fastmath=True)
+    def _cos32(x):
+        """Branch-free float32 cosine (range reduction + polynomial); vectorises."""
+        k = np.float32(np.floor(x * _INV_TWO_PI + np.float32(0.5)))
+        r = (x - k * _TWO_PI_HI) - k * _TWO_PI_LO
+        r2 = r * r
+        p = _C[8]
+        p = p * r2 + _C[7]
+        p = p * r2 + _C[6]
+        p = p * r2 + _C[5]
+        p = p * r2 + _C[4]
+        p = p * r2 + _C[3]
+        p = p * r2 + _C[2]
+        p = p * r2 + _C[1]
+        return p * r2 + _C[0]
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _fused_step(P, V, K, W, PHI, wt, noise, use_noise, push, use_push, attrs, use_attrs,
+                    move, attract, along, diffusion, smooth, clamp, softness, radius, dt):
+        n = P.shape[0]
+        m = K.shape[0]
+        zero = np.float32(0.0)
+        one = np.float32(1.0)
+        eps = np.float32(1e-9)
+        keep = one - smooth
+
+        for i in numba.prange(n):
+            px = P[i, 0]
+            py = P[i, 1]
+            pz = P[i, 2]
+
+            # Mode sum: grad = sum_j W_j cos(P.K_j + PHI_j + OMG_j t) K_j
+            gx = zero
+            gy = zero
+            gz = zero
+            for j in range(m):
+                kx = K[j, 0]
+                ky = K[j, 1]
+                kz = K[j, 2]
+                c = W[j] * _cos32(px * kx + py * ky + pz * kz + PHI[j] + wt[j])
+                gx += c * kx
+                gy += c * ky
+                gz += c * kz
+
+            # Tangential gradient and its unit direction
+            d = gx * px + gy * py + gz * pz
+            gx -= d * px
+            gy -= d * py
+            gz -= d * pz
+            gn = np.sqrt(gx * gx + gy * gy + gz * gz)
+            inv = one / (gn + eps)
+            hx = gx * inv
+            hy = gy * inv
+            hz = gz * inv
+
+            # Iso direction = P x g_hat, normalised
+            ix = py * hz - pz * hy
+            iy = pz * hx - px * hz
+            iz = px * hy - py * hx
+            inv = one / (np.sqrt(ix * ix + iy * iy + iz * iz) + eps)
+            ix *= inv
+            iy *= inv
+            iz *= inv
+
+            # Diffusion noise projected onto the tangent plane
+            rx = zero
+            ry = zero
+            rz = zero
+            if use_noise:
+                rx = np.float32(noise[i, 0])
+                ry = np.float32(noise[i, 1])
+                rz = np.float32(noise[i, 2])
+                d = rx * px + ry * py + rz * pz
+                rx -= d * px
+                ry -= d * py
+                rz -= d * pz
+                inv = one / (np.sqrt(rx * rx + ry * ry + rz * rz) + eps)
+                rx *= inv * diffusion
+                ry *= inv * diffusion
+                rz *= inv * diffusion
+
+            # Separation (already a tangent velocity)
+            if use_push:
+                rx += push[i, 0]
+                ry += push[i, 1]
+                rz += push[i, 2]
+
+            # Target velocity, smoothing
+            ridge = gn / (gn + softness)
+            a = attract * ridge
+            vx = smooth * V[i, 0] + keep * (move * (a * hx + along * ix) + rx)
+            vy = smooth * V[i, 1] + keep * (move * (a * hy + along * iy) + ry)
+            vz = smooth * V[i, 2] + keep * (move * (a * hz + along * iz) + rz)
+            V[i, 0] = vx
+            V[i, 1] = vy
+            V[i, 2] = vz
+
+            # Clamped step, then back onto the unit sphere
+            sx = dt * vx
+            sy = dt * vy
+            sz = dt * vz
+            sl = np.sqrt(sx * sx + sy * sy + sz * sz) + eps
+            if use_attrs:
+                attrs[0, i] = sl * radius / dt
+                attrs[1, i] = gn
+                attrs[2, i] = ridge
+            f = min(sl, clamp) / sl
+            px += sx * f
+            py += sy * f
+            pz += sz * f
+            inv = one / (np.sqrt(px * px + py * py + pz * pz) + eps)
+            P[i, 0] = px * inv
+            P[i, 1] = py * inv
+            P[i, 2] = pz * inv
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _separation(P, ccol, cgz, starts, col_first, col_end, dim, radius, out):
+        """
+        P and out in cell order; one cell per iteration. The neighbours come
+        from 9 grid columns: a dense column table gives each column's cell
+        range (sorted by gz), searched for gz - 1 .. gz + 1, whose points are
+        one contiguous run of slots.
+        """
+        n_cells = ccol.shape[0]
+        r2 = radius * radius
+        inv_r = np.float32(1.0) / radius
+        one = np.float32(1.0)
+        for c in numba.prange(n_cells):
+            a = starts[c]
+            b = starts[c + 1]
+            out[a:b] = 0.0
+            col = ccol[c]
+            gz = cgz[c]
+            for dx in range(-1, 2):
+                for dy in range(-1, 2):
+                    k = col + dx * dim + dy
+                    lo = col_first[k]
+                    hi = col_end[k]
+                    while lo < hi:                      # first cell with gz >= gz - 1
+                        mid = (lo + hi) >> 1
+                        if cgz[mid] < gz - 1:
+                            lo = mid + 1
+                        else:
+                            hi = mid
+                    e = lo
+                    while e < col_end[k] and cgz[e] <= gz + 1:
+                        e += 1
+                    if e == lo:
+                        continue
+                    # Those (up to 3) cells are adjacent, so their points are one slot range
+                    for i in range(a, b):
+                        px = P[i, 0]
+                        py = P[i, 1]
+                        pz = P[i, 2]
+                        fx = np.float32(0.0)
+                        fy = np.float32(0.0)
+                        fz = np.float32(0.0)
+                        for j in range(starts[lo], starts[e]):
+                            ex = px - P[j, 0]
+                            ey = py - P[j, 1]
+                            ez = pz - P[j, 2]
+                            # Branch-free: 0 beyond the radius and for j == i (e = 0)
+                            d = np.sqrt(min(ex * ex + ey * ey + ez * ez, r2))
+                            t = one - d * inv_r
+                            w = t * t / max(d, np.float32(1e-9))
+                            fx += ex * w
+                            fy += ey * w
+                            fz += ez * w
+                        out[i, 0] += fx
+                        out[i, 1] += fy
+                        out[i, 2] += fz
+            for i in range(a, b):                       # tangent part only
+                d = out[i, 0] * P[i, 0] + out[i, 1] * P[i, 1] + out[i, 2] * P[i, 2]
+                out[i, 0] -= d * P[i, 0]
+                out[i, 1] -= d * P[i, 1]
+                out[i, 2] -= d * P[i, 2]
+
+
+def fused_step(P, V, K, W, PHI, wt, noise, params, dt, attrs=None, push=None):
+    """
+    Advance P / V in place with the fused JIT kernel (requires HAVE_JIT).
+    `attrs` (rows speed, field, ridge, ...) is filled when given; `push`
+    (N, 3) is an extra tangent velocity added to the target (separation).
+    """
+    f32 = np.float32
+    _fused_step(
+        P, V, K, W, PHI, wt,
+        _NO_NOISE if noise is None else noise, noise is not None,
+        _NO_PUSH if push is None else push, push is not None,
+        _NO_ATTRS if attrs is None else attrs, attrs is not None,
+        f32(params["MOVE_SPEED"]), f32(params["ATTRACT_GAIN"]), f32(params["ALONG_GAIN"]),
+        f32(params["DIFFUSION"]), f32(params["VEL_SMOOTH"]), f32(params["STEP_CLAMP"]),
+        f32(params["SOFTNESS"]), f32(params["RADIUS"]), f32(dt),
+    )
+
+
+def separation(grid, out):
+    """
+    JIT version of spatial.separation (requires HAVE_JIT) over a built
+    spatial.SphereGrid: every particle sums its own 27 cells, in parallel.
+    """
+    cols, gz = (v.astype(np.int32) for v in np.divmod(grid.keys, grid.dim))
+    n_cells = cols.size
+    col_first = np.zeros(grid.dim * grid.dim, np.int32)   # empty columns: first == end
+    col_end = np.zeros(grid.dim * grid.dim, np.int32)
+    first = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]])
+    col_first[cols[first]] = first
+    col_end[cols[first]] = np.r_[first[1:], n_cells]
+    F = np.empty_like(grid.P)
+    _separation(grid.P, cols, gz, np.r_[grid.starts, grid.P.shape[0]].astype(np.int32),
+                col_first, col_end, grid.dim, np.float32(grid.cell), F)
+    out[grid.order] = F
+    return out
@@ -1,5 +1,6 @@
 import bpy  # type: ignore
 import random  # type: ignore
+import time
 from typing import Optional
 
 from .core import (
@@ -7,16 +8,35 @@ from .core import (
     register_wave_animation_handler,
     unregister_wave_animation_handler,
     advect_points,
-    remove_obj_and_mesh,
+    context_settings,
+    fast_forward,
+    remove_system,
+    bake_job,
+    bake_particle_wave,
+    cancel_bake_job,
+    poll_bake_job,
+    start_bake_job,
+    export_particle_wave,
+    farm_bake,
+    farm_running,
+    free_bake,
+    save_checkpoint,
+    load_checkpoint,
+    active_profiler,
+    start_sweep,
+    sweep_running,
+    apply_sweep_variant,
 )
+from .presets import PRESETS
+from .sweep import random_values
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────────────────────
 
 def _settings(context) -> Optional[bpy.types.PropertyGroup]:
-    """Safe Scene settings getter."""
-    return getattr(context.scene, "particlewaves_settings", None)
+    """Safe settings getter (active system object, else the Scene)."""
+    return context_settings(context)
 
 def _handler_active() -> bool:
     """Is our frame-change handler currently registered?"""
@@ -78,23 +98,28 @@ class PARTICLEWAVES_OT_Rebuild(bpy.types.Operator):
         if not s:
             self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
             return {'CANCELLED'}
+        t0 = time.perf_counter()
         create_particle_wave(s)
+        ms = 1000.0 * (time.perf_counter() - t0)
         register_wave_animation_handler()
-        self.report({'INFO'}, "Particle Waves generated.")
+        self.report({'INFO'}, f"Particle Waves generated ({s.PARTICLE_COUNT} points in {ms:.0f} ms).")
         return {'FINISHED'}
 
 
 class PARTICLEWAVES_OT_Remove(bpy.types.Operator):
-    """Remove the generated objects and stop the animation handler."""
+    """Remove the system's objects; stop the animation handler when none are left."""
     bl_idname = "particlewaves.remove"
     bl_label = "Destroy"
-    bl_description = "Remove generated objects and stop the animation handler"
+    bl_description = "Remove this system's objects (the animation handler stops with the last one)"
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        unregister_wave_animation_handler()
-        remove_obj_and_mesh("PARTICLEWAVE")
-        remove_obj_and_mesh("PARTICLEDOT")
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        if remove_system(s) == 0:
+            unregister_wave_animation_handler()
         self.report({'INFO'}, "Particle Waves removed.")
         return {'FINISHED'}
 
@@ -109,12 +134,23 @@ class PARTICLEWAVES_OT_AgeWave(bpy.types.Operator):
     seconds: bpy.props.IntProperty(  # type: ignore
         name="Seconds", default=10, min=1, max=360
     )
+    fast: bpy.props.BoolProperty(  # type: ignore
+        name="Fast Forward",
+        description="Integrate directly and update the scene once at the end",
+        default=True,
+    )
 
     def execute(self, context):
         scene = context.scene
         fps = max(1, int(scene.render.fps))
+        frames = int(self.seconds * fps)
+
+        if self.fast and fast_forward(scene, frames):
+            self.report({'INFO'}, f"Aged by {self.seconds} seconds.")
+            return {'FINISHED'}
+
         start = int(scene.frame_current)
-        end = start + int(self.seconds * fps)
+        end = start + frames
 
         use_handler = _handler_active()
         for frame in range(start + 1, end + 1):
@@ -145,6 +181,202 @@ class PARTICLEWAVES_OT_NewVariation(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class PARTICLEWAVES_OT_Bake(bpy.types.Operator):
+    """Rebuild, then bake the scene frame range to the on-disk cache."""
+    bl_idname = "particlewaves.bake"
+    bl_label = "Bake"
+    bl_description = ("Simulate the scene frame range once and cache it for playback/render "
+                      "(runs in the background; Esc or CANCEL keeps the frames done so far)")
+    bl_options = {'REGISTER'}
+
+    _timer = None
+
+    def execute(self, context):
+        # Blocking bake (scripts / command line)
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        scene = context.scene
+        create_particle_wave(s)
+        bake = bake_particle_wave(scene, s)
+        register_wave_animation_handler()
+        scene.frame_set(scene.frame_start)
+        self.report({'INFO'}, f"Baked {bake.frames_done} frames.")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        # Interactive bake: worker thread, mesh preview and progress from a timer
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        if bake_job() is not None:
+            self.report({'WARNING'}, "A bake is already running.")
+            return {'CANCELLED'}
+        create_particle_wave(s)
+        start_bake_job(context.scene, s)
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            cancel_bake_job()
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        job = bake_job()
+        running = poll_bake_job()
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+        if running:
+            return {'PASS_THROUGH'}
+
+        context.window_manager.event_timer_remove(self._timer)
+        if job is None or job.error is not None:
+            self.report({'ERROR'}, f"Bake failed: {job.error if job else 'job lost'}")
+            return {'CANCELLED'}
+        register_wave_animation_handler()
+        context.scene.frame_set(context.scene.frame_start)
+        if job.cancelled:
+            self.report({'WARNING'}, f"Bake cancelled; kept {job.frames_done} of {job.total} frames.")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Baked {job.frames_done} frames ({job.rate:.1f} fps).")
+        return {'FINISHED'}
+
+
+class PARTICLEWAVES_OT_CancelBake(bpy.types.Operator):
+    """Stop the background bake, keeping the frames finished so far."""
+    bl_idname = "particlewaves.cancel_bake"
+    bl_label = "Cancel Bake"
+    bl_description = "Stop the running bake; frames already baked stay in the cache"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        cancel_bake_job()
+        return {'FINISHED'}
+
+
+class PARTICLEWAVES_OT_FarmBake(bpy.types.Operator):
+    """Bake the scene frame range in a background process pool."""
+    bl_idname = "particlewaves.farm_bake"
+    bl_label = "Farm Bake"
+    bl_description = "Bake the frame range in the background, splitting particles across processes"
+    bl_options = {'REGISTER'}
+
+    workers: bpy.props.IntProperty(  # type: ignore
+        name="Workers",
+        description="Worker processes (0 = one per CPU core)",
+        default=0, min=0, max=256,
+    )
+
+    def execute(self, context):
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        if farm_running():
+            self.report({'WARNING'}, "A farm bake is already running.")
+            return {'CANCELLED'}
+        key = farm_bake(context.scene, s, self.workers)
+        self.report({'INFO'}, f"Farm bake {key} started.")
+        return {'FINISHED'}
+
+
+class PARTICLEWAVES_OT_FreeBake(bpy.types.Operator):
+    """Delete the cached frames for the current settings."""
+    bl_idname = "particlewaves.free_bake"
+    bl_label = "Free Bake"
+    bl_description = "Delete the baked frames for the current settings"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        free_bake(context.scene, s)
+        self.report({'INFO'}, "Bake freed.")
+        return {'FINISHED'}
+
+
+class PARTICLEWAVES_OT_ResetTimings(bpy.types.Operator):
+    """Clear the collected stage timings and the memory peak."""
+    bl_idname = "particlewaves.reset_timings"
+    bl_label = "Reset Timings"
+    bl_description = "Forget the collected timings and the peak memory"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        prof = active_profiler()
+        if prof is not None:
+            prof.reset()
+        return {'FINISHED'}
+
+
+class PARTICLEWAVES_OT_Export(bpy.types.Operator):
+    """Simulate the scene frame range and write the points to disk."""
+    bl_idname = "particlewaves.export"
+    bl_label = "Export Points"
+    bl_description = "Simulate the frame range and stream positions (and velocity) to point files"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        try:
+            frames = export_particle_wave(context.scene, s)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Export failed: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Exported {frames} frames ({s.EXPORT_FORMAT}).")
+        return {'FINISHED'}
+
+
+class PARTICLEWAVES_OT_SaveCheckpoint(bpy.types.Operator):
+    """Checkpoint the running simulation (object or sidecar file)."""
+    bl_idname = "particlewaves.save_checkpoint"
+    bl_label = "Save State"
+    bl_description = "Store the current simulation state so it can be restored later"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        if not save_checkpoint(context.scene, s):
+            self.report({'WARNING'}, "Nothing to save; generate first.")
+            return {'CANCELLED'}
+        self.report({'INFO'}, "Simulation state saved.")
+        return {'FINISHED'}
+
+
+class PARTICLEWAVES_OT_LoadCheckpoint(bpy.types.Operator):
+    """Restore the simulation from its checkpoint."""
+    bl_idname = "particlewaves.load_checkpoint"
+    bl_label = "Load State"
+    bl_description = "Restore the last saved simulation state"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        if not load_checkpoint(context.scene, s):
+            self.report({'WARNING'}, "No usable checkpoint found.")
+            return {'CANCELLED'}
+        register_wave_animation_handler()
+        self.report({'INFO'}, "Simulation state restored.")
+        return {'FINISHED'}
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Preset workflow
 # ──────────────────────────────────────────────────────────────────────────────
@@ -165,39 +397,12 @@ class PARTICLEWAVES_OT_SetPreset(bpy.types.Operator):
             return {'CANCELLED'}
 
         p = self.preset
-        if p == 'DEFAULT':
-            s.NUM_MODES = 5;   s.FREQ_BASE = 1.4;  s.MOVE_SPEED = 0.07
-            s.ATTRACT_GAIN = 0.70; s.ALONG_GAIN = 0.70; s.DIFFUSION = 0.0010
-            s.VEL_SMOOTH = 0.97; s.STEP_CLAMP = 0.0012; s.SOFTNESS = 0.6
-            s.AXIS_BIAS = (0.0, 0.0, 0.0)
-
-        elif p == 'RIPPLES':
-            s.NUM_MODES = 7;   s.FREQ_BASE = 2.0;  s.MOVE_SPEED = 0.03
-            s.ATTRACT_GAIN = 0.85; s.ALONG_GAIN = 0.30; s.DIFFUSION = 0.0002
-            s.VEL_SMOOTH = 0.99; s.STEP_CLAMP = 0.0008; s.SOFTNESS = 0.3
-            s.AXIS_BIAS = (0.0, 0.0, 0.0)
-
-        elif p == 'CHAOS':
-            s.NUM_MODES = 10;  s.FREQ_BASE = 1.6;  s.MOVE_SPEED = 0.14
-            s.ATTRACT_GAIN = 0.40; s.ALONG_GAIN = 1.10; s.DIFFUSION = 0.0040
-            s.VEL_SMOOTH = 0.94; s.STEP_CLAMP = 0.0020; s.SOFTNESS = 0.9
-            s.AXIS_BIAS = (0.0, 0.0, 0.0)
-
-        elif p == 'BANDS':
-            s.NUM_MODES = 3;   s.FREQ_BASE = 0.9;  s.MOVE_SPEED = 0.05
-            s.ATTRACT_GAIN = 0.85; s.ALONG_GAIN = 0.35; s.DIFFUSION = 0.0003
-            s.VEL_SMOOTH = 0.99; s.STEP_CLAMP = 0.0010; s.SOFTNESS = 0.2
-            s.AXIS_BIAS = (0.0, 0.0, 0.35)
-
-        elif p == 'SOFT':
-            s.NUM_MODES = 5;   s.FREQ_BASE = 1.1;  s.MOVE_SPEED = 0.04
-            s.ATTRACT_GAIN = 0.65; s.ALONG_GAIN = 0.60; s.DIFFUSION = 0.0007
-            s.VEL_SMOOTH = 0.99; s.STEP_CLAMP = 0.0010; s.SOFTNESS = 1.2
-            s.AXIS_BIAS = (0.0, 0.0, 0.0)
-
-        else:
+        values = PRESETS.get(p)
+        if values is None:
             self.report({'WARNING'}, f"Unknown preset: {p}")
             return {'CANCELLED'}
+        for name, value in values.items():
+            setattr(s, name, value)
 
         self.report({'INFO'}, f"Preset applied: {p} (parameters only).")
         return {'FINISHED'}
@@ -237,20 +442,68 @@ class PARTICLEWAVES_OT_RandomiseParams(bpy.types.Operator):
             self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
             return {'CANCELLED'}
 
-        s.NUM_MODES   = random.randint(2, 10)
-        s.FREQ_BASE   = random.uniform(0.8, 2.2)
-        s.MOVE_SPEED  = random.uniform(0.02, 0.15)
-        s.ATTRACT_GAIN= random.uniform(0.3, 1.2)
-        s.ALONG_GAIN  = random.uniform(0.3, 1.2)
-        s.DIFFUSION   = random.uniform(0.0, 0.003)
-        s.VEL_SMOOTH  = random.uniform(0.93, 0.99)
-        s.STEP_CLAMP  = random.uniform(0.0006, 0.0020)
-        s.SOFTNESS    = random.uniform(0.3, 1.2)
+        for key, value in random_values(random).items():   # curated ranges: sweep.RANGES
+            setattr(s, key, value)
 
         self.report({'INFO'}, "System parameters randomised.")
         return {'FINISHED'}
 
 
+class PARTICLEWAVES_OT_Sweep(bpy.types.Operator):
+    """Render a contact sheet of variants in background processes."""
+    bl_idname = "particlewaves.sweep"
+    bl_label = "Sweep Variants"
+    bl_description = "Simulate many variants headless at a reduced count and tile their density thumbnails into the PW_SWEEP image"
+    bl_options = {'REGISTER'}
+
+    workers: bpy.props.IntProperty(  # type: ignore
+        name="Workers",
+        description="Worker processes (0 = one per CPU core)",
+        default=0, min=0, max=256,
+    )
+
+    def execute(self, context):
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        if sweep_running():
+            self.report({'WARNING'}, "A sweep is already running.")
+            return {'CANCELLED'}
+        if s.SWEEP_MODE == 'GRID' and s.SWEEP_X == s.SWEEP_Y:
+            self.report({'ERROR'}, "Pick two different grid parameters.")
+            return {'CANCELLED'}
+        start_sweep(context.scene, s, random.randint(0, 999_999), self.workers)
+        self.report({'INFO'}, "Sweep started; the sheet appears as image PW_SWEEP.")
+        return {'FINISHED'}
+
+
+class PARTICLEWAVES_OT_ApplySweepVariant(bpy.types.Operator):
+    """Take one variant of the last sweep and rebuild."""
+    bl_idname = "particlewaves.apply_sweep_variant"
+    bl_label = "Apply Variant"
+    bl_description = "Copy this variant's seed and dynamics into the settings and rebuild"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: bpy.props.IntProperty(  # type: ignore
+        name="Variant",
+        description="Number on the contact sheet tile",
+        default=0, min=0,
+    )
+
+    def execute(self, context):
+        s = _settings(context)
+        if not s:
+            self.report({'ERROR'}, "Scene is missing Particle Waves settings.")
+            return {'CANCELLED'}
+        if not apply_sweep_variant(s, self.index):
+            self.report({'ERROR'}, f"No variant {self.index} in the last sweep.")
+            return {'CANCELLED'}
+        bpy.ops.particlewaves.rebuild()
+        self.report({'INFO'}, f"Variant {self.index} applied.")
+        return {'FINISHED'}
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Optional: Apply Look (Cycles + Standard + AO viewport)
 # ──────────────────────────────────────────────────────────────────────────────
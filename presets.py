@@ -0,0 +1,37 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# Wave presets (plain data — shared by the preset operator and headless tools)
+# Keys are ParticleWavesSettings property names.
+# ──────────────────────────────────────────────────────────────────────────────
+
+PRESETS = {
+    'DEFAULT': dict(
+        NUM_MODES=5,   FREQ_BASE=1.4,  MOVE_SPEED=0.07,
+        ATTRACT_GAIN=0.70, ALONG_GAIN=0.70, DIFFUSION=0.0010,
+        VEL_SMOOTH=0.97, STEP_CLAMP=0.0012, SOFTNESS=0.6,
+        AXIS_BIAS=(0.0, 0.0, 0.0),
+    ),
+    'RIPPLES': dict(
+        NUM_MODES=7,   FREQ_BASE=2.0,  MOVE_SPEED=0.03,
+        ATTRACT_GAIN=0.85, ALONG_GAIN=0.30, DIFFUSION=0.0002,
+        VEL_SMOOTH=0.99, STEP_CLAMP=0.0008, SOFTNESS=0.3,
+        AXIS_BIAS=(0.0, 0.0, 0.0),
+    ),
+    'CHAOS': dict(
+        NUM_MODES=10,  FREQ_BASE=1.6,  MOVE_SPEED=0.14,
+        ATTRACT_GAIN=0.40, ALONG_GAIN=1.10, DIFFUSION=0.0040,
+        VEL_SMOOTH=0.94, STEP_CLAMP=0.0020, SOFTNESS=0.9,
+        AXIS_BIAS=(0.0, 0.0, 0.0),
+    ),
+    'BANDS': dict(
+        NUM_MODES=3,   FREQ_BASE=0.9,  MOVE_SPEED=0.05,
+        ATTRACT_GAIN=0.85, ALONG_GAIN=0.35, DIFFUSION=0.0003,
+        VEL_SMOOTH=0.99, STEP_CLAMP=0.0010, SOFTNESS=0.2,
+        AXIS_BIAS=(0.0, 0.0, 0.35),
+    ),
+    'SOFT': dict(
+        NUM_MODES=5,   FREQ_BASE=1.1,  MOVE_SPEED=0.04,
+        ATTRACT_GAIN=0.65, ALONG_GAIN=0.60, DIFFUSION=0.0007,
+        VEL_SMOOTH=0.99, STEP_CLAMP=0.0010, SOFTNESS=1.2,
+        AXIS_BIAS=(0.0, 0.0, 0.0),
+    ),
+}
@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+from collections import deque
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Stage timings (pure stdlib — no bpy here)
+#
+# Code under measurement calls lap(stage, t0) at stage boundaries, only when
+# a Profiler is attached (engines, groups and core check for None first).
+# Laps accumulate into the open record ('frame', 'build', ...); end() closes
+# it, keeps it for rolling averages and optionally appends it as one JSON
+# line to a log (times in ms there). Stage times from worker threads add up
+# (CPU time), so with threads the stages can sum to more than the wall time.
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Display order (anything else is listed after these)
+STAGES = ("separation", "field", "tangent", "noise", "integrate", "jit", "bake_read", "push", "update",
+          "init", "mesh")
+
+
+class Profiler:
+    """Per-stage wall time, grouped into records with rolling averages."""
+
+    def __init__(self, window: int = 48, log_path: str = None, tags: dict = None):
+        self.window = int(window)
+        self.log_path = log_path or None
+        self.tags = dict(tags or {})
+        self.history = {}        # kind -> deque of closed records
+        self.peak_bytes = 0
+        self._open = {}          # kind -> (t0, {stage: seconds})
+        self._current = None     # stages of the innermost open record
+        self._lock = threading.Lock()
+        self._log = None
+
+    def begin(self, kind: str):
+        self._current = {}
+        self._open[kind] = (time.perf_counter(), self._current)
+
+    def lap(self, stage: str, t0: float) -> float:
+        """Add the time since t0 to `stage`; returns now (the next stage's t0)."""
+        now = time.perf_counter()
+        stages = self._current
+        if stages is not None:
+            with self._lock:
+                stages[stage] = stages.get(stage, 0.0) + (now - t0)
+        return now
+
+    def end(self, kind: str, memory_bytes: int = None, **extra) -> dict:
+        """Close the `kind` record (wall time as 'total'), keep it and log it."""
+        if kind not in self._open:
+            return None
+        t0, stages = self._open.pop(kind)
+        record = dict(extra, kind=kind, total=time.perf_counter() - t0, stages=stages)
+        if memory_bytes is not None:
+            self.peak_bytes = max(self.peak_bytes, int(memory_bytes))
+            record["memory_bytes"] = int(memory_bytes)
+        self.history.setdefault(kind, deque(maxlen=self.window)).append(record)
+        self._current = next(reversed(self._open.values()))[1] if self._open else None
+        if self.log_path:
+            self._write(record)
+        return record
+
+    def discard(self, kind: str):
+        """Drop an open record without keeping it (nothing worth measuring happened)."""
+        self._open.pop(kind, None)
+        self._current = next(reversed(self._open.values()))[1] if self._open else None
+
+    def averages(self, kind: str) -> dict:
+        """{stage: mean seconds} over the window, plus 'total'; {} if none yet."""
+        records = self.history.get(kind)
+        if not records:
+            return {}
+        out = {}
+        for rec in records:
+            for stage, sec in rec["stages"].items():
+                out[stage] = out.get(stage, 0.0) + sec
+        out["total"] = sum(rec["total"] for rec in records)
+        return {k: v / len(records) for k, v in out.items()}
+
+    def last(self, kind: str):
+        records = self.history.get(kind)
+        return records[-1] if records else None
+
+    def reset(self):
+        self.history.clear()
+        self.peak_bytes = 0
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _write(self, record: dict):
+        if self._log is None:
+            self._log = open(self.log_path, "a", encoding="utf-8")
+        row = dict(self.tags, time=time.time(), **record)
+        row["stages"] = {k: round(v * 1000.0, 4) for k, v in record["stages"].items()}
+        row["total"] = round(record["total"] * 1000.0, 4)
+        self._log.write(json.dumps(row) + "\n")   # one short line: atomic O_APPEND write
+        self._log.flush()
+
+
+def ordered(stages: dict):
+    """(stage, value) pairs in STAGES order, unknown stages last."""
+    known = [(s, stages[s]) for s in STAGES if s in stages]
+    return known + sorted((k, v) for k, v in stages.items() if k not in STAGES and k != "total")
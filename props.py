@@ -1,12 +1,39 @@
 import bpy  # type: ignore
 
 
+def _live_update(self, context):
+    """Dynamics setting changed: push it into the running simulations (batched in core)."""
+    from . import core
+    core.schedule_live_update(self)
+
+
+# Parameters a grid sweep can step (sweep.RANGES), with their UI names
+_SWEEP_AXES = [
+    ('NUM_MODES',    "BAND COUNT",         ""),
+    ('FREQ_BASE',    "BAND FREQUENCY",     ""),
+    ('MOVE_SPEED',   "DRIFT SPEED",        ""),
+    ('ATTRACT_GAIN', "ATTRACT GAIN",       ""),
+    ('ALONG_GAIN',   "TANGENTIAL GAIN",    ""),
+    ('DIFFUSION',    "DIFFUSION",          ""),
+    ('VEL_SMOOTH',   "VELOCITY SMOOTHING", ""),
+    ('STEP_CLAMP',   "STEP LIMIT",         ""),
+    ('SOFTNESS',     "SOFTENING",          ""),
+]
+
+
 class ParticleWavesSettings(bpy.types.PropertyGroup):
+    # --- System ---
+    SYSTEM_NAME: bpy.props.StringProperty(  # type: ignore
+        name="SYSTEM",
+        description="Name of the particle system; GENERATE with a new name adds another system (objects NAMEWAVE / NAMEDOT). Fixed once the system is built",
+        default="PARTICLE",
+    )
+
     # --- Particle / field scale ---
     PARTICLE_COUNT: bpy.props.IntProperty(  # type: ignore
         name="COUNT",
-        description="Number of particle instances",
-        default=50000, min=100, max=100000, soft_min=5000, soft_max=80000,
+        description="Number of particle instances (millions are meant for render-only scenes)",
+        default=50000, min=100, max=5_000_000, soft_min=5000, soft_max=100000,
     )
     PARTICLE_RADIUS: bpy.props.FloatProperty(  # type: ignore
         name="RADIUS",
@@ -18,6 +45,21 @@ class ParticleWavesSettings(bpy.types.PropertyGroup):
         description="Radius of the spherical domain",
         default=1.0, min=0.1, max=5.0, soft_min=0.25, soft_max=2.0,
     )
+    OUTPUT_MODE: bpy.props.EnumProperty(  # type: ignore
+        name="OUTPUT",
+        description="How particles are drawn (applies on rebuild)",
+        items=[
+            ('VERTS',  "VERTEX INSTANCES", "Icosphere duplicated on every vertex (legacy dupli path)"),
+            ('NODES',  "NODE INSTANCES",   "Geometry Nodes Instance on Points with the icosphere"),
+            ('POINTS', "POINT CLOUD",      "Geometry Nodes point cloud; Cycles renders native point primitives"),
+        ],
+        default='VERTS',
+    )
+    RADIUS_VARIATION: bpy.props.FloatProperty(  # type: ignore
+        name="RADIUS VARIATION",
+        description="Random per-particle shrink of the radius (node and point cloud output only)",
+        default=0.0, min=0.0, max=1.0,
+    )
 
     # --- Wave driver (global) ---
     WAVE_STRENGTH: bpy.props.FloatProperty(  # type: ignore
@@ -29,12 +71,22 @@ class ParticleWavesSettings(bpy.types.PropertyGroup):
         name="PHASE",
         description="Speed of the underlying field’s phase evolution",
         default=0.01, min=0.0001, max=2.0, soft_min=0.001, soft_max=0.2,
+        update=_live_update,
     )
     SEED: bpy.props.IntProperty(  # type: ignore
         name="SEED",
         description="Random seed for reproducible variation",
         default=0, min=0, max=999_999,
     )
+    INIT_LAYOUT: bpy.props.EnumProperty(  # type: ignore
+        name="START LAYOUT",
+        description="How particles are spread over the sphere at the first frame (applies on rebuild)",
+        items=[
+            ('JITTERED', "JITTERED",     "Golden-spiral points with a random offset each (instant)"),
+            ('POISSON',  "POISSON DISK", "Random points no closer than ~0.7 of the mean spacing: even, no pattern (slower to build)"),
+        ],
+        default='JITTERED',
+    )
 
     # --- Field structure ---
     NUM_MODES: bpy.props.IntProperty(  # type: ignore
@@ -58,36 +110,205 @@ class ParticleWavesSettings(bpy.types.PropertyGroup):
         name="DRIFT SPEED",
         description="Overall drift speed",
         default=0.05, min=0.001, max=0.5, soft_min=0.02, soft_max=0.15,
+        update=_live_update,
     )
     ATTRACT_GAIN: bpy.props.FloatProperty(  # type: ignore
         name="ATTRACT GAIN",
         description="Attraction toward ridges",
         default=0.7, min=0.0, max=2.0, soft_min=0.2, soft_max=1.2,
+        update=_live_update,
     )
     ALONG_GAIN: bpy.props.FloatProperty(  # type: ignore
         name="TANGENTIAL GAIN",
         description="Sliding along isolines",
         default=0.7, min=0.0, max=2.0, soft_min=0.2, soft_max=1.2,
+        update=_live_update,
     )
     DIFFUSION: bpy.props.FloatProperty(  # type: ignore
         name="DIFFUSION",
         description="Random walk amount (tangent plane)",
         default=0.002, min=0.0, max=0.02, soft_min=0.0, soft_max=0.005,
+        update=_live_update,
     )
     VEL_SMOOTH: bpy.props.FloatProperty(  # type: ignore
         name="VELOCITY SMOOTHING",
         description="Exponential smoothing of velocity",
         default=0.97, min=0.5, max=0.999, soft_min=0.9, soft_max=0.995, precision=3,
+        update=_live_update,
     )
     STEP_CLAMP: bpy.props.FloatProperty(  # type: ignore
         name="STEP LIMIT",
         description="Maximum travel per frame (stability clamp)",
         default=0.002, min=0.0001, max=0.02, soft_min=0.0005, soft_max=0.005, precision=4,
+        update=_live_update,
     )
     SOFTNESS: bpy.props.FloatProperty(  # type: ignore
         name="SOFTENING",
         description="Soft attraction near ridges to avoid harsh snapping",
         default=0.6, min=0.01, max=5.0, soft_min=0.2, soft_max=1.5,
+        update=_live_update,
+    )
+    SEPARATION: bpy.props.FloatProperty(  # type: ignore
+        name="SEPARATION",
+        description="Push neighbouring particles apart so they don't clump (0 = off; simulates every particle in the viewport)",
+        default=0.0, min=0.0, max=4.0, soft_min=0.0, soft_max=1.0,
+        update=_live_update,
+    )
+    SEPARATION_RADIUS: bpy.props.FloatProperty(  # type: ignore
+        name="SEPARATION REACH",
+        description="Distance at which separation starts, in mean particle spacings",
+        default=1.0, min=0.25, max=4.0, soft_min=0.5, soft_max=2.0,
+        update=_live_update,
+    )
+
+    # --- Performance ---
+    THREADS: bpy.props.IntProperty(  # type: ignore
+        name="THREADS",
+        description="Worker threads for the simulation step (0 = one per CPU core)",
+        default=0, min=0, max=256, soft_max=64,
+        update=_live_update,
+    )
+    BACKEND: bpy.props.EnumProperty(  # type: ignore
+        name="BACKEND",
+        description="Simulation step implementation",
+        items=[
+            ('NUMPY', "NUMPY", "Vectorised NumPy (always available)"),
+            ('JIT',   "JIT",   "Fused Numba kernel; falls back to NumPy if Numba is missing"),
+        ],
+        default='NUMPY',
+        update=_live_update,
+    )
+    VIEWPORT_FRACTION: bpy.props.FloatProperty(  # type: ignore
+        name="VIEWPORT DISPLAY",
+        description="Share of the particles simulated and shown in the viewport; renders always use all of them",
+        default=1.0, min=0.01, max=1.0, subtype='FACTOR',
+        update=_live_update,
+    )
+    WRITE_ATTRIBUTES: bpy.props.BoolProperty(  # type: ignore
+        name="SHADING ATTRIBUTES",
+        description="Write per-particle pw_speed, pw_field, pw_ridge and pw_age attributes each frame (for shaders)",
+        default=False,
+    )
+    SNAPSHOT_INTERVAL: bpy.props.IntProperty(  # type: ignore
+        name="SNAPSHOT EVERY",
+        description="Frames between in-memory state snapshots used to jump or scrub the timeline",
+        default=50, min=1, max=10000, soft_max=500,
+    )
+    SNAPSHOT_LIMIT: bpy.props.IntProperty(  # type: ignore
+        name="MAX SNAPSHOTS",
+        description="Snapshots kept in memory (least recently used are dropped first)",
+        default=32, min=1, max=4096, soft_max=256,
+    )
+
+    # --- Bake cache ---
+    USE_BAKE: bpy.props.BoolProperty(  # type: ignore
+        name="USE BAKE",
+        description="Play back baked frames from the cache instead of simulating",
+        default=True,
+    )
+    CACHE_DIR: bpy.props.StringProperty(  # type: ignore
+        name="CACHE",
+        description="Folder for baked frames (relative to the .blend; temp dir if unsaved)",
+        default="//particlewaves_cache",
+        subtype='DIR_PATH',
+    )
+    BAKE_FORMAT: bpy.props.EnumProperty(  # type: ignore
+        name="FORMAT",
+        description="How new bakes are stored (existing bakes play back in either format)",
+        items=[
+            ('RAW',     "RAW",     "Float32 positions, memory-mapped: largest, no decoding"),
+            ('COMPACT', "COMPACT", "Quantised directions, delta-coded and compressed: ~10-15x smaller, decoded per frame"),
+        ],
+        default='RAW',
+    )
+
+    # --- Point export ---
+    EXPORT_FORMAT: bpy.props.EnumProperty(  # type: ignore
+        name="FORMAT",
+        description="File format for exported points",
+        items=[
+            ('PLY', "PLY",     "One binary PLY per frame"),
+            ('NPZ', "NPZ",     "Single NumPy archive, one array per frame"),
+            ('ABC', "ALEMBIC", "Alembic points (needs the PyAlembic module)"),
+        ],
+        default='PLY',
+    )
+    EXPORT_DIR: bpy.props.StringProperty(  # type: ignore
+        name="EXPORT",
+        description="Folder for exported points (relative to the .blend; temp dir if unsaved)",
+        default="//particlewaves_export",
+        subtype='DIR_PATH',
+    )
+    EXPORT_VELOCITY: bpy.props.BoolProperty(  # type: ignore
+        name="VELOCITY",
+        description="Also export per-particle velocity (world units per second)",
+        default=False,
+    )
+
+    # --- Checkpoints ---
+    AUTO_CHECKPOINT: bpy.props.BoolProperty(  # type: ignore
+        name="KEEP STATE",
+        description="Checkpoint the simulation when saving and restore it when the file is opened",
+        default=True,
+    )
+    CHECKPOINT_MODE: bpy.props.EnumProperty(  # type: ignore
+        name="STORE",
+        description="Where simulation checkpoints are kept",
+        items=[
+            ('OBJECT',  "OBJECT",  "Inside the .blend, on the points object"),
+            ('SIDECAR', "SIDECAR", "Separate .pwstate file in the cache folder"),
+        ],
+        default='SIDECAR',
+    )
+
+    # --- Parameter sweep ---
+    SWEEP_COUNT: bpy.props.IntProperty(  # type: ignore
+        name="VARIANTS",
+        description="Variants per sweep (a grid rounds up to a square)",
+        default=64, min=1, max=1024, soft_max=256,
+    )
+    SWEEP_MODE: bpy.props.EnumProperty(  # type: ignore
+        name="SWEEP",
+        description="How the variants are chosen",
+        items=[
+            ('RANDOM', "RANDOM", "Random draws from the RANDOMISE ranges, each with a new seed"),
+            ('GRID',   "GRID",   "Even steps of two parameters over their RANDOMISE ranges; the rest as set"),
+        ],
+        default='RANDOM',
+    )
+    SWEEP_X: bpy.props.EnumProperty(  # type: ignore
+        name="ACROSS",
+        description="Grid parameter varied across the sheet",
+        items=_SWEEP_AXES,
+        default='ATTRACT_GAIN',
+    )
+    SWEEP_Y: bpy.props.EnumProperty(  # type: ignore
+        name="DOWN",
+        description="Grid parameter varied down the sheet",
+        items=_SWEEP_AXES,
+        default='ALONG_GAIN',
+    )
+    SWEEP_POINTS: bpy.props.IntProperty(  # type: ignore
+        name="POINTS",
+        description="Particles simulated per variant (the look carries over to the full count)",
+        default=10000, min=1000, max=200000, soft_max=50000,
+    )
+    SWEEP_FRAMES: bpy.props.IntProperty(  # type: ignore
+        name="FRAMES",
+        description="Frames simulated per variant before its thumbnail is taken",
+        default=120, min=2, max=5000, soft_max=500,
+    )
+
+    # --- Timings (read from the Scene settings) ---
+    PROFILE: bpy.props.BoolProperty(  # type: ignore
+        name="TIMINGS",
+        description="Time each stage of frame updates and rebuilds (shown in the TIMINGS panel)",
+        default=False,
+    )
+    PROFILE_LOG: bpy.props.StringProperty(  # type: ignore
+        name="LOG",
+        description="Append every timed frame as a JSON line to this file (empty = no log); farm bakes log here too",
+        default="", subtype='FILE_PATH',
     )
 
     # --- Presets ---
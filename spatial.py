@@ -0,0 +1,184 @@
+import numpy as np  # type: ignore
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Spatial hash for points on the unit sphere (pure NumPy — no bpy here)
+#
+# Points are bucketed into a uniform grid of `cell`-sized cubes over [-1, 1]^3.
+# Only cells the sphere passes through are ever occupied, so memory follows N,
+# not the grid, and unlike a cube-map or lat-long hash there are no face seams
+# or poles to special-case. Building is one sort by cell key; pairs closer
+# than `cell` are found cell against cell over the 13 "forward" neighbours
+# plus the cell itself, so each pair comes out once and the work follows the
+# number of candidate pairs (linear in N at bounded density).
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Neighbour offsets after (0, 0, 0) in lexicographic order: each cell pair once
+_FORWARD = tuple((dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                 if (dx, dy, dz) > (0, 0, 0))
+
+# Poisson-disk radius as a share of the mean spacing sqrt(4 pi / N): ~75% of
+# what random sequential adsorption can fit, so dart throwing finishes quickly
+POISSON_FILL = 0.72
+
+
+class SphereGrid:
+    """Cell hash of (N, 3) points near the unit sphere (rows sorted by cell)."""
+
+    def __init__(self, P: np.ndarray, cell: float):
+        self.cell = float(cell)
+        dim = int(np.ceil(2.0 / self.cell)) + 3   # a spare cell on each side: offsets never wrap
+        g = np.floor((np.asarray(P, np.float32) + np.float32(1.0)) * np.float32(1.0 / self.cell))
+        g = np.clip(g.astype(np.int64) + 1, 1, dim - 2)
+        key = (g[:, 0] * dim + g[:, 1]) * dim + g[:, 2]
+        self.order = np.argsort(key, kind="stable").astype(np.int32)   # slot -> row of P
+        self.P = np.ascontiguousarray(P[self.order], np.float32)
+        self._xyz = np.ascontiguousarray(self.P.T)      # per-axis rows for the pair tests
+        skey = key[self.order]
+        starts = np.flatnonzero(np.r_[True, skey[1:] != skey[:-1]]) if skey.size else skey
+        self.keys = skey[starts]                         # occupied cells, ascending
+        self.starts = starts.astype(np.int32)
+        self.counts = np.diff(np.r_[starts, skey.size]).astype(np.int32)
+        self.dim = dim
+
+    @property
+    def n_cells(self) -> int:
+        return int(self.keys.size)
+
+    def pairs(self, radius: float = None):
+        """
+        Yield (i, j, delta, dist) per neighbour offset for every pair closer
+        than `radius` (default: the cell size, the most it can be): slot
+        indices into the sorted rows (map with `order`), P_i - P_j and |delta|.
+        """
+        r = self.cell if radius is None else min(float(radius), self.cell)
+        r2 = np.float32(r * r)
+        dim = self.dim
+        cells = np.arange(self.n_cells, dtype=np.int32)
+
+        # Same cell: all ordered pairs, keep i < j
+        i, j = self._expand(cells, cells)
+        keep = i < j
+        yield self._within(i[keep], j[keep], r2)
+
+        for dx, dy, dz in _FORWARD:
+            nb = self.keys + ((dx * dim + dy) * dim + dz)
+            pos = np.minimum(np.searchsorted(self.keys, nb), self.n_cells - 1)
+            hit = np.flatnonzero(self.keys[pos] == nb)
+            if hit.size:
+                yield self._within(*self._expand(hit, pos[hit]), r2)
+
+    def _expand(self, a: np.ndarray, b: np.ndarray):
+        """Every (slot in cell a[k], slot in cell b[k]) combination."""
+        ca, cb = self.counts[a], self.counts[b]
+        size = ca * cb
+        total = int(size.sum())
+        block = np.repeat(np.arange(a.size, dtype=np.int32), size)
+        k = np.arange(total, dtype=np.int32) - np.repeat(np.cumsum(size, dtype=np.int32) - size, size)
+        width = cb[block]
+        ia = k // width
+        return self.starts[a][block] + ia, self.starts[b][block] + (k - ia * width)
+
+    def _within(self, i: np.ndarray, j: np.ndarray, r2):
+        x, y, z = self._xyz
+        dx, dy, dz = x[i] - x[j], y[i] - y[j], z[i] - z[j]
+        d2 = dx * dx
+        d2 += dy * dy
+        d2 += dz * dz
+        near = np.flatnonzero(d2 < r2)
+        delta = np.stack((dx[near], dy[near], dz[near]), axis=1)
+        return i[near], j[near], delta, np.sqrt(d2[near])
+
+
+def mean_spacing(n: int) -> float:
+    """Typical distance between neighbours for n points spread over the unit sphere."""
+    return float(np.sqrt(4.0 * np.pi / max(1, int(n))))
+
+
+def separation(P: np.ndarray, radius: float, out: np.ndarray = None) -> np.ndarray:
+    """
+    Short-range push apart, tangent to the sphere: for every neighbour closer
+    than `radius`, (1 - d / radius)^2 along the unit vector away from it.
+    (N, 3) float32 into `out`; zero for isolated points.
+    """
+    n = P.shape[0]
+    if out is None:
+        out = np.empty((n, 3), np.float32)
+    grid = SphereGrid(P, radius)
+    blocks = list(grid.pairs(radius))
+    i = np.concatenate([b[0] for b in blocks])
+    j = np.concatenate([b[1] for b in blocks])
+    delta = np.concatenate([b[2] for b in blocks])
+    dist = np.concatenate([b[3] for b in blocks])
+
+    w = (np.float32(1.0) - dist * np.float32(1.0 / radius)) ** 2 / np.maximum(dist, np.float32(1e-9))
+    F = np.empty((n, 3), np.float32)
+    for axis in range(3):
+        f = delta[:, axis] * w
+        F[:, axis] = np.bincount(i, f, minlength=n) - np.bincount(j, f, minlength=n)
+    out[grid.order] = F
+
+    # Keep it on the tangent plane
+    dot = np.einsum("ij,ij->i", out, P)
+    out -= dot[:, None] * P
+    return out
+
+
+def _greedy(alive: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Candidates kept by taking them one by one in index order and dropping
+    any within reach of one already kept, in rounds: a live candidate with
+    no live lower-index neighbour is kept, its neighbours are dropped.
+    Edges a < b; returns the kept mask.
+    """
+    kept = np.zeros(alive.size, bool)
+    open_ = alive.copy()
+    while open_.any():
+        live = open_[a] & open_[b]
+        a, b = a[live], b[live]
+        blocked = np.zeros(alive.size, bool)
+        blocked[b] = True
+        win = open_ & ~blocked
+        kept |= win
+        open_ &= ~win
+        open_[b[win[a]]] = False
+    return kept
+
+
+def poisson_disk_sphere(n: int, rng: np.random.Generator, radius: float = None) -> np.ndarray:
+    """
+    n unit vectors with no two closer than `radius` (chord; default
+    POISSON_FILL x mean spacing): dart throwing in batches, each resolved
+    against the accepted points and then greedily in draw order (the same
+    as testing the darts one at a time). Batches grow as the acceptance
+    rate drops; if one barely adds anything the radius shrinks a little,
+    so this always finishes.
+    """
+    n = int(n)
+    r = POISSON_FILL * mean_spacing(n) if radius is None else float(radius)
+    pts = np.empty((0, 3), np.float32)
+    rate = 1.0
+    while pts.shape[0] < n:
+        need, k = n - pts.shape[0], pts.shape[0]
+        m = int(min(max(1024, 1.5 * need / rate), 2 * n))
+        C = rng.normal(size=(m, 3)).astype(np.float32)
+        C /= np.linalg.norm(C, axis=1, keepdims=True) + np.float32(1e-9)
+
+        grid = SphereGrid(np.concatenate([pts, C]), r)
+        near_old = np.zeros(m, bool)
+        edges = []
+        for i, j, _, _ in grid.pairs(r):
+            oi, oj = grid.order[i], grid.order[j]
+            lo, hi = np.minimum(oi, oj), np.maximum(oi, oj)
+            old = lo < k                          # accepted rows come first
+            near_old[hi[old] - k] = True
+            edges.append((lo[~old] - k, hi[~old] - k))
+        kept = _greedy(~near_old, np.concatenate([e[0] for e in edges]),
+                       np.concatenate([e[1] for e in edges]))
+        new = C[kept]
+        rate = max(new.shape[0] / m, 1e-3)
+        new = new[:need]
+        if new.shape[0] < max(1, need // 50):
+            r *= 0.95
+        pts = np.concatenate([pts, new])
+    return pts
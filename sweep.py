@@ -0,0 +1,276 @@
+"""
+Headless parameter sweep: many variants at a reduced particle count, one
+equirectangular density thumbnail each, tiled into a PNG contact sheet.
+
+Variants are random draws from the curated RANDOMISE ranges (each with its
+own seed) or an even grid over two of those parameters. Every variant runs
+in a worker process and only its thumbnail comes back. sweep.json next to
+the sheet lists each variant's values, so any of them can be applied to the
+scene afterwards.
+
+Run from the add-on folder (the SWEEP button starts it the same way):
+
+    python sweep.py --params params.json --fps 24 --out ./sweep --count 64
+    python sweep.py --params - --mode GRID --x ATTRACT_GAIN --y ALONG_GAIN ...
+
+Tiles are numbered in their corner, row by row from 0.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np  # type: ignore
+
+try:
+    from .engine import WaveEngine, resolve_threads
+except ImportError:  # run as a script from the add-on folder
+    from engine import WaveEngine, resolve_threads
+
+
+# Curated ranges RANDOMISE draws from (int bounds: inclusive integer draw)
+RANGES = dict(
+    NUM_MODES=(2, 10),
+    FREQ_BASE=(0.8, 2.2),
+    MOVE_SPEED=(0.02, 0.15),
+    ATTRACT_GAIN=(0.3, 1.2),
+    ALONG_GAIN=(0.3, 1.2),
+    DIFFUSION=(0.0, 0.003),
+    VEL_SMOOTH=(0.93, 0.99),
+    STEP_CLAMP=(0.0006, 0.0020),
+    SOFTNESS=(0.3, 1.2),
+)
+VARIANT_KEYS = ("SEED",) + tuple(RANGES)   # what a variant sets (same names in settings and params)
+MODES = ('RANDOM', 'GRID')
+
+DEFAULT_POINTS = 10_000
+DEFAULT_FRAMES = 120
+THUMB_WIDTH = 128          # equirectangular: twice as wide as tall
+SHEET_NAME = "sweep.png"
+INDEX_NAME = "sweep.json"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Variants
+# ──────────────────────────────────────────────────────────────────────────────
+
+def random_values(rng) -> dict:
+    """One draw from RANGES with `rng` (a random.Random or the random module)."""
+    return {k: rng.randint(lo, hi) if isinstance(lo, int) else rng.uniform(lo, hi)
+            for k, (lo, hi) in RANGES.items()}
+
+
+def _grid_value(key: str, i: int, side: int):
+    lo, hi = RANGES[key]
+    v = lo + (hi - lo) * (i / (side - 1) if side > 1 else 0.5)
+    return int(round(v)) if isinstance(lo, int) else v
+
+
+def variants(base: dict, count: int, mode: str = 'RANDOM', seed: int = 0,
+             x: str = "ATTRACT_GAIN", y: str = "ALONG_GAIN") -> list:
+    """
+    VARIANT_KEYS values per variant. RANDOM: `count` draws, each with its own
+    SEED. GRID: side x side (side = ceil(sqrt(count))) with `x` across and
+    `y` down over their ranges, everything else as in `base`.
+    """
+    fixed = {k: base[k] for k in VARIANT_KEYS}
+    if mode == 'RANDOM':
+        rng = random.Random(int(seed))
+        out = []
+        for _ in range(int(count)):
+            v = dict(fixed, SEED=rng.randint(0, 999_999))
+            v.update(random_values(rng))
+            out.append(v)
+        return out
+    if mode != 'GRID':
+        raise ValueError(f"Unknown sweep mode: {mode}")
+    if x not in RANGES or y not in RANGES or x == y:
+        raise ValueError(f"Grid axes must be two different of: {', '.join(RANGES)}")
+    side = max(1, math.ceil(math.sqrt(int(count))))
+    return [dict(fixed, **{x: _grid_value(x, col, side), y: _grid_value(y, row, side)})
+            for row in range(side) for col in range(side)]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Thumbnails and the contact sheet
+# ──────────────────────────────────────────────────────────────────────────────
+
+def density_thumbnail(P: np.ndarray, width: int = THUMB_WIDTH) -> np.ndarray:
+    """
+    (width / 2, width) uint8 equirectangular density of unit vectors P, north
+    up. Counts are divided by each pixel's share of the sphere, so an even
+    spread is mid grey at any latitude; brighter is denser.
+    """
+    w, h = int(width), int(width) // 2
+    lon = np.arctan2(P[:, 1], P[:, 0])
+    col = np.minimum(((lon + np.pi) * (w / (2.0 * np.pi))).astype(np.int64), w - 1)
+    row = np.minimum((np.arccos(np.clip(P[:, 2], -1.0, 1.0)) * (h / np.pi)).astype(np.int64), h - 1)
+    counts = np.bincount(row * w + col, minlength=h * w).reshape(h, w).astype(np.float32)
+
+    z = np.cos(np.arange(h + 1) * (np.pi / h))
+    expected = P.shape[0] * (z[:-1] - z[1:]) / (2.0 * w)     # even spread, per pixel of each row
+    d = counts / expected[:, None].astype(np.float32)
+
+    # Box blur along each row as wide as ~one pixel at the equator (near the
+    # poles a pixel expects few points), wrapping in longitude; then [1 2 1]
+    # down, clamped at the poles
+    sin_c = np.sin((np.arange(h) + 0.5) * (np.pi / h))
+    for r, k in enumerate(np.minimum(np.round(1.0 / sin_c).astype(np.int64) | 1, (w - 1) | 1)):
+        if k > 1:
+            c = np.cumsum(np.concatenate((d[r, -(k // 2 + 1):], d[r], d[r, :k // 2])))
+            d[r] = (c[k:] - c[:-k]) / k
+    d = (np.roll(d, 1, axis=1) + 2.0 * d + np.roll(d, -1, axis=1)) * 0.25
+    d = (np.vstack((d[:1], d[:-1])) + 2.0 * d + np.vstack((d[1:], d[-1:]))) * 0.25
+    d *= d                                   # contrast: even spread stays mid grey
+    return np.round(255.0 * d / (1.0 + d)).astype(np.uint8)
+
+
+# 3 x 5 digit glyphs, rows top to bottom
+_DIGITS = ("111101101101111", "010110010010111", "111001111100111", "111001111001111",
+           "101101111001001", "111100111001111", "111100111101111", "111001001001001",
+           "111101111101111", "111101111001111")
+
+
+def _label(tile: np.ndarray, text: str, scale: int = 2):
+    """Draw `text` (digits) white on black in the tile's top-left corner."""
+    h, w = 7 * scale, (4 * len(text) + 1) * scale
+    tile[:h, :w] = 0
+    for i, ch in enumerate(text):
+        glyph = np.array([c == "1" for c in _DIGITS[int(ch)]]).reshape(5, 3)
+        glyph = np.kron(glyph, np.ones((scale, scale), bool))
+        x = (4 * i + 1) * scale
+        tile[scale:6 * scale, x:x + 3 * scale][glyph] = 255
+
+
+def contact_sheet(thumbs: list, cols: int, pad: int = 2) -> np.ndarray:
+    """Thumbnails tiled row by row (numbered from 0) with `pad` pixels between."""
+    th, tw = thumbs[0].shape
+    rows = -(-len(thumbs) // cols)
+    sheet = np.full((rows * (th + pad) + pad, cols * (tw + pad) + pad), 32, np.uint8)
+    for i, thumb in enumerate(thumbs):
+        r, c = divmod(i, cols)
+        tile = sheet[pad + r * (th + pad):pad + r * (th + pad) + th,
+                     pad + c * (tw + pad):pad + c * (tw + pad) + tw]
+        tile[:] = thumb
+        _label(tile, str(i))
+    return sheet
+
+
+def write_png(path: str, img: np.ndarray):
+    """8-bit greyscale PNG (zlib + struct; no imaging module needed), replaced atomically."""
+    img = np.ascontiguousarray(img, np.uint8)
+    h, w = img.shape
+    raw = np.zeros((h, w + 1), np.uint8)   # filter type 0 in front of every row
+    raw[:, 1:] = img
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 0, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+    os.replace(tmp, path)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Sweep
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _render_variant(params: dict, fps: int, frames: int, width: int) -> np.ndarray:
+    """Worker: simulate frames 1..frames from the fresh state, return the thumbnail."""
+    eng = WaveEngine.from_params(params)
+    dt = np.float32(1.0 / fps)
+    for frame in range(2, frames + 1):
+        eng.step(np.float32(frame / fps), dt)
+    eng.close()
+    return density_thumbnail(eng.P, width)
+
+
+def run_sweep(base: dict, values: list, fps: int, out: str, points: int = DEFAULT_POINTS,
+              frames: int = DEFAULT_FRAMES, workers: int = 0, width: int = THUMB_WIDTH,
+              cols: int = None, progress=None, info: dict = None) -> str:
+    """
+    Render every variant (`values` from variants()) with `points` particles
+    across `workers` processes (0 = one per CPU) and write the contact sheet
+    plus sweep.json (the values and `info`) to `out`. `progress(done, total)`
+    is called as variants finish. Returns the sheet path.
+    """
+    fps = max(1, int(fps))
+    cols = int(cols) if cols else max(1, math.ceil(math.sqrt(len(values))))
+    os.makedirs(out, exist_ok=True)
+    # One thread per process, and NumPy: no per-process JIT warm-up at this size
+    runs = [dict(base, **v, N_POINTS=int(points), THREADS=1, BACKEND='NUMPY') for v in values]
+
+    thumbs = [None] * len(runs)
+    with ProcessPoolExecutor(max_workers=resolve_threads(workers)) as pool:
+        futures = {pool.submit(_render_variant, p, fps, int(frames), int(width)): i
+                   for i, p in enumerate(runs)}
+        for done, fut in enumerate(as_completed(futures), 1):
+            thumbs[futures[fut]] = fut.result()
+            if progress is not None:
+                progress(done, len(runs))
+
+    sheet = os.path.join(out, SHEET_NAME)
+    write_png(sheet, contact_sheet(thumbs, cols))
+    index = dict(info or {}, fps=fps, points=int(points), frames=int(frames), cols=cols,
+                 sheet=SHEET_NAME, variants=values)
+    tmp = os.path.join(out, INDEX_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, os.path.join(out, INDEX_NAME))
+    return sheet
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────────
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Render a contact sheet of particle-wave variants.")
+    ap.add_argument("--params", required=True, help="base params JSON file ('-' = stdin)")
+    ap.add_argument("--fps", type=int, required=True)
+    ap.add_argument("--out", required=True, help="output directory (sweep.png, sweep.json)")
+    ap.add_argument("--count", type=int, default=64, help="variants (GRID rounds up to a square)")
+    ap.add_argument("--mode", default='RANDOM', choices=MODES)
+    ap.add_argument("--seed", type=int, default=0, help="seed for the RANDOM draws")
+    ap.add_argument("--x", default="ATTRACT_GAIN", choices=tuple(RANGES), help="GRID: across")
+    ap.add_argument("--y", default="ALONG_GAIN", choices=tuple(RANGES), help="GRID: down")
+    ap.add_argument("--points", type=int, default=DEFAULT_POINTS, help="particles per variant")
+    ap.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames simulated per variant")
+    ap.add_argument("--width", type=int, default=THUMB_WIDTH, help="thumbnail width in pixels")
+    ap.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per CPU)")
+    args = ap.parse_args(argv)
+
+    if args.params == "-":
+        base = json.load(sys.stdin)
+    else:
+        with open(args.params, "r", encoding="utf-8") as f:
+            base = json.load(f)
+    base["AXIS_BIAS"] = tuple(base["AXIS_BIAS"])
+
+    values = variants(base, max(1, args.count), args.mode, args.seed, args.x, args.y)
+    cols = math.isqrt(len(values)) if args.mode == 'GRID' else None
+    t0 = time.perf_counter()
+
+    def progress(done, total):
+        print(f"[PARTICLE WAVES] sweep: {done}/{total} variants", flush=True)
+
+    sheet = run_sweep(base, values, args.fps, args.out, max(100, args.points), max(1, args.frames),
+                      args.workers, max(16, args.width), cols, progress,
+                      info=dict(mode=args.mode, seed=args.seed, x=args.x, y=args.y))
+    print(f"[PARTICLE WAVES] sweep of {len(values)} variants written to {sheet} "
+          f"in {time.perf_counter() - t0:.1f}s", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
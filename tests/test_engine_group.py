@@ -0,0 +1,48 @@
+"""
+Headless engine checks (no Blender). Run from the add-on folder:
+
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+import numpy as np  # type: ignore
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine import EngineGroup, WaveEngine, default_params  # noqa: E402
+
+
+FPS = 24
+DT = np.float32(1.0 / FPS)
+
+
+def _systems():
+    return [WaveEngine.from_params(default_params(N_POINTS=n, SEED=seed, NUM_MODES=4))
+            for n, seed in ((3000, 1), (2000, 2))]
+
+
+class EngineGroupTest(unittest.TestCase):
+
+    def test_update_params_twice_between_group_steps(self):
+        """
+        Two live updates with no step between them still reach the group's
+        coefficients (each update frees the params dict it replaces, so the
+        second can get the address the group saw last).
+        """
+        solo, grouped = _systems(), _systems()
+        group = EngineGroup(grouped)
+        for frame in range(2, 42):
+            t = np.float32(frame / FPS)
+            for e in solo:
+                e.step(t, DT)
+            group.step(t, DT)
+            for e in (grouped[0], solo[0]):
+                e.update_params(dict(e.params, ATTRACT_GAIN=e.params["ATTRACT_GAIN"] + 0.01))
+                e.update_params(dict(e.params, ALONG_GAIN=e.params["ALONG_GAIN"] + 0.01))
+        for a, b in zip(solo, grouped):
+            self.assertTrue(np.array_equal(a.P, b.P))
+            self.assertTrue(np.array_equal(a.V_prev, b.V_prev))
+
+if __name__ == "__main__":
+    unittest.main()
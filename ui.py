@@ -1,7 +1,11 @@
 import bpy  # type: ignore
 
+from .core import (SYSTEM_PROP, active_profiler, bake_info, bake_job, context_settings, sweep_result,
+                   sweep_running)
+from .profiler import ordered
+
 def _settings(ctx):
-    return getattr(ctx.scene, "particlewaves_settings", None)
+    return context_settings(ctx)
 
 
 # ─────────────────────────────────────────────────────────
@@ -73,10 +77,18 @@ class PARTICLEWAVES_PT_Particle(_PW_Sub):
         layout = self.layout
         s = self._s(layout, context);  
         if not s: return
+        row = layout.row()
+        row.enabled = not s.id_data.get(SYSTEM_PROP)   # a built system keeps its name
+        row.prop(s, "SYSTEM_NAME")
         col = layout.column(align=True)
         col.prop(s, "PARTICLE_COUNT")
         col.prop(s, "PARTICLE_RADIUS")
         col.prop(s, "SPHERE_RADIUS")
+        col = layout.column(align=True)
+        col.prop(s, "OUTPUT_MODE")
+        sub = col.row()
+        sub.enabled = s.OUTPUT_MODE != 'VERTS'
+        sub.prop(s, "RADIUS_VARIATION")
 
 
 class PARTICLEWAVES_PT_Wave(_PW_Sub):
@@ -91,6 +103,7 @@ class PARTICLEWAVES_PT_Wave(_PW_Sub):
         col.prop(s, "WAVE_STRENGTH")
         col.prop(s, "WAVE_SPEED")
         col.prop(s, "SEED")
+        layout.prop(s, "INIT_LAYOUT")
 
 
 class PARTICLEWAVES_PT_System(_PW_Sub):
@@ -111,9 +124,92 @@ class PARTICLEWAVES_PT_System(_PW_Sub):
         col.prop(s, "VEL_SMOOTH")
         col.prop(s, "STEP_CLAMP")
         col.prop(s, "SOFTNESS")
+        col = layout.column(align=True)
+        col.prop(s, "SEPARATION")
+        sub = col.row()
+        sub.enabled = s.SEPARATION > 0.0
+        sub.prop(s, "SEPARATION_RADIUS")
         layout.operator("particlewaves.randomise_params", text="RANDOMISE")
 
 
+class PARTICLEWAVES_PT_Sweep(_PW_Sub):
+    bl_label = "SWEEP"
+    bl_idname = "PARTICLEWAVES_PT_SWEEP"
+    bl_order = 32
+    bl_options = {'DEFAULT_CLOSED'}
+    def draw(self, context):
+        layout = self.layout
+        s = self._s(layout, context);  
+        if not s: return
+        col = layout.column(align=True)
+        col.prop(s, "SWEEP_MODE")
+        col.prop(s, "SWEEP_COUNT")
+        if s.SWEEP_MODE == 'GRID':
+            col.prop(s, "SWEEP_X")
+            col.prop(s, "SWEEP_Y")
+        col = layout.column(align=True)
+        col.prop(s, "SWEEP_POINTS")
+        col.prop(s, "SWEEP_FRAMES")
+        if sweep_running():
+            layout.label(text="SWEEPING...", icon='TIME')
+        else:
+            layout.operator("particlewaves.sweep", text="SWEEP")
+        result = sweep_result(s)
+        if result is None:
+            return
+        layout.label(text=f"{len(result['variants'])} variants: image PW_SWEEP", icon='IMAGE_DATA')
+        # One button per tile, laid out like the sheet
+        grid = layout.grid_flow(row_major=True, columns=result["cols"], even_columns=True, align=True)
+        for i in range(len(result["variants"])):
+            grid.operator("particlewaves.apply_sweep_variant", text=str(i)).index = i
+
+
+class PARTICLEWAVES_PT_Cache(_PW_Sub):
+    bl_label = "CACHE SETTINGS"
+    bl_idname = "PARTICLEWAVES_PT_CACHE"
+    bl_order = 35
+    bl_options = {'DEFAULT_CLOSED'}
+    def draw(self, context):
+        layout = self.layout
+        s = self._s(layout, context);  
+        if not s: return
+        col = layout.column(align=True)
+        col.prop(s, "USE_BAKE")
+        col.prop(s, "CACHE_DIR")
+        col.prop(s, "BAKE_FORMAT")
+        info = bake_info(s)
+        if info is not None:
+            disk, raw, decode = info
+            text = f"{disk / 2**20:.0f} MB  ·  RAW {raw / 2**20:.0f} MB"
+            if decode:
+                text += f"  ·  DECODE {decode * 1000.0:.1f} ms"
+            layout.label(text=text, icon='DISK_DRIVE')
+        job = bake_job()
+        if job is not None:
+            eta = f"{job.eta:.0f}s" if job.eta != float("inf") else "--"
+            box = layout.box()
+            box.label(text=f"BAKING {job.frames_done}/{job.total}  ·  "
+                           f"{job.rate:.1f} FPS  ·  ETA {eta}", icon='TIME')
+            box.operator("particlewaves.cancel_bake", text="CANCEL", icon='CANCEL')
+        else:
+            row = layout.row(align=True)
+            row.operator("particlewaves.bake",      text="BAKE")
+            row.operator("particlewaves.farm_bake", text="FARM BAKE")
+            row.operator("particlewaves.free_bake", text="FREE BAKE")
+        col = layout.column(align=True)
+        col.prop(s, "EXPORT_DIR")
+        row = col.row(align=True)
+        row.prop(s, "EXPORT_FORMAT", text="")
+        row.prop(s, "EXPORT_VELOCITY")
+        layout.operator("particlewaves.export", text="EXPORT POINTS")
+        col = layout.column(align=True)
+        col.prop(s, "AUTO_CHECKPOINT")
+        col.prop(s, "CHECKPOINT_MODE")
+        row = layout.row(align=True)
+        row.operator("particlewaves.save_checkpoint", text="SAVE STATE")
+        row.operator("particlewaves.load_checkpoint", text="LOAD STATE")
+
+
 class PARTICLEWAVES_PT_Advanced(_PW_Sub):
     bl_label = "ADVANCED SETTINGS"
     bl_idname = "PARTICLEWAVES_PT_ADVANCED"
@@ -123,4 +219,45 @@ class PARTICLEWAVES_PT_Advanced(_PW_Sub):
         layout = self.layout
         s = self._s(layout, context);  
         if not s: return
-        layout.prop(s, "AXIS_BIAS")
\ No newline at end of file
+        layout.prop(s, "AXIS_BIAS")
+        layout.prop(s, "VIEWPORT_FRACTION")
+        layout.prop(s, "THREADS")
+        layout.prop(s, "BACKEND")
+
+
+class PARTICLEWAVES_PT_Timing(_PW_Sub):
+    bl_label = "TIMINGS"
+    bl_idname = "PARTICLEWAVES_PT_TIMING"
+    bl_order = 45
+    bl_options = {'DEFAULT_CLOSED'}
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = False
+        layout.use_property_decorate = False
+        s = context.scene.particlewaves_settings   # session-wide, not per system
+        layout.prop(s, "PROFILE")
+        layout.prop(s, "PROFILE_LOG")
+        prof = active_profiler()
+        if prof is None:
+            return
+        avg = prof.averages("frame")
+        if not avg:
+            layout.label(text="Play or scrub to collect timings.", icon='INFO')
+        else:
+            total = avg["total"]
+            col = layout.column(align=True)
+            for stage, sec in ordered(avg):
+                col.label(text=f"{stage.upper():<10} {sec * 1000.0:8.2f} ms")
+            sync = avg.get("push", 0.0) + avg.get("update", 0.0)
+            col.label(text=f"FRAME {total * 1000.0:.2f} ms  ·  {1.0 / total if total > 0 else 0.0:.1f} FPS"
+                           f"  ·  MESH SYNC {100.0 * sync / total if total > 0 else 0.0:.0f}%")
+        build = prof.last("build")
+        if build is not None:
+            col = layout.column(align=True)
+            parts = "  ".join(f"{k} {v * 1000.0:.0f}" for k, v in ordered(build["stages"]))
+            col.label(text=f"BUILD {build['total'] * 1000.0:.0f} ms  ({parts})")
+        last = prof.last("frame") or build
+        if last is not None and "memory_bytes" in last:
+            layout.label(text=f"MEMORY {last['memory_bytes'] / 2**20:.1f} MB  ·  "
+                              f"PEAK {prof.peak_bytes / 2**20:.1f} MB")
+        layout.operator("particlewaves.reset_timings", text="RESET")